@@ -14,8 +14,27 @@ def binary_search( the_values, target ) :
   return False
 
 
+# Position of the first value >= target (len(the_values) if there is none):
+# where target is, or where it would be inserted to keep the values sorted.
+# low/high limit the search to the_values[low:high]
+def binary_search_position( the_values, target, low = 0, high = None ) :
+  if high is None :
+    high = len(the_values)
+
+  while low < high :
+    mid = (high + low) // 2
+    if the_values[mid] < target :
+      low = mid + 1
+    else :
+      high = mid
+
+  return low
+
+
 if __name__ == '__main__':
     vals = range(0,20,2)
     print(binary_search(vals, 5))
     print(binary_search(vals, 10))
     print(binary_search(vals, 20))
+    print(binary_search_position(vals, 5))
+    print(binary_search_position(vals, 10))
@@ -1,34 +1,19 @@
 # بسم الله الرحمن الرحيم
 
-from array_two_d import MyArrayTD
+from grades_loader import load_grades
 
-# Open the text file for reading
-grades_file = open('grades.txt', 'r')
-
-# Extract the first two values; indicate the size of the array
-num_students = int(grades_file.readline())
-num_exams = int(grades_file.readline())
-
-# Create the 2-D Array to store the grades
-exam_grades = MyArrayTD(num_students, num_exams)
-
-# Extract the grades from the remainig lines
-i = 0
-for student in grades_file:
-    grades = student.split()
-    for j in range(num_exams):
-        exam_grades[i,j] = int(grades[j])
-    i += 1
-
-# Close the text file
-grades_file.close()
+# Load the whole file into a 2-D Array in one go
+# The first two values in the file give the size of the array;
+# load_grades reads them, then fills the array chunk by chunk
+exam_grades = load_grades('grades.txt')
+num_students = exam_grades.num_rows()
+num_exams = exam_grades.num_cols()
 
 # Compute each student's average exam grade
+# row(i) is a view over the student's grades, so there is no copy
+# and no exam_grades[i,j] call per grade
 for i in range(num_students):
-    total = 0
-    for j in range(num_exams):
-        total += exam_grades[i,j]
-    exam_avg = total / num_exams
+    exam_avg = exam_grades.row(i).mean()
 
     print( "%2d:  %6.2f" % (i+1, exam_avg) )
 
@@ -2,52 +2,172 @@
 
 from my_array import MyArray
 
+class MyArrayView:
+    # A 1-D window over the cells of a MyArrayTD (a row or a column)
+    # No data is copied: reads and writes go to the original cells
+    def __init__(self, cells, start, length, stride):
+        self._cells = cells
+        self._start = start
+        self._length = length
+        self._stride = stride
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        assert index >= 0 and index < len(self), 'View subscript out of range'
+        return self._cells[self._start + index * self._stride]
+
+    def __setitem__(self, index, value):
+        assert index >= 0 and index < len(self), 'View subscript out of range'
+        self._cells[self._start + index * self._stride] = value
+
+    # A new generator for every loop, so a loop that stopped early does
+    # not leave the next one starting in the middle
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._cells[self._start + index * self._stride]
+
+    # Copy the viewed cells into a Python list with one (strided) slice
+    def to_list(self):
+        if self._length == 0:
+            return []
+        stop = self._start + (self._length - 1) * self._stride + 1
+        return self._cells.slice(self._start, stop, self._stride)
+
+    # Reductions: the slice above is taken in C, then the built-ins
+    # walk it in C too, so there is no __getitem__ call per element
+    def sum(self):
+        return sum(self.to_list())
+
+    # Like min() and max() of an empty view, raises ValueError
+    def mean(self):
+        if len(self) == 0:
+            raise ValueError('mean() of an empty view')
+        return self.sum() / len(self)
+
+    def min(self):
+        return min(self.to_list())
+
+    def max(self):
+        return max(self.to_list())
+
+    def __repr__(self):
+        return str(self.to_list())
+
+
 class MyArrayTD:
     def __init__(self, no_rows, no_cols):
-        
-        # Optional but will make code easier later
-        # self.no_rows = no_rows
-        # self.no_cols = no_cols
+        self._no_rows = no_rows
+        self._no_cols = no_cols
 
-        # Create Outer Array
-        self._rows = MyArray(no_rows)
+        # One contiguous array, stored row by row (row-major):
+        # cell (row, col) lives at offset + row * stride + col
+        self._cells = MyArray(no_rows * no_cols)
+        self._offset = 0
+        self._stride = no_cols
 
-        # Create Internal Arrays for each Outer Array
-        for row in range(no_rows):
-            self._rows[row] = MyArray(no_cols)
+    # Build a MyArrayTD that shares the cells of another one (used by block)
+    @classmethod
+    def _view(cls, cells, offset, stride, no_rows, no_cols):
+        view = cls.__new__(cls)
+        view._no_rows = no_rows
+        view._no_cols = no_cols
+        view._cells = cells
+        view._offset = offset
+        view._stride = stride
+        return view
 
     def num_rows(self):
-        # return self.num_rows
-        return len(self._rows)
+        return self._no_rows
 
     def num_cols(self):
-        # return self.num_cols
-        return len(self._rows[0])
+        return self._no_cols
 
     def clear(self, value):
         for row in range(self.num_rows()):
-            # this clear implementation inside my_array
-            row.clear(value)
+            start = self._offset + row * self._stride
+            self._cells.fill(start, start + self.num_cols(), value)
 
-    # Make array subscriptable
-    def __getitem__(self, idx_tuple):
+    def _cell_index(self, idx_tuple):
         assert len(idx_tuple) == 2, 'Invalid number'
         row = idx_tuple[0]
         col = idx_tuple[1]
-        assert row >= 0 and row <= self.num_rows() and \
-            col >= 0 and col <= self.num_cols(), \
+        assert row >= 0 and row < self.num_rows() and \
+            col >= 0 and col < self.num_cols(), \
                 'Array subscript out of range'
-        the_one_d_arr = self._rows[row]
-        return the_one_d_arr[col]
+        return self._offset + row * self._stride + col
+
+    # Make array subscriptable
+    # arr[r, c] returns one cell, arr[r0:r1, c0:c1] returns a block view
+    def __getitem__(self, idx_tuple):
+        if isinstance(idx_tuple[0], slice) or isinstance(idx_tuple[1], slice):
+            return self._block_from_slices(idx_tuple[0], idx_tuple[1])
+        return self._cells[self._cell_index(idx_tuple)]
 
     # Make array subscriptable
     def __setitem__(self, idx_tuple, value):
-        assert len(idx_tuple) == 2, 'Invalid number'
-        row = idx_tuple[0]
-        col = idx_tuple[1]
-        assert row >= 0 and row <= self.num_rows() and \
-            col >= 0 and col <= self.num_cols(), \
-                'Array subscript out of range'
-        the_one_d_arr = self._rows[row]
-        the_one_d_arr[col] = value
-    
\ No newline at end of file
+        self._cells[self._cell_index(idx_tuple)] = value
+
+    def row(self, row):
+        assert row >= 0 and row < self.num_rows(), 'Row out of range'
+        return MyArrayView(self._cells, self._offset + row * self._stride,
+                           self.num_cols(), 1)
+
+    def col(self, col):
+        assert col >= 0 and col < self.num_cols(), 'Column out of range'
+        return MyArrayView(self._cells, self._offset + col,
+                           self.num_rows(), self._stride)
+
+    # Rows r0 .. r1-1 and columns c0 .. c1-1, sharing the same cells
+    def block(self, r0, r1, c0, c1):
+        assert 0 <= r0 <= r1 <= self.num_rows() and \
+            0 <= c0 <= c1 <= self.num_cols(), 'Block out of range'
+        return MyArrayTD._view(self._cells,
+                               self._offset + r0 * self._stride + c0,
+                               self._stride, r1 - r0, c1 - c0)
+
+    def _block_from_slices(self, rows, cols):
+        if not isinstance(rows, slice):
+            rows = slice(rows, rows + 1)
+        if not isinstance(cols, slice):
+            cols = slice(cols, cols + 1)
+        r0, r1, r_step = rows.indices(self.num_rows())
+        c0, c1, c_step = cols.indices(self.num_cols())
+        assert r_step == 1 and c_step == 1, 'Block steps are not supported'
+        return self.block(r0, max(r0, r1), c0, max(c0, c1))
+
+    # Reductions
+    # axis=None -> one value for the whole array
+    # axis=0    -> one value per column (a list of num_cols values)
+    # axis=1    -> one value per row (a list of num_rows values)
+    def _reduce(self, func, axis):
+        if axis == 1:
+            return [func(self.row(r).to_list()) for r in range(self.num_rows())]
+        if axis == 0:
+            return [func(self.col(c).to_list()) for c in range(self.num_cols())]
+        assert axis is None, 'axis must be None, 0 or 1'
+        if self._stride == self.num_cols():
+            # The whole array is one contiguous run of cells
+            start = self._offset
+            return func(self._cells.slice(start, start + self.num_rows() * self.num_cols()))
+        return func(self._reduce(func, 1))
+
+    def sum(self, axis=None):
+        return self._reduce(sum, axis)
+
+    # An empty array (or an empty block) has no mean: ValueError
+    def mean(self, axis=None):
+        if self.num_rows() == 0 or self.num_cols() == 0:
+            raise ValueError('mean() of an empty array')
+        if axis == 1:
+            return [total / self.num_cols() for total in self.sum(1)]
+        if axis == 0:
+            return [total / self.num_rows() for total in self.sum(0)]
+        return self.sum() / (self.num_rows() * self.num_cols())
+
+    def min(self, axis=None):
+        return self._reduce(min, axis)
+
+    def max(self, axis=None):
+        return self._reduce(max, axis)
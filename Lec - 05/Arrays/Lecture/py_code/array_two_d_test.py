@@ -0,0 +1,55 @@
+# بسم الله الرحمن الرحيم
+
+import unittest
+
+from array_two_d import MyArrayTD
+
+class TestMyArrayTD(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = MyArrayTD(3, 4)
+        for r in range(3):
+            for c in range(4):
+                self.grid[r, c] = r * 4 + c
+
+    def test_views_share_cells(self):
+        row = self.grid.row(1)
+        col = self.grid.col(2)
+        self.assertEqual(row.to_list(), [4, 5, 6, 7])
+        self.assertEqual(col.to_list(), [2, 6, 10])
+        row[2] = 60
+        self.assertEqual(col[1], 60)
+        self.assertEqual(self.grid[1, 2], 60)
+        block = self.grid[1:3, 1:3]
+        self.assertEqual(block.sum(axis=1), [65, 19])
+        self.assertEqual(block.row(1).to_list(), [9, 10])
+
+    def test_iteration_restarts(self):
+        row = self.grid.row(2)
+        for value in row:
+            if value == 9:
+                break
+        # A loop that stopped early does not affect the next one
+        self.assertEqual(list(row), [8, 9, 10, 11])
+        # Two loops over the same view at once
+        pairs = [(x, y) for x in self.grid.col(0) for y in self.grid.col(0)]
+        self.assertEqual(len(pairs), 9)
+
+    def test_reductions(self):
+        self.assertEqual(self.grid.sum(), 66)
+        self.assertEqual(self.grid.sum(axis=0), [12, 15, 18, 21])
+        self.assertEqual(self.grid.max(axis=1), [3, 7, 11])
+        self.assertEqual(self.grid.mean(axis=1), [1.5, 5.5, 9.5])
+        self.assertEqual(self.grid.row(0).mean(), 1.5)
+        self.assertEqual(self.grid.col(3).min(), 3)
+
+    def test_mean_of_empty(self):
+        empty = self.grid.block(1, 1, 0, 4)
+        self.assertRaises(ValueError, empty.mean)
+        self.assertRaises(ValueError, empty.mean, 0)
+        self.assertRaises(ValueError, self.grid.block(0, 3, 2, 2).mean, 1)
+        self.assertRaises(ValueError, empty.col(0).mean)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+# بسم الله الرحمن الرحيم
+
+# A grade grid that keeps its statistics up to date as grades change.
+#
+# Every row (student) and column (exam) has a running sum, a count of the
+# cells that hold a grade (None means "no grade yet"), a min and a max.
+# Writing a cell adjusts the sums and counts of its row and column, so
+# any average is an O(1) division instead of a pass over the grid.
+#
+# min/max are also updated in O(1), except when the cell that held the
+# current min (or max) is overwritten with a worse value: then that one
+# row or column is marked stale and rescanned the next time it is asked for.
+
+from array_two_d import MyArrayTD
+
+_STALE = object()
+
+def _add_to_min(current, value):
+    return value if current is None or value < current else current
+
+def _add_to_max(current, value):
+    return value if current is None or value > current else current
+
+
+class GradeGrid:
+    def __init__(self, grid):
+        # grid is any MyArrayTD (e.g. from grades_loader.load_grades)
+        self._grid = grid
+        rows = grid.num_rows()
+        cols = grid.num_cols()
+
+        self._row_sum = [0] * rows
+        self._row_count = [0] * rows
+        self._row_min = [None] * rows
+        self._row_max = [None] * rows
+        self._col_sum = [0] * cols
+        self._col_count = [0] * cols
+        self._col_min = [None] * cols
+        self._col_max = [None] * cols
+
+        # One pass over the existing grades, a whole row or column at a time
+        for r in range(rows):
+            self._row_sum[r], self._row_count[r], self._row_min[r], self._row_max[r] = \
+                GradeGrid._scan(grid.row(r).to_list())
+        for c in range(cols):
+            self._col_sum[c], self._col_count[c], self._col_min[c], self._col_max[c] = \
+                GradeGrid._scan(grid.col(c).to_list())
+
+    @classmethod
+    def empty(cls, num_students, num_exams):
+        grid = MyArrayTD(num_students, num_exams)
+        grid.clear(None)
+        return cls(grid)
+
+    # sum, count, min and max of the grades in a list of cells
+    @staticmethod
+    def _scan(cells):
+        grades = [value for value in cells if value is not None]
+        if not grades:
+            return 0, 0, None, None
+        return sum(grades), len(grades), min(grades), max(grades)
+
+    def num_rows(self):
+        return self._grid.num_rows()
+
+    def num_cols(self):
+        return self._grid.num_cols()
+
+    def __getitem__(self, idx_tuple):
+        return self._grid[idx_tuple]
+
+    def __setitem__(self, idx_tuple, value):
+        row = idx_tuple[0]
+        col = idx_tuple[1]
+        old = self._grid[row, col]
+        self._grid[row, col] = value
+        self._update(self._row_sum, self._row_count, self._row_min, self._row_max, row, old, value)
+        self._update(self._col_sum, self._col_count, self._col_min, self._col_max, col, old, value)
+
+    @staticmethod
+    def _update(sums, counts, mins, maxs, line, old, new):
+        if old is not None:
+            sums[line] -= old
+            counts[line] -= 1
+            # The old value may have been the min/max: rescan lazily
+            if old == mins[line] and (new is None or new > old):
+                mins[line] = _STALE
+            if old == maxs[line] and (new is None or new < old):
+                maxs[line] = _STALE
+        if new is not None:
+            sums[line] += new
+            counts[line] += 1
+            if mins[line] is not _STALE:
+                mins[line] = _add_to_min(mins[line], new)
+            if maxs[line] is not _STALE:
+                maxs[line] = _add_to_max(maxs[line], new)
+
+    # Per-student statistics (rows)
+    def row_sum(self, row):
+        return self._row_sum[row]
+
+    def row_count(self, row):
+        return self._row_count[row]
+
+    def row_mean(self, row):
+        assert self._row_count[row] > 0, 'No grades in this row'
+        return self._row_sum[row] / self._row_count[row]
+
+    def row_min(self, row):
+        if self._row_min[row] is _STALE:
+            self._row_min[row] = GradeGrid._scan(self._grid.row(row).to_list())[2]
+        return self._row_min[row]
+
+    def row_max(self, row):
+        if self._row_max[row] is _STALE:
+            self._row_max[row] = GradeGrid._scan(self._grid.row(row).to_list())[3]
+        return self._row_max[row]
+
+    # Per-exam statistics (columns)
+    def col_sum(self, col):
+        return self._col_sum[col]
+
+    def col_count(self, col):
+        return self._col_count[col]
+
+    def col_mean(self, col):
+        assert self._col_count[col] > 0, 'No grades in this column'
+        return self._col_sum[col] / self._col_count[col]
+
+    def col_min(self, col):
+        if self._col_min[col] is _STALE:
+            self._col_min[col] = GradeGrid._scan(self._grid.col(col).to_list())[2]
+        return self._col_min[col]
+
+    def col_max(self, col):
+        if self._col_max[col] is _STALE:
+            self._col_max[col] = GradeGrid._scan(self._grid.col(col).to_list())[3]
+        return self._col_max[col]
+
+
+if __name__ == '__main__':
+    from grades_loader import load_grades
+
+    grades = GradeGrid(load_grades('grades.txt', use_cache=False))
+    print('Student 1 average: %6.2f' % grades.row_mean(0))
+    print('Exam 1 average:    %6.2f (min %d, max %d)' %
+          (grades.col_mean(0), grades.col_min(0), grades.col_max(0)))
+
+    # A regrade: the averages are right straight away
+    grades[0, 0] = 60
+    print('Student 1 average: %6.2f' % grades.row_mean(0))
+    print('Exam 1 average:    %6.2f (min %d, max %d)' %
+          (grades.col_mean(0), grades.col_min(0), grades.col_max(0)))
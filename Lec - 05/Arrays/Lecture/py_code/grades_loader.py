@@ -0,0 +1,118 @@
+# بسم الله الرحمن الرحيم
+
+# Bulk loader for grade files (the format of grades.txt):
+#   num_students
+#   num_exams
+#   one line per student with num_exams whitespace-separated integers
+#
+# The text is read in large binary chunks, split into tokens in C
+# (bytes.split) and converted with map(int, ...), then each chunk is copied
+# into the grid's contiguous cells in one slice assignment.
+#
+# The first load also writes a binary cache of the grid, in the grid file
+# format of mapped_array.py. While the cache is newer than the text file,
+# later loads read it back directly and skip parsing entirely.
+# Caches go to their own folder (CACHE_DIR, in the temp folder, unless
+# cache_dir says otherwise), never next to the text file, so loading a
+# file does not write anything into the source tree.
+
+import hashlib
+import os
+import tempfile
+from array import array
+
+from array_two_d import MyArrayTD
+from mapped_array import HEADER, MAGIC, MappedArrayTD
+
+CHUNK_SIZE = 1 << 20
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'dsa-grade-caches')
+CACHE_SUFFIX = '.grid'
+CACHE_TYPECODE = 'q'
+
+# Cache file of the text file at path: its name plus a hash of its full
+# path, so two grades.txt in different folders get different caches
+def cache_path_for(path, cache_dir=None):
+    full_path = os.path.abspath(path)
+    digest = hashlib.blake2b(full_path.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+    return os.path.join(cache_dir or CACHE_DIR,
+                        '%s-%s%s' % (os.path.basename(full_path), digest, CACHE_SUFFIX))
+
+# Yield lists of tokens, one list per chunk; a token cut at the end
+# of a chunk is carried over to the next one
+def _read_tokens(the_file, chunk_size):
+    tail = b''
+    while True:
+        chunk = the_file.read(chunk_size)
+        if not chunk:
+            break
+        tokens = (tail + chunk).split()
+        tail = b''
+        if tokens and not chunk[-1:].isspace():
+            tail = tokens.pop()
+        yield tokens
+    if tail:
+        yield [tail]
+
+def _cache_is_fresh(path, cache_path):
+    return os.path.exists(cache_path) and \
+        os.path.getmtime(cache_path) >= os.path.getmtime(path)
+
+def _parse(path, chunk_size):
+    grid = None
+    header = []
+    filled = 0
+    with open(path, 'rb') as the_file:
+        for tokens in _read_tokens(the_file, chunk_size):
+            values = list(map(int, tokens))
+            if grid is None:
+                # The first two numbers give the size of the grid
+                header.extend(values)
+                if len(header) < 2:
+                    continue
+                grid = MyArrayTD(header[0], header[1])
+                total = header[0] * header[1]
+                values = header[2:]
+            assert filled + len(values) <= total, 'More grades than num_students * num_exams'
+            grid._cells.set_slice(filled, values)
+            filled += len(values)
+    assert grid is not None and filled == total, 'Missing grades in %s' % path
+    return grid
+
+def save_cache(grid, cache_path):
+    cells = array(CACHE_TYPECODE, grid._cells.slice(0, grid.num_rows() * grid.num_cols()))
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as the_file:
+        the_file.write(HEADER.pack(MAGIC, CACHE_TYPECODE.encode(), grid.num_rows(), grid.num_cols()))
+        cells.tofile(the_file)
+    # Readers never see a half-written cache
+    os.replace(tmp_path, cache_path)
+
+def load_cache(cache_path):
+    with open(cache_path, 'rb') as the_file:
+        magic, typecode, no_rows, no_cols = HEADER.unpack(the_file.read(HEADER.size))
+        assert magic == MAGIC, 'Not a grid file'
+        cells = array(typecode.decode())
+        cells.fromfile(the_file, no_rows * no_cols)
+    grid = MyArrayTD(no_rows, no_cols)
+    grid._cells.set_slice(0, cells.tolist())
+    return grid
+
+# Load a grade file into a MyArrayTD
+# use_cache=False always parses the text and does not write a cache
+# cache_dir picks the folder of the cache (default CACHE_DIR)
+# mapped=True returns the cache itself as a MappedArrayTD (opened
+# read-only), so even the copy into memory is skipped
+def load_grades(path, use_cache=True, mapped=False, chunk_size=CHUNK_SIZE, cache_dir=None):
+    cache_path = cache_path_for(path, cache_dir)
+    if use_cache and _cache_is_fresh(path, cache_path):
+        if mapped:
+            return MappedArrayTD.open(cache_path, writable=False)
+        return load_cache(cache_path)
+
+    grid = _parse(path, chunk_size)
+    if use_cache:
+        save_cache(grid, cache_path)
+        if mapped:
+            return MappedArrayTD.open(cache_path, writable=False)
+    return grid
@@ -0,0 +1,65 @@
+# بسم الله الرحمن الرحيم
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from grades_loader import cache_path_for, load_grades
+
+GRADES = [[90, 96, 92], [85, 91, 89], [82, 73, 84], [100, 7, 65]]
+
+class TestGradesLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.source_dir = os.path.join(self.dir, 'lecture')
+        self.cache_dir = os.path.join(self.dir, 'caches')
+        os.mkdir(self.source_dir)
+        self.path = os.path.join(self.source_dir, 'grades.txt')
+        with open(self.path, 'w') as the_file:
+            the_file.write('%d\n%d\n' % (len(GRADES), len(GRADES[0])))
+            for row in GRADES:
+                the_file.write('  '.join(str(grade) for grade in row) + '\n')
+
+    def rows(self, grid):
+        return [grid.row(r).to_list() for r in range(grid.num_rows())]
+
+    def test_parse_any_chunk_size(self):
+        # Tiny chunks cut numbers in half; the tail carries over
+        for chunk_size in [1, 2, 3, 7, 1 << 20]:
+            grid = load_grades(self.path, use_cache=False, chunk_size=chunk_size)
+            self.assertEqual(self.rows(grid), GRADES)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_cache(self):
+        grid = load_grades(self.path, cache_dir=self.cache_dir)
+        cache_path = cache_path_for(self.path, self.cache_dir)
+        self.assertTrue(os.path.exists(cache_path))
+        # Nothing is written next to the text file
+        self.assertEqual(os.listdir(self.source_dir), ['grades.txt'])
+
+        self.assertEqual(self.rows(load_grades(self.path, cache_dir=self.cache_dir)), GRADES)
+        with load_grades(self.path, mapped=True, cache_dir=self.cache_dir) as mapped:
+            self.assertEqual(self.rows(mapped), GRADES)
+        self.assertEqual(self.rows(grid), GRADES)
+
+    def test_stale_cache_is_rebuilt(self):
+        load_grades(self.path, cache_dir=self.cache_dir)
+        with open(self.path, 'w') as the_file:
+            the_file.write('1\n2\n5 6\n')
+        # Make the text file clearly newer than the cache
+        cache_time = os.path.getmtime(cache_path_for(self.path, self.cache_dir))
+        os.utime(self.path, (cache_time + 10, cache_time + 10))
+        self.assertEqual(self.rows(load_grades(self.path, cache_dir=self.cache_dir)), [[5, 6]])
+
+    def test_cache_names(self):
+        other = os.path.join(self.dir, 'grades.txt')
+        self.assertNotEqual(cache_path_for(self.path), cache_path_for(other))
+        self.assertEqual(cache_path_for(self.path), cache_path_for(os.path.relpath(self.path)))
+        self.assertNotEqual(os.path.dirname(cache_path_for(self.path)), self.source_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# بسم الله الرحمن الرحيم
+
+# A MyArrayTD whose cells live in a file instead of in memory.
+#
+# The file is mapped with mmap, so opening it reads nothing: the OS pages
+# cells in the first time they are touched and writes dirty pages back.
+# That lets the grid be larger than RAM, and a grid saved by one process
+# opens instantly in another.
+#
+# File layout (little-endian):
+#   magic    8 bytes  b'DSAGRID1'
+#   typecode 1 byte   array typecode of every cell, e.g. b'd' or b'l'
+#   padding  7 bytes
+#   rows     8 bytes
+#   cols     8 bytes
+#   cells    rows * cols items, row by row
+
+import mmap
+import struct
+from array import array
+
+from array_two_d import MyArrayTD
+from matrix import Matrix
+
+MAGIC = b'DSAGRID1'
+HEADER = struct.Struct('<8sc7xqq')
+
+
+class _MappedCells:
+    # The same interface MyArrayTD uses on MyArray, over a typed memoryview
+    def __init__(self, the_map, typecode):
+        self._raw = memoryview(the_map)[HEADER.size:]
+        self._elements = self._raw.cast(typecode)
+        self._typecode = typecode
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __getitem__(self, index):
+        assert index >= 0 and index < len(self), 'Array subscript out of range'
+        return self._elements[index]
+
+    def __setitem__(self, index, value):
+        assert index >= 0 and index < len(self), 'Array subscript out of range'
+        self._elements[index] = value
+
+    def slice(self, start, stop, step=1):
+        return self._elements[start:stop:step].tolist()
+
+    def fill(self, start, stop, value):
+        self._elements[start:stop] = array(self._typecode, [value]) * (stop - start)
+
+    def set_slice(self, start, values):
+        self._elements[start:start + len(values)] = array(self._typecode, values)
+
+    def release(self):
+        self._elements.release()
+        self._raw.release()
+
+
+class MappedArrayTD(MyArrayTD):
+    # Use MappedArrayTD.create(...) or MappedArrayTD.open(...), not the constructor
+
+    # New zero-filled grid file
+    @classmethod
+    def create(cls, path, no_rows, no_cols, typecode='d'):
+        assert no_rows > 0 and no_cols > 0, 'Array size must be > 0'
+        size = HEADER.size + no_rows * no_cols * array(typecode).itemsize
+        the_file = open(path, 'w+b')
+        # truncate() extends the file with zeros without writing them
+        the_file.truncate(size)
+        the_file.write(HEADER.pack(MAGIC, typecode.encode(), no_rows, no_cols))
+        the_file.flush()
+        return cls._map(the_file, mmap.ACCESS_WRITE)
+
+    # Existing grid file; only the header is read now
+    @classmethod
+    def open(cls, path, writable=True):
+        the_file = open(path, 'r+b' if writable else 'rb')
+        return cls._map(the_file, mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+    @classmethod
+    def _map(cls, the_file, access):
+        the_map = mmap.mmap(the_file.fileno(), 0, access=access)
+        magic, typecode, no_rows, no_cols = HEADER.unpack_from(the_map)
+        assert magic == MAGIC, 'Not a grid file'
+        typecode = typecode.decode()
+
+        grid = cls._view(_MappedCells(the_map, typecode), 0, no_cols, no_rows, no_cols)
+        grid._file = the_file
+        grid._map = the_map
+        grid._typecode = typecode
+        return grid
+
+    def typecode(self):
+        return self._typecode
+
+    # Write changed pages back to the file now
+    def flush(self):
+        self._map.flush()
+
+    # Views (row, col, block, as_matrix) must not be used after close
+    def close(self):
+        if self._map.closed:
+            return
+        if self._file.mode != 'rb':
+            self._map.flush()
+        self._cells.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # A Matrix whose buffer is this file: Matrix operations read the
+    # file directly and scaleBy / += / -= write straight into it
+    def as_matrix(self):
+        assert self._typecode == 'd', 'Matrix needs a grid of doubles'
+        mat = Matrix(0, 0)
+        mat._num_rows = self.num_rows()
+        mat._num_cols = self.num_cols()
+        mat._the_grid = self._cells._elements
+        return mat
@@ -0,0 +1,80 @@
+# بسم الله الرحمن الرحيم
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import matrix
+from mapped_array import MappedArrayTD
+from matrix import Matrix
+
+class TestMappedArrayTD(unittest.TestCase):
+
+    def setUp(self):
+        # Cleanups run last first: the grids are closed before the
+        # folder is removed
+        self._dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self._dir)
+        # A tiny leaf makes Strassen cut the mapped matrix into quadrants
+        self._leaf = Matrix.STRASSEN_LEAF
+        Matrix.STRASSEN_LEAF = 2
+
+    def tearDown(self):
+        Matrix.STRASSEN_LEAF = self._leaf
+
+    def mapped(self, name, no_rows, no_cols):
+        grid = MappedArrayTD.create(os.path.join(self._dir, name), no_rows, no_cols)
+        self.addCleanup(grid.close)
+        for r in range(no_rows):
+            for c in range(no_cols):
+                grid[r, c] = r * no_cols + c - 7
+        return grid
+
+    def test_reopen(self):
+        grid = self.mapped('grid', 3, 4)
+        grid.close()
+        with MappedArrayTD.open(os.path.join(self._dir, 'grid'), writable=False) as again:
+            self.assertEqual(again.typecode(), 'd')
+            self.assertEqual(again.row(2).to_list(), [1.0, 2.0, 3.0, 4.0])
+            self.assertEqual(again.sum(), sum(range(-7, 5)))
+
+    @staticmethod
+    def cells(mat):
+        return [[mat[i, j] for j in range(mat.num_cols())] for i in range(mat.num_rows())]
+
+    @staticmethod
+    def plain(no_rows, no_cols):
+        mat = Matrix(no_rows, no_cols)
+        for r in range(no_rows):
+            for c in range(no_cols):
+                mat[r, c] = (r + 2 * c) % 5 - 1
+        return mat
+
+    def test_multiply_mapped_matrix(self):
+        strategies = ['rows', 'blocked', 'strassen', 'auto']
+        if matrix.np is not None:
+            strategies.append('numpy')
+        # Square (Strassen splits the mapped buffer itself) and odd,
+        # non-square (Strassen pads it first)
+        for no_rows, no_cols, other_cols in [(6, 6, 6), (7, 5, 3)]:
+            mat = self.mapped('%dx%d' % (no_rows, no_cols), no_rows, no_cols).as_matrix()
+            # mapped @ plain and plain @ mapped
+            for a, b in [(mat, self.plain(no_cols, other_cols)),
+                         (self.plain(other_cols, no_rows), mat)]:
+                expected = [[sum(a[i, k] * b[k, j] for k in range(a.num_cols()))
+                             for j in range(b.num_cols())] for i in range(a.num_rows())]
+                for strategy in strategies:
+                    self.assertEqual(self.cells(a.multiply(b, strategy)), expected, strategy)
+
+    def test_matrix_writes_to_file(self):
+        grid = self.mapped('grid', 4, 4)
+        mat = grid.as_matrix()
+        mat.scaleBy(2.0)
+        mat += mat
+        self.assertEqual(grid[0, 0], -28.0)
+        self.assertEqual(grid[3, 3], 32.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
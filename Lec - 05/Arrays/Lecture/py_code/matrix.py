@@ -1,37 +1,284 @@
 # بسم الله الرحمن الرحيم
 
-from array import Array2D
+from array import array
+from itertools import repeat
+from operator import add, sub, mul
+
+# NumPy is optional: when it is installed, the elementwise operations and
+# the 'auto' product run in NumPy directly on the same buffer (no copy);
+# without it the stdlib code below does the work
+try :
+    import numpy as np
+except ImportError :
+    np = None
 
 class Matrix :
-    def __init__( self, num_rows, num_cols ):                
-        self._the_grid = Array2D( num_rows, num_cols )
-        self._the_grid.clear( 0 )                              
-        
+    def __init__( self, num_rows, num_cols ):
+        self._num_rows = num_rows
+        self._num_cols = num_cols
+        # One contiguous buffer of C doubles, stored row by row:
+        # cell (r, c) lives at r * num_cols + c
+        # Repeating one 0.0 clears every cell in one step (a memcpy)
+        self._the_grid = array( 'd', [0.0] ) * ( num_rows * num_cols )
+
     def num_rows( self ):
-        return self._the_grid.num_rows()
-        
+        return self._num_rows
+
     def num_cols( self ):
-        return self._the_grid.num_cols()
+        return self._num_cols
+
+    def _cell_index( self, ndx_tuple ):
+        row = ndx_tuple[0]
+        col = ndx_tuple[1]
+        assert row >= 0 and row < self.num_rows() and \
+            col >= 0 and col < self.num_cols(), \
+                'Matrix subscript out of range'
+        return row * self._num_cols + col
 
     def __getitem__( self, ndx_tuple ):
-        return self._the_grid[ ndx_tuple[0], ndx_tuple[1] ]
+        return self._the_grid[ self._cell_index( ndx_tuple ) ]
 
     def __setitem__( self, ndx_tuple, scalar ):
-        self._theGrid[ ndx_tuple[0], ndx_tuple[1] ] = scalar
+        self._the_grid[ self._cell_index( ndx_tuple ) ] = scalar
 
-    def scaleBy( self, scalar ):        
-        for r in range( self.num_rows() ) :
-            for c in range( self.num_cols() ) :
-                self[r, c] *= scalar
-
-    def __add__( self, rhsMatrix ): 
+    def _same_size( self, rhsMatrix, op_name ):
         assert rhsMatrix.num_rows() == self.num_rows() and \
             rhsMatrix.num_cols() == self.num_cols(), \
-        "Matrix sizes not compatible for the add operation."     
-        
-        newMatrix = Matrix( self.numRows(), self.numCols() )      
-        
-        for r in range( self.numRows() ) :
-            for c in range( self.num_cols() ) :
-                newMatrix[r, c] = self[r, c] + rhsMatrix[r, c]
-        return newMatrix         
+        "Matrix sizes not compatible for the %s operation." % op_name
+
+    # The buffer seen as a 2-D NumPy array (a view: writes go to the buffer)
+    def _as_numpy( self ):
+        return np.frombuffer( self._the_grid, dtype = np.float64 ).reshape( self._num_rows, self._num_cols )
+
+    # Stdlib elementwise work is done CHUNK cells at a time, so an
+    # operation never builds a temporary copy of the whole buffer
+    CHUNK = 1 << 16
+
+    # out = self op rhs, cell by cell; rhs is a Matrix or a scalar.
+    # out may be self, which makes the operation in place
+    def _elementwise( self, op, rhs, out ):
+        if np is not None :
+            ufunc = { add: np.add, sub: np.subtract, mul: np.multiply }[op]
+            if isinstance( rhs, Matrix ) :
+                rhs = rhs._as_numpy()
+            ufunc( self._as_numpy(), rhs, out = out._as_numpy() )
+            return out
+        # map() with an operator function loops in C, not in Python
+        grid = self._the_grid
+        for start in range( 0, len( grid ), Matrix.CHUNK ) :
+            stop = min( start + Matrix.CHUNK, len( grid ) )
+            if isinstance( rhs, Matrix ) :
+                values = rhs._the_grid[start:stop]
+            else :
+                values = repeat( rhs )
+            out._the_grid[start:stop] = array( 'd', map( op, grid[start:stop], values ) )
+        return out
+
+    def scaleBy( self, scalar ):
+        self._elementwise( mul, scalar, self )
+
+    # Other matrix kinds (e.g. the sparse ones) handle mixed operations
+    # themselves: returning NotImplemented lets Python call their __radd__
+    def __add__( self, rhsMatrix ):
+        if not isinstance( rhsMatrix, Matrix ) :
+            return NotImplemented
+        self._same_size( rhsMatrix, 'add' )
+        return self._elementwise( add, rhsMatrix, Matrix( self._num_rows, self._num_cols ) )
+
+    def __sub__( self, rhsMatrix ):
+        if not isinstance( rhsMatrix, Matrix ) :
+            return NotImplemented
+        self._same_size( rhsMatrix, 'subtract' )
+        return self._elementwise( sub, rhsMatrix, Matrix( self._num_rows, self._num_cols ) )
+
+    def __mul__( self, scalar ):
+        return self._elementwise( mul, scalar, Matrix( self._num_rows, self._num_cols ) )
+
+    def __rmul__( self, scalar ):
+        return self * scalar
+
+    # In-place variants update this matrix's buffer, no new Matrix is built
+    def __iadd__( self, rhsMatrix ):
+        if not isinstance( rhsMatrix, Matrix ) :
+            return NotImplemented
+        self._same_size( rhsMatrix, 'add' )
+        return self._elementwise( add, rhsMatrix, self )
+
+    def __isub__( self, rhsMatrix ):
+        if not isinstance( rhsMatrix, Matrix ) :
+            return NotImplemented
+        self._same_size( rhsMatrix, 'subtract' )
+        return self._elementwise( sub, rhsMatrix, self )
+
+    def __imul__( self, scalar ):
+        self.scaleBy( scalar )
+        return self
+
+    # Matrix product
+    # strategy picks the kernel explicitly:
+    #   'rows'     -> i-k-j order, one row of the result at a time
+    #   'blocked'  -> the same loops, tiled into BLOCK_SIZE squares
+    #   'strassen' -> Strassen recursion down to STRASSEN_LEAF,
+    #                 then the blocked kernel
+    #   'numpy'    -> numpy.matmul (BLAS), only when NumPy is installed
+    #   'auto'     -> 'numpy' when NumPy is installed; otherwise
+    #                 'strassen' once every side is >= STRASSEN_THRESHOLD,
+    #                 'blocked' once any side is >= BLOCK_SIZE, else 'rows'
+    # Tune the three numbers with matrix_bench.py on the target machine
+    BLOCK_SIZE = 128
+    STRASSEN_THRESHOLD = 256
+    STRASSEN_LEAF = 128
+
+    def multiply( self, rhsMatrix, strategy = 'auto' ):
+        assert self.num_cols() == rhsMatrix.num_rows(), \
+        "Matrix sizes not compatible for the multiply operation."
+        if strategy == 'auto' and np is not None :
+            strategy = 'numpy'
+        elif strategy == 'auto' :
+            sides = ( self.num_rows(), self.num_cols(), rhsMatrix.num_cols() )
+            if min( sides ) >= Matrix.STRASSEN_THRESHOLD :
+                strategy = 'strassen'
+            elif max( sides ) >= Matrix.BLOCK_SIZE :
+                strategy = 'blocked'
+            else :
+                strategy = 'rows'
+
+        if strategy == 'rows' :
+            return self._multiply_rows( rhsMatrix )
+        elif strategy == 'blocked' :
+            return self._multiply_blocked( rhsMatrix, Matrix.BLOCK_SIZE )
+        elif strategy == 'strassen' :
+            return self._multiply_strassen( rhsMatrix )
+        elif strategy == 'numpy' :
+            assert np is not None, 'The numpy strategy needs NumPy installed'
+            newMatrix = Matrix( self.num_rows(), rhsMatrix.num_cols() )
+            np.matmul( self._as_numpy(), rhsMatrix._as_numpy(), out = newMatrix._as_numpy() )
+            return newMatrix
+        assert False, 'Unknown multiply strategy: %s' % strategy
+
+    def __matmul__( self, rhsMatrix ):
+        if not isinstance( rhsMatrix, Matrix ) :
+            return NotImplemented
+        return self.multiply( rhsMatrix )
+
+    # Row i of the result is the sum of a[i, k] * (row k of rhs),
+    # so both buffers are only ever read along contiguous rows
+    def _multiply_rows( self, rhsMatrix ):
+        n = self.num_rows()
+        m = self.num_cols()
+        p = rhsMatrix.num_cols()
+        a = self._the_grid
+        b = rhsMatrix._the_grid
+
+        newMatrix = Matrix( n, p )
+        for i in range( n ) :
+            acc = [0.0] * p
+            for k in range( m ) :
+                a_ik = a[i * m + k]
+                if a_ik :
+                    acc = list( map( add, acc, map( mul, b[k * p:(k + 1) * p], repeat( a_ik ) ) ) )
+            newMatrix._the_grid[i * p:(i + 1) * p] = array( 'd', acc )
+        return newMatrix
+
+    # Same idea, but the i, k and j ranges are cut into tiles so one
+    # tile of each operand is reused while it is still in the cache
+    def _multiply_blocked( self, rhsMatrix, block_size ):
+        n = self.num_rows()
+        m = self.num_cols()
+        p = rhsMatrix.num_cols()
+        a = self._the_grid
+        b = rhsMatrix._the_grid
+
+        newMatrix = Matrix( n, p )
+        c = newMatrix._the_grid
+        for i0 in range( 0, n, block_size ) :
+            i1 = min( i0 + block_size, n )
+            for k0 in range( 0, m, block_size ) :
+                k1 = min( k0 + block_size, m )
+                for j0 in range( 0, p, block_size ) :
+                    j1 = min( j0 + block_size, p )
+                    for i in range( i0, i1 ) :
+                        acc = c[i * p + j0:i * p + j1].tolist()
+                        for k in range( k0, k1 ) :
+                            a_ik = a[i * m + k]
+                            if a_ik :
+                                acc = list( map( add, acc, map( mul, b[k * p + j0:k * p + j1], repeat( a_ik ) ) ) )
+                        c[i * p + j0:i * p + j1] = array( 'd', acc )
+        return newMatrix
+
+    # Strassen works on square matrices whose side halves evenly,
+    # so pad both operands with zeros and cut the result back down
+    def _multiply_strassen( self, rhsMatrix ):
+        side = max( self.num_rows(), self.num_cols(), rhsMatrix.num_cols() )
+        product = Matrix._strassen( self._padded( side, side ), rhsMatrix._padded( side, side ) )
+        return product._padded( self.num_rows(), rhsMatrix.num_cols() )
+
+    @staticmethod
+    def _strassen( a, b ):
+        side = a.num_rows()
+        if side <= Matrix.STRASSEN_LEAF :
+            return a._multiply_blocked( b, Matrix.BLOCK_SIZE )
+        if side % 2 == 1 :
+            product = Matrix._strassen( a._padded( side + 1, side + 1 ), b._padded( side + 1, side + 1 ) )
+            return product._padded( side, side )
+
+        h = side // 2
+        a11, a12, a21, a22 = a._quadrant( 0, 0, h ), a._quadrant( 0, h, h ), a._quadrant( h, 0, h ), a._quadrant( h, h, h )
+        b11, b12, b21, b22 = b._quadrant( 0, 0, h ), b._quadrant( 0, h, h ), b._quadrant( h, 0, h ), b._quadrant( h, h, h )
+
+        # Seven half-size products instead of eight
+        m1 = Matrix._strassen( a11 + a22, b11 + b22 )
+        m2 = Matrix._strassen( a21 + a22, b11 )
+        m3 = Matrix._strassen( a11, b12 - b22 )
+        m4 = Matrix._strassen( a22, b21 - b11 )
+        m5 = Matrix._strassen( a11 + a12, b22 )
+        m6 = Matrix._strassen( a21 - a11, b11 + b12 )
+        m7 = Matrix._strassen( a12 - a22, b21 + b22 )
+
+        newMatrix = Matrix( side, side )
+        newMatrix._place( m1 + m4 - m5 + m7, 0, 0 )
+        newMatrix._place( m3 + m5, 0, h )
+        newMatrix._place( m2 + m4, h, 0 )
+        newMatrix._place( m1 - m2 + m3 + m6, h, h )
+        return newMatrix
+
+    # dest[dest_start:dest_start + count] = src[src_start:src_start + count].
+    # A buffer may be a memoryview (see MappedArrayTD.as_matrix), which an
+    # array slice refuses; a memoryview slice accepts either kind
+    @staticmethod
+    def _copy_cells( dest, dest_start, src, src_start, count ):
+        with memoryview( dest ) as view :
+            view[dest_start:dest_start + count] = src[src_start:src_start + count]
+
+    # Copy of the size x size square whose top-left cell is (r0, c0)
+    def _quadrant( self, r0, c0, size ):
+        quadrant = Matrix( size, size )
+        for r in range( size ) :
+            start = ( r0 + r ) * self._num_cols + c0
+            Matrix._copy_cells( quadrant._the_grid, r * size, self._the_grid, start, size )
+        return quadrant
+
+    # Write the cells of other into this matrix, starting at (r0, c0)
+    def _place( self, other, r0, c0 ):
+        size = other.num_cols()
+        for r in range( other.num_rows() ) :
+            start = ( r0 + r ) * self._num_cols + c0
+            Matrix._copy_cells( self._the_grid, start, other._the_grid, r * size, size )
+
+    # Copy resized to num_rows x num_cols: extra cells are 0, missing ones dropped
+    def _padded( self, num_rows, num_cols ):
+        if num_rows == self.num_rows() and num_cols == self.num_cols() :
+            return self
+        newMatrix = Matrix( num_rows, num_cols )
+        width = min( num_cols, self.num_cols() )
+        for r in range( min( num_rows, self.num_rows() ) ) :
+            start = r * self._num_cols
+            Matrix._copy_cells( newMatrix._the_grid, r * num_cols, self._the_grid, start, width )
+        return newMatrix
+
+    def __repr__( self ):
+        rows = []
+        for r in range( self.num_rows() ) :
+            start = r * self._num_cols
+            rows.append( str( self._the_grid[start:start + self._num_cols].tolist() ) )
+        return '\n'.join( rows )
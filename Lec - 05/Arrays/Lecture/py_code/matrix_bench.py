@@ -0,0 +1,63 @@
+# بسم الله الرحمن الرحيم
+
+# Time every Matrix multiply strategy on square matrices of growing size
+# and report where 'blocked' starts to beat 'rows' and where 'strassen'
+# starts to beat 'blocked' on this machine.
+#
+# Usage: python matrix_bench.py [size size ...]
+# Use the crossover sizes to set Matrix.BLOCK_SIZE / STRASSEN_THRESHOLD
+
+import random
+import sys
+import time
+
+import matrix
+from matrix import Matrix
+
+STRATEGIES = ['rows', 'blocked', 'strassen']
+if matrix.np is not None:
+    STRATEGIES.append('numpy')
+
+def random_matrix(n):
+    mat = Matrix(n, n)
+    for r in range(n):
+        for c in range(n):
+            mat[r, c] = random.random()
+    return mat
+
+def best_time(a, b, strategy, repeats=3):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        a.multiply(b, strategy)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main():
+    if len(sys.argv) > 1:
+        sizes = [int(arg) for arg in sys.argv[1:]]
+    else:
+        sizes = [32, 64, 128, 256, 384, 512]
+
+    print('%6s' % 'n' + ''.join('%12s' % s for s in STRATEGIES))
+    crossover = {}
+    for n in sizes:
+        a = random_matrix(n)
+        b = random_matrix(n)
+        times = {s: best_time(a, b, s) for s in STRATEGIES}
+        print('%6d' % n + ''.join('%11.4fs' % times[s] for s in STRATEGIES))
+
+        if times['blocked'] < times['rows']:
+            crossover.setdefault('blocked beats rows', n)
+        if times['strassen'] < times['blocked']:
+            crossover.setdefault('strassen beats blocked', n)
+
+    print()
+    for name in ['blocked beats rows', 'strassen beats blocked']:
+        print('%-24s %s' % (name + ':', crossover.get(name, 'not within these sizes')))
+
+
+if __name__ == '__main__':
+    main()
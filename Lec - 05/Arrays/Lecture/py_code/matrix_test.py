@@ -0,0 +1,100 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+
+import matrix
+from matrix import Matrix
+
+STRATEGIES = ['rows', 'blocked', 'strassen', 'auto']
+if matrix.np is not None:
+    STRATEGIES.append('numpy')
+
+class TestMatrix(unittest.TestCase):
+
+    def setUp(self):
+        # Small tiles and leaves, so the test sizes already cross tile
+        # edges and recurse a few levels
+        self._sizes = Matrix.BLOCK_SIZE, Matrix.STRASSEN_THRESHOLD, Matrix.STRASSEN_LEAF
+        Matrix.BLOCK_SIZE, Matrix.STRASSEN_THRESHOLD, Matrix.STRASSEN_LEAF = 4, 8, 3
+
+    def tearDown(self):
+        Matrix.BLOCK_SIZE, Matrix.STRASSEN_THRESHOLD, Matrix.STRASSEN_LEAF = self._sizes
+
+    # Small ints: every product and sum is exact in a double, so all
+    # strategies must agree to the last bit
+    @staticmethod
+    def random_matrix(rnd, num_rows, num_cols):
+        mat = Matrix(num_rows, num_cols)
+        for r in range(num_rows):
+            for c in range(num_cols):
+                mat[r, c] = rnd.randrange(-9, 10)
+        return mat
+
+    @staticmethod
+    def cells(mat):
+        return [[mat[r, c] for c in range(mat.num_cols())] for r in range(mat.num_rows())]
+
+    def test_strategies_agree(self):
+        rnd = random.Random(28)
+        shapes = [(1, 1, 1), (2, 3, 4), (5, 7, 3), (9, 9, 9), (10, 3, 17), (16, 16, 16), (13, 21, 8)]
+        for n, m, p in shapes:
+            a = self.random_matrix(rnd, n, m)
+            b = self.random_matrix(rnd, m, p)
+            expected = [[sum(a[i, k] * b[k, j] for k in range(m)) for j in range(p)]
+                        for i in range(n)]
+            for strategy in STRATEGIES:
+                product = a.multiply(b, strategy)
+                self.assertEqual((product.num_rows(), product.num_cols()), (n, p))
+                self.assertEqual(self.cells(product), expected, (n, m, p, strategy))
+            self.assertEqual(self.cells(a @ b), expected)
+
+    def test_zero_rows_are_skipped_correctly(self):
+        # The kernels skip a[i, k] == 0; a sparse left side must still
+        # give the full product
+        rnd = random.Random(29)
+        a = self.random_matrix(rnd, 7, 5)
+        for r in range(0, 7, 2):
+            for c in range(5):
+                a[r, c] = 0
+        b = self.random_matrix(rnd, 5, 6)
+        results = [self.cells(a.multiply(b, strategy)) for strategy in STRATEGIES]
+        for result in results[1:]:
+            self.assertEqual(result, results[0])
+
+    def test_incompatible_sizes(self):
+        self.assertRaises(AssertionError, Matrix(2, 3).multiply, Matrix(2, 3))
+        self.assertRaises(AssertionError, Matrix(2, 3).multiply, Matrix(3, 2), 'no-such-strategy')
+
+    def test_elementwise(self):
+        rnd = random.Random(30)
+        a = self.random_matrix(rnd, 5, 3)
+        b = self.random_matrix(rnd, 5, 3)
+        ca, cb = self.cells(a), self.cells(b)
+        self.assertEqual(self.cells(a + b), [[x + y for x, y in zip(r, s)] for r, s in zip(ca, cb)])
+        self.assertEqual(self.cells(a - b), [[x - y for x, y in zip(r, s)] for r, s in zip(ca, cb)])
+        self.assertEqual(self.cells(a * 2), [[x * 2 for x in r] for r in ca])
+        self.assertEqual(self.cells(3 * a), [[x * 3 for x in r] for r in ca])
+        a += b
+        a -= b
+        self.assertEqual(self.cells(a), ca)
+        a *= 0.5
+        self.assertEqual(self.cells(a), [[x * 0.5 for x in r] for r in ca])
+        self.assertRaises(AssertionError, a.__add__, Matrix(3, 5))
+
+    def test_elementwise_in_chunks(self):
+        # Larger than CHUNK, so the stdlib path works chunk by chunk
+        size = Matrix.CHUNK + 7
+        a = Matrix(1, size)
+        b = Matrix(1, size)
+        for c in range(0, size, 997):
+            a[0, c] = c
+            b[0, c] = 1
+        total = a + b
+        self.assertEqual(total[0, size - 1], 0.0)
+        for c in range(0, size, 997):
+            self.assertEqual(total[0, c], c + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
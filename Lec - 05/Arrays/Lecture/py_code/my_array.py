@@ -17,8 +17,7 @@ class MyArray:
         return self._size
 
     def clear(self, value):
-        for i in range(len(self)):
-            self._elements[i] = value
+        self.fill(0, len(self), value)
 
     def __iter__(self):
         return self
@@ -30,6 +29,19 @@ class MyArray:
         else:
             raise StopIteration
     
+    # Copy the items start, start+step, ... (before stop) into a list
+    # The slice is taken by ctypes in C, not one item at a time
+    def slice(self, start, stop, step=1):
+        return self._elements[start:stop:step]
+
+    # Set the items start .. stop-1 to value in one step
+    def fill(self, start, stop, value):
+        self._elements[start:stop] = [value] * (stop - start)
+
+    # Copy a list of values into the items start, start+1, ... in one step
+    def set_slice(self, start, values):
+        self._elements[start:start + len(values)] = values
+
     # Makes our array subscriptable
     def __getitem__(self, index):
         assert index >= 0 and index < len(self), 'Array subscript out of range'
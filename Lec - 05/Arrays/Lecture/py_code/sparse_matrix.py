@@ -0,0 +1,364 @@
+# بسم الله الرحمن الرحيم
+
+# Sparse counterparts of Matrix: only the non-zero cells are stored,
+# so memory and time grow with the number of non-zeros (nnz),
+# not with num_rows * num_cols.
+#
+#   DOKMatrix -> Dictionary Of Keys, for building a matrix cell by cell
+#   CSRMatrix -> Compressed Sparse Row, for computing (row-wise products)
+#   CSCMatrix -> Compressed Sparse Column, the same idea by columns
+#
+# All of them share the Matrix interface: num_rows(), num_cols(), [r, c],
+# +, scaleBy and @, with a sparse or a dense Matrix on the other side.
+
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from operator import add, mul
+
+from matrix import Matrix
+
+def _check_index(mat, ndx_tuple):
+    row = ndx_tuple[0]
+    col = ndx_tuple[1]
+    assert row >= 0 and row < mat.num_rows() and \
+        col >= 0 and col < mat.num_cols(), \
+            'Matrix subscript out of range'
+    return row, col
+
+def _check_same_size(mat, rhsMatrix):
+    assert rhsMatrix.num_rows() == mat.num_rows() and \
+        rhsMatrix.num_cols() == mat.num_cols(), \
+    "Matrix sizes not compatible for the add operation."
+
+# sparse + dense always gives a dense Matrix
+def _add_to_dense(sparse, dense):
+    _check_same_size(sparse, dense)
+    newMatrix = dense * 1
+    cols = newMatrix.num_cols()
+    for row, col, value in sparse.triplets():
+        newMatrix._the_grid[row * cols + col] += value
+    return newMatrix
+
+
+class DOKMatrix:
+    def __init__(self, num_rows, num_cols):
+        self._num_rows = num_rows
+        self._num_cols = num_cols
+        # {(row, col): value}, zero cells are simply not in the dictionary
+        self._cells = {}
+
+    # Build from (row, col, value) triplets (the COO form);
+    # repeated cells are added together
+    @classmethod
+    def from_triplets(cls, num_rows, num_cols, triplets):
+        newMatrix = cls(num_rows, num_cols)
+        for row, col, value in triplets:
+            _check_index(newMatrix, (row, col))
+            newMatrix[row, col] = newMatrix[row, col] + value
+        return newMatrix
+
+    def num_rows(self):
+        return self._num_rows
+
+    def num_cols(self):
+        return self._num_cols
+
+    def nnz(self):
+        return len(self._cells)
+
+    def __getitem__(self, ndx_tuple):
+        return self._cells.get(_check_index(self, ndx_tuple), 0.0)
+
+    def __setitem__(self, ndx_tuple, scalar):
+        key = _check_index(self, ndx_tuple)
+        if scalar:
+            self._cells[key] = scalar
+        else:
+            self._cells.pop(key, None)
+
+    def triplets(self):
+        for (row, col), value in self._cells.items():
+            yield row, col, value
+
+    def scaleBy(self, scalar):
+        if not scalar:
+            self._cells.clear()
+            return
+        for key in self._cells:
+            self._cells[key] *= scalar
+
+    def __add__(self, rhsMatrix):
+        if isinstance(rhsMatrix, Matrix):
+            return _add_to_dense(self, rhsMatrix)
+        _check_same_size(self, rhsMatrix)
+        newMatrix = DOKMatrix(self._num_rows, self._num_cols)
+        newMatrix._cells = dict(self._cells)
+        for row, col, value in rhsMatrix.triplets():
+            newMatrix[row, col] = newMatrix._cells.get((row, col), 0.0) + value
+        return newMatrix
+
+    def __radd__(self, lhsMatrix):
+        return self + lhsMatrix
+
+    # Products are computed in CSR form
+    def __matmul__(self, rhsMatrix):
+        return self.to_csr() @ rhsMatrix
+
+    def __rmatmul__(self, lhsMatrix):
+        return lhsMatrix @ self.to_csr()
+
+    def to_dok(self):
+        return self
+
+    def to_csr(self):
+        return CSRMatrix.from_triplets(self._num_rows, self._num_cols, self.triplets())
+
+    def to_csc(self):
+        return CSCMatrix.from_triplets(self._num_rows, self._num_cols, self.triplets())
+
+    def to_dense(self):
+        return _add_to_dense(self, Matrix(self._num_rows, self._num_cols))
+
+
+class _CompressedMatrix:
+    # Storage shared by CSR and CSC
+    # A "line" is a row in CSR and a column in CSC. The non-zeros of line i
+    # are at positions indptr[i] .. indptr[i+1]-1 of two parallel arrays:
+    # indices (the column in CSR / the row in CSC), sorted, and data (values)
+    def __init__(self, num_rows, num_cols):
+        self._num_rows = num_rows
+        self._num_cols = num_cols
+        self._indptr = array('l', [0]) * (self._num_lines() + 1)
+        self._indices = array('l')
+        self._data = array('d')
+
+    # Build from (row, col, value) triplets in any order;
+    # repeated cells are added together
+    @classmethod
+    def from_triplets(cls, num_rows, num_cols, triplets):
+        newMatrix = cls(num_rows, num_cols)
+        lines = [[] for _ in range(newMatrix._num_lines())]
+        for row, col, value in triplets:
+            _check_index(newMatrix, (row, col))
+            line, index = newMatrix._line_of(row, col)
+            lines[line].append((index, value))
+
+        indptr = newMatrix._indptr
+        indices = newMatrix._indices
+        data = newMatrix._data
+        for line, entries in enumerate(lines):
+            entries.sort()
+            for index, value in entries:
+                if len(indices) > indptr[line] and indices[-1] == index:
+                    data[-1] += value
+                else:
+                    indices.append(index)
+                    data.append(value)
+            indptr[line + 1] = len(indices)
+        newMatrix._drop_zeros()
+        return newMatrix
+
+    def num_rows(self):
+        return self._num_rows
+
+    def num_cols(self):
+        return self._num_cols
+
+    def nnz(self):
+        return len(self._data)
+
+    def _find(self, ndx_tuple):
+        line, index = self._line_of(*_check_index(self, ndx_tuple))
+        hi = self._indptr[line + 1]
+        pos = bisect_left(self._indices, index, self._indptr[line], hi)
+        return line, index, pos, pos < hi and self._indices[pos] == index
+
+    def __getitem__(self, ndx_tuple):
+        line, index, pos, found = self._find(ndx_tuple)
+        return self._data[pos] if found else 0.0
+
+    # Writing an existing non-zero is O(log) but inserting or deleting one
+    # shifts the arrays, O(nnz): build with DOKMatrix, then convert
+    def __setitem__(self, ndx_tuple, scalar):
+        line, index, pos, found = self._find(ndx_tuple)
+        if found and scalar:
+            self._data[pos] = scalar
+        elif found:
+            del self._indices[pos]
+            del self._data[pos]
+            self._shift_indptr(line, -1)
+        elif scalar:
+            self._indices.insert(pos, index)
+            self._data.insert(pos, scalar)
+            self._shift_indptr(line, 1)
+
+    def _shift_indptr(self, line, amount):
+        self._indptr[line + 1:] = array('l', map(add, self._indptr[line + 1:], repeat(amount)))
+
+    # Remove explicit zeros (e.g. after a + b cancelled some cells)
+    def _drop_zeros(self):
+        if 0.0 not in self._data:
+            return
+        indptr = array('l', [0])
+        indices = array('l')
+        data = array('d')
+        for line in range(self._num_lines()):
+            for pos in range(self._indptr[line], self._indptr[line + 1]):
+                if self._data[pos]:
+                    indices.append(self._indices[pos])
+                    data.append(self._data[pos])
+            indptr.append(len(data))
+        self._indptr = indptr
+        self._indices = indices
+        self._data = data
+
+    def triplets(self):
+        for line in range(self._num_lines()):
+            for pos in range(self._indptr[line], self._indptr[line + 1]):
+                row, col = self._line_of(line, self._indices[pos])
+                yield row, col, self._data[pos]
+
+    def scaleBy(self, scalar):
+        if not scalar:
+            self.__init__(self._num_rows, self._num_cols)
+            return
+        self._data[:] = array('d', map(mul, self._data, repeat(scalar)))
+
+    # Sparse + sparse keeps the format of the left operand:
+    # line by line, the two sorted runs of indices are merged
+    def __add__(self, rhsMatrix):
+        if isinstance(rhsMatrix, Matrix):
+            return _add_to_dense(self, rhsMatrix)
+        _check_same_size(self, rhsMatrix)
+        rhs = self._same_format(rhsMatrix)
+
+        newMatrix = type(self)(self._num_rows, self._num_cols)
+        for line in range(self._num_lines()):
+            i, i_end = self._indptr[line], self._indptr[line + 1]
+            j, j_end = rhs._indptr[line], rhs._indptr[line + 1]
+            while i < i_end or j < j_end:
+                if j == j_end or (i < i_end and self._indices[i] < rhs._indices[j]):
+                    index, value = self._indices[i], self._data[i]
+                    i += 1
+                elif i == i_end or rhs._indices[j] < self._indices[i]:
+                    index, value = rhs._indices[j], rhs._data[j]
+                    j += 1
+                else:
+                    index, value = self._indices[i], self._data[i] + rhs._data[j]
+                    i += 1
+                    j += 1
+                if value:
+                    newMatrix._indices.append(index)
+                    newMatrix._data.append(value)
+            newMatrix._indptr[line + 1] = len(newMatrix._data)
+        return newMatrix
+
+    def __radd__(self, lhsMatrix):
+        return self + lhsMatrix
+
+    def to_dok(self):
+        return DOKMatrix.from_triplets(self._num_rows, self._num_cols, self.triplets())
+
+    def to_dense(self):
+        return _add_to_dense(self, Matrix(self._num_rows, self._num_cols))
+
+
+class CSRMatrix(_CompressedMatrix):
+    def _num_lines(self):
+        return self._num_rows
+
+    # (row, col) <-> (line, index); the mapping is its own inverse
+    def _line_of(self, row, col):
+        return row, col
+
+    def _same_format(self, other):
+        return other.to_csr()
+
+    def to_csr(self):
+        return self
+
+    def to_csc(self):
+        return CSCMatrix.from_triplets(self._num_rows, self._num_cols, self.triplets())
+
+    def _row(self, row):
+        return range(self._indptr[row], self._indptr[row + 1])
+
+    # sparse @ dense -> dense: row i of the result is the sum of
+    # value * (row k of rhs) over the non-zeros (k, value) of row i
+    # sparse @ sparse -> CSR: the same sum, kept in a dictionary
+    def __matmul__(self, rhsMatrix):
+        assert self.num_cols() == rhsMatrix.num_rows(), \
+        "Matrix sizes not compatible for the multiply operation."
+        n = self.num_rows()
+        p = rhsMatrix.num_cols()
+
+        if isinstance(rhsMatrix, Matrix):
+            b = rhsMatrix._the_grid
+            newMatrix = Matrix(n, p)
+            for i in range(n):
+                acc = [0.0] * p
+                for pos in self._row(i):
+                    k = self._indices[pos]
+                    acc = list(map(add, acc, map(mul, b[k * p:(k + 1) * p], repeat(self._data[pos]))))
+                newMatrix._the_grid[i * p:(i + 1) * p] = array('d', acc)
+            return newMatrix
+
+        rhs = rhsMatrix.to_csr()
+        newMatrix = CSRMatrix(n, p)
+        for i in range(n):
+            acc = {}
+            for pos in self._row(i):
+                value = self._data[pos]
+                for rhs_pos in rhs._row(self._indices[pos]):
+                    j = rhs._indices[rhs_pos]
+                    acc[j] = acc.get(j, 0.0) + value * rhs._data[rhs_pos]
+            for j in sorted(acc):
+                if acc[j]:
+                    newMatrix._indices.append(j)
+                    newMatrix._data.append(acc[j])
+            newMatrix._indptr[i + 1] = len(newMatrix._data)
+        return newMatrix
+
+    # dense @ sparse -> dense: each non-zero a[i, k] of the dense row
+    # adds a[i, k] * (row k of this matrix) into row i of the result
+    def __rmatmul__(self, lhsMatrix):
+        assert isinstance(lhsMatrix, Matrix)
+        assert lhsMatrix.num_cols() == self.num_rows(), \
+        "Matrix sizes not compatible for the multiply operation."
+        n = lhsMatrix.num_rows()
+        m = lhsMatrix.num_cols()
+        p = self.num_cols()
+        newMatrix = Matrix(n, p)
+        for i in range(n):
+            acc = [0.0] * p
+            for k, a_ik in enumerate(lhsMatrix._the_grid[i * m:(i + 1) * m]):
+                if a_ik:
+                    for pos in self._row(k):
+                        acc[self._indices[pos]] += a_ik * self._data[pos]
+            newMatrix._the_grid[i * p:(i + 1) * p] = array('d', acc)
+        return newMatrix
+
+
+class CSCMatrix(_CompressedMatrix):
+    def _num_lines(self):
+        return self._num_cols
+
+    def _line_of(self, row, col):
+        return col, row
+
+    def _same_format(self, other):
+        return other.to_csc()
+
+    def to_csr(self):
+        return CSRMatrix.from_triplets(self._num_rows, self._num_cols, self.triplets())
+
+    def to_csc(self):
+        return self
+
+    # Products are computed in CSR form
+    def __matmul__(self, rhsMatrix):
+        return self.to_csr() @ rhsMatrix
+
+    def __rmatmul__(self, lhsMatrix):
+        return lhsMatrix @ self.to_csr()
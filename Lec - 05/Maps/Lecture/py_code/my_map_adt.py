@@ -24,4 +24,27 @@ class MyMapADT:
         pass
 
     def __next__(self):
-        pass
\ No newline at end of file
+        pass
+
+    # Bulk operations
+    # These defaults just loop over add / value_of;
+    # implementations override them when they can do better
+
+    # Build a new map from (key, value) pairs (later pairs win).
+    # Any other arguments go to the constructor, for maps that need them:
+    # MyMapCache.from_items(pairs, 100, policy='lfu'),
+    # MyMapDisk.from_items(pairs, path)
+    @classmethod
+    def from_items(cls, items, *args, **kwargs):
+        the_map = cls(*args, **kwargs)
+        the_map.update(items)
+        return the_map
+
+    # Add every (key, value) pair
+    def update(self, items):
+        for key, val in items:
+            self.add(key, val)
+
+    # Values of many keys at once, as a list in the same order
+    def get_many(self, keys):
+        return [self.value_of(key) for key in keys]
@@ -0,0 +1,217 @@
+# بسم الله الرحمن الرحيم
+
+# Benchmark every MyMapADT implementation against the built-in dict
+#
+# For each map, key stream and size n:
+#   1. load n keys from the stream with add()
+#   2. run n mixed operations: value_of() on a present key with
+#      probability --read-ratio, otherwise add() of a stream key
+# and report operations per second, p50/p99 latency of one operation and
+# (with --memory) bytes per entry measured with tracemalloc.
+#
+# Key streams:
+#   uniform     random ints
+#   zipf        a few keys are very popular (Zipf, s = 1)
+#   collisions  ints that are all multiples of 2**20: their low bits are
+#               equal, the worst case for a table indexed with an unmixed
+#               hash & (capacity - 1)
+#
+# Examples:
+#   python my_map_bench.py
+#   python my_map_bench.py --sizes 1000000,10000000 --maps probing,btree,dict
+#   python my_map_bench.py --streams zipf --read-ratio 0.99 --profile
+#
+# MyMapO and MyMap scan a list on every operation: their runs only go up
+# to --linear-limit keys.
+#
+# The caches get room for every key, so reads never miss: they show what
+# the eviction bookkeeping costs on top of a dict. MyMapDisk maps are
+# closed before their temporary folders are removed (Windows cannot
+# remove open files).
+
+import argparse
+import bisect
+import cProfile
+import gc
+import itertools
+import pstats
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from my_map_btree import MyMapBTree
+from my_map_cache import MyMapCache
+from my_map_chaining import MyMapChaining
+from my_map_disk import MyMapDisk
+from my_map_imp_one import MyMapO
+from my_map_imp_two import MyMap
+from my_map_ordered import MyMapOrdered
+from my_map_probing import MyMapProbing
+from my_map_striped import MyMapStriped
+
+class DictMap:
+    # dict behind the same add / value_of interface
+    def __init__(self):
+        self._d = {}
+
+    def add(self, key, val):
+        self._d[key] = val
+
+    def value_of(self, key):
+        return self._d[key]
+
+
+_disk_dirs = []
+
+def _disk_map():
+    _disk_dirs.append(tempfile.mkdtemp())
+    return MyMapDisk(_disk_dirs[-1] + '/bench')
+
+def _close(the_map):
+    if hasattr(the_map, 'close'):
+        the_map.close()
+
+# Larger than any --sizes value
+CACHE_CAPACITY = 10 ** 8
+
+# name -> (constructor, True if every operation is O(n))
+MAPS = {
+    'MyMapO': (MyMapO, True),
+    'MyMap': (MyMap, True),
+    'probing': (MyMapProbing, False),
+    'chaining': (MyMapChaining, False),
+    'ordered': (MyMapOrdered, False),
+    'btree': (MyMapBTree, False),
+    'striped': (MyMapStriped, False),
+    'disk': (_disk_map, False),
+    'cache': (lambda: MyMapCache(CACHE_CAPACITY, 'lru'), False),
+    'cache-lfu': (lambda: MyMapCache(CACHE_CAPACITY, 'lfu'), False),
+    'dict': (DictMap, False),
+}
+
+# Key streams: n keys drawn from a universe of about n distinct keys
+
+def uniform_keys(n, rnd):
+    return [rnd.randrange(n * 4) for _ in range(n)]
+
+def zipf_keys(n, rnd):
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, n + 1)))
+    total = cumulative[-1]
+    return [bisect.bisect_left(cumulative, rnd.random() * total) for _ in range(n)]
+
+def collision_keys(n, rnd):
+    return [rnd.randrange(n * 4) << 20 for _ in range(n)]
+
+STREAMS = {'uniform': uniform_keys, 'zipf': zipf_keys, 'collisions': collision_keys}
+
+
+def bytes_per_entry(new_map, keys):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    the_map = new_map()
+    try:
+        for key in keys:
+            the_map.add(key, None)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+        _close(the_map)
+    return used / max(len(set(keys)), 1)
+
+def run_ops(the_map, ops):
+    clock = time.perf_counter_ns
+    latencies = []
+    record = latencies.append
+    for is_read, key in ops:
+        start = clock()
+        if is_read:
+            the_map.value_of(key)
+        else:
+            the_map.add(key, key)
+        record(clock() - start)
+    return latencies
+
+def bench(name, size, stream, args, rnd):
+    new_map, linear = MAPS[name]
+    if linear and size > args.linear_limit:
+        return None
+    keys = STREAMS[stream](size, rnd)
+    loaded = list(dict.fromkeys(keys))
+    ops = [(True, rnd.choice(loaded)) if rnd.random() < args.read_ratio else (False, rnd.choice(keys))
+           for _ in range(size)]
+
+    the_map = new_map()
+    try:
+        for key in keys:
+            the_map.add(key, key)
+
+        profiler = cProfile.Profile() if args.profile else None
+        gc.disable()
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        latencies = run_ops(the_map, ops)
+        if profiler:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+        _close(the_map)
+
+    if profiler:
+        print('--- profile: %s, %s, n=%d' % (name, stream, size))
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(12)
+
+    latencies.sort()
+    result = {'ops_per_sec': len(ops) / elapsed,
+              'p50_us': latencies[len(latencies) // 2] / 1000,
+              'p99_us': latencies[int(len(latencies) * 0.99)] / 1000,
+              'bytes_per_entry': None}
+    if args.memory:
+        result['bytes_per_entry'] = bytes_per_entry(new_map, keys)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the MyMapADT implementations')
+    parser.add_argument('--maps', default=','.join(MAPS),
+                        help='comma-separated, from: ' + ', '.join(MAPS))
+    parser.add_argument('--streams', default=','.join(STREAMS),
+                        help='comma-separated, from: ' + ', '.join(STREAMS))
+    parser.add_argument('--sizes', default='1000,100000',
+                        help='comma-separated number of keys (up to 10**7)')
+    parser.add_argument('--read-ratio', type=float, default=0.9,
+                        help='fraction of the mixed operations that are reads')
+    parser.add_argument('--linear-limit', type=int, default=20000,
+                        help='largest size to run the O(n) maps at')
+    parser.add_argument('--memory', action='store_true',
+                        help='measure bytes per entry with tracemalloc')
+    parser.add_argument('--profile', action='store_true',
+                        help='print a cProfile report of every mixed phase')
+    parser.add_argument('--seed', type=int, default=26)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    print('%-10s %-11s %9s %13s %9s %9s %9s' %
+          ('map', 'stream', 'n', 'ops/sec', 'p50 us', 'p99 us', 'B/entry'))
+    try:
+        for size in [int(s) for s in args.sizes.split(',')]:
+            for stream in args.streams.split(','):
+                for name in args.maps.split(','):
+                    result = bench(name, size, stream, args, rnd)
+                    if result is None:
+                        print('%-10s %-11s %9d %13s' % (name, stream, size, 'skipped'))
+                        continue
+                    memory = result['bytes_per_entry']
+                    print('%-10s %-11s %9d %13.0f %9.2f %9.2f %9s' %
+                          (name, stream, size, result['ops_per_sec'], result['p50_us'],
+                           result['p99_us'], '%.1f' % memory if memory is not None else '-'))
+    finally:
+        for path in _disk_dirs:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
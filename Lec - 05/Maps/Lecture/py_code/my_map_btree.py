@@ -0,0 +1,277 @@
+# بسم الله الرحمن الرحيم
+
+# Ordered map: a B+tree
+#
+# Instead of one key per node (like a binary tree), every node holds a
+# sorted array of up to ORDER keys, searched with binary search. The tree
+# is therefore very shallow (ORDER = 64 and 10^8 keys is 5 levels) and
+# each step down reads one contiguous array instead of chasing pointers.
+#
+#   - leaves hold the keys and their values, and are linked left to right,
+#     so a range scan just walks the leaves
+#   - inner nodes hold only separator keys: child i holds the keys that
+#     are >= keys[i-1] and < keys[i]
+#
+# With key_typecode (e.g. 'q' for int keys) the leaf keys are stored in
+# typed arrays, 8 bytes per key instead of a pointer to a boxed int.
+
+import importlib.util
+import os
+from array import array
+
+from my_map_adt import MyMapADT
+
+# binary_search.py is loaded from its file in the Lecture 03 folder,
+# so importing this module leaves sys.path alone
+_spec = importlib.util.spec_from_file_location('binary_search', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', '..', '..', 'Lec - 03', 'py_code', 'binary_search.py'))
+_binary_search = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_binary_search)
+binary_search_position = _binary_search.binary_search_position
+
+class _Leaf:
+    def __init__(self, keys):
+        self.keys = keys
+        self.values = []
+        self.next = None
+
+class _Inner:
+    def __init__(self):
+        self.keys = []
+        self.children = []
+
+
+class MyMapBTree(MyMapADT):
+    def __init__(self, order=64, key_typecode=None):
+        assert order >= 4, 'order must be >= 4'
+        self._order = order
+        # Every node but the root keeps at least this many keys
+        self._min_keys = order // 2
+        self._key_typecode = key_typecode
+        self._root = _Leaf(self._new_keys())
+        self._size = 0
+
+        # for iterator
+        self._walker = None
+
+    def _new_keys(self):
+        return array(self._key_typecode) if self._key_typecode else []
+
+    # Build the tree from (key, value) pairs sorted by key in O(n):
+    # fill the leaves left to right, then build each inner level on top
+    @classmethod
+    def bulk_load(cls, sorted_items, order=64, key_typecode=None):
+        the_map = cls(order, key_typecode)
+        leaves = [the_map._root]
+        for key, val in sorted_items:
+            leaf = leaves[-1]
+            if leaf.keys:
+                assert leaf.keys[-1] < key, 'bulk_load needs strictly increasing keys'
+            if len(leaf.keys) == order:
+                leaf = _Leaf(the_map._new_keys())
+                leaves[-1].next = leaf
+                leaves.append(leaf)
+            leaf.keys.append(key)
+            leaf.values.append(val)
+            the_map._size += 1
+
+        # A short last node borrows half of its left neighbour's entries
+        if len(leaves) > 1 and len(leaves[-1].keys) < the_map._min_keys:
+            left, last = leaves[-2], leaves[-1]
+            half = (len(left.keys) + len(last.keys)) // 2
+            last.keys = left.keys[half:] + last.keys
+            last.values = left.values[half:] + last.values
+            del left.keys[half:]
+            del left.values[half:]
+
+        level = [(leaf, leaf.keys[0] if leaf.keys else None) for leaf in leaves]
+        while len(level) > 1:
+            groups = [level[i:i + order + 1] for i in range(0, len(level), order + 1)]
+            if len(groups) > 1 and len(groups[-1]) < the_map._min_keys + 1:
+                both = groups[-2] + groups[-1]
+                groups[-2:] = [both[:len(both) // 2], both[len(both) // 2:]]
+            next_level = []
+            for group in groups:
+                inner = _Inner()
+                inner.children = [child for child, _ in group]
+                inner.keys = [first for _, first in group[1:]]
+                next_level.append((inner, group[0][1]))
+            level = next_level
+        the_map._root = level[0][0]
+        return the_map
+
+    def __len__(self):
+        return self._size
+
+    # Which child of an inner node may hold key
+    def _child_index(self, inner, key):
+        pos = binary_search_position(inner.keys, key)
+        if pos < len(inner.keys) and inner.keys[pos] == key:
+            pos += 1
+        return pos
+
+    # Walk down to the leaf for key; path is the list of (inner, child index)
+    def _find_leaf(self, key):
+        path = []
+        node = self._root
+        while isinstance(node, _Inner):
+            idx = self._child_index(node, key)
+            path.append((node, idx))
+            node = node.children[idx]
+        return node, path
+
+    def _find(self, key):
+        leaf, path = self._find_leaf(key)
+        pos = binary_search_position(leaf.keys, key)
+        found = pos < len(leaf.keys) and leaf.keys[pos] == key
+        return leaf, path, pos, found
+
+    def __contains__(self, key):
+        return self._find(key)[3]
+
+    # if key exists -> update its value
+    # if key does not exist -> insert it in its leaf, splitting full
+    # nodes on the way back up
+    def add(self, key, val):
+        leaf, path, pos, found = self._find(key)
+        if found:
+            leaf.values[pos] = val
+            return
+        leaf.keys.insert(pos, key)
+        leaf.values.insert(pos, val)
+        self._size += 1
+        if len(leaf.keys) <= self._order:
+            return
+
+        # Split the leaf: the right half moves to a new leaf and its
+        # first key becomes the separator in the parent
+        half = len(leaf.keys) // 2
+        right = _Leaf(leaf.keys[half:])
+        right.values = leaf.values[half:]
+        del leaf.keys[half:]
+        del leaf.values[half:]
+        right.next = leaf.next
+        leaf.next = right
+        separator, new_node = right.keys[0], right
+
+        while path:
+            inner, idx = path.pop()
+            inner.keys.insert(idx, separator)
+            inner.children.insert(idx + 1, new_node)
+            if len(inner.keys) <= self._order:
+                return
+            half = len(inner.keys) // 2
+            new_node = _Inner()
+            separator = inner.keys[half]
+            new_node.keys = inner.keys[half + 1:]
+            new_node.children = inner.children[half + 1:]
+            del inner.keys[half:]
+            del inner.children[half + 1:]
+
+        # The root itself was split: the tree grows one level
+        root = _Inner()
+        root.keys = [separator]
+        root.children = [self._root, new_node]
+        self._root = root
+
+    # remove using key, returns (key, value) like MyMapO
+    def remove(self, key):
+        leaf, path, pos, found = self._find(key)
+        assert found
+        entry = leaf.keys.pop(pos), leaf.values.pop(pos)
+        self._size -= 1
+
+        node = leaf
+        while path and len(node.keys) < self._min_keys:
+            parent, idx = path.pop()
+            self._fix_underflow(parent, idx)
+            node = parent
+
+        # An inner root left with a single child is dropped
+        if isinstance(self._root, _Inner) and not self._root.keys:
+            self._root = self._root.children[0]
+        return entry
+
+    # Child idx of parent has too few keys: borrow one from a sibling
+    # that can spare it, otherwise merge with a sibling
+    def _fix_underflow(self, parent, idx):
+        node = parent.children[idx]
+        left = parent.children[idx - 1] if idx > 0 else None
+        right = parent.children[idx + 1] if idx + 1 < len(parent.children) else None
+        is_leaf = isinstance(node, _Leaf)
+
+        if left is not None and len(left.keys) > self._min_keys:
+            if is_leaf:
+                node.keys.insert(0, left.keys.pop())
+                node.values.insert(0, left.values.pop())
+                parent.keys[idx - 1] = node.keys[0]
+            else:
+                node.keys.insert(0, parent.keys[idx - 1])
+                node.children.insert(0, left.children.pop())
+                parent.keys[idx - 1] = left.keys.pop()
+        elif right is not None and len(right.keys) > self._min_keys:
+            if is_leaf:
+                node.keys.append(right.keys.pop(0))
+                node.values.append(right.values.pop(0))
+                parent.keys[idx] = right.keys[0]
+            else:
+                node.keys.append(parent.keys[idx])
+                node.children.append(right.children.pop(0))
+                parent.keys[idx] = right.keys.pop(0)
+        else:
+            # Merge the right one of the pair into the left one
+            if left is None:
+                left, node, idx = node, right, idx + 1
+            if is_leaf:
+                left.keys += node.keys
+                left.values += node.values
+                left.next = node.next
+            else:
+                left.keys += [parent.keys[idx - 1]] + node.keys
+                left.children += node.children
+            del parent.keys[idx - 1]
+            del parent.children[idx]
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        leaf, path, pos, found = self._find(key)
+        assert found
+        return leaf.values[pos]
+
+    # Keys lo <= key <= hi in order (None means unbounded): one walk
+    # down to the first leaf, then along the linked leaves
+    def range(self, lo=None, hi=None):
+        if lo is None:
+            leaf = self._root
+            while isinstance(leaf, _Inner):
+                leaf = leaf.children[0]
+            pos = 0
+        else:
+            leaf = self._find_leaf(lo)[0]
+            pos = binary_search_position(leaf.keys, lo)
+        while leaf is not None:
+            keys = leaf.keys
+            while pos < len(keys):
+                if hi is not None and hi < keys[pos]:
+                    return
+                yield keys[pos]
+                pos += 1
+            leaf = leaf.next
+            pos = 0
+
+    def __iter__(self):
+        self._walker = self.range()
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self._walker = self.range()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
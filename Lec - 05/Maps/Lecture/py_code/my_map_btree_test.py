@@ -0,0 +1,105 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+
+from my_map_btree import MyMapBTree, _Inner
+
+class TestMyMapBTree(unittest.TestCase):
+
+    # Every node but the root is between half full and full, every leaf
+    # is at the same depth, separators bound their subtrees and the leaf
+    # links visit every key in order
+    def check_tree(self, m):
+        leaves = []
+        def walk(node, lo, hi, depth, is_root):
+            keys = list(node.keys)
+            self.assertEqual(keys, sorted(keys))
+            self.assertLessEqual(len(keys), m._order)
+            if not is_root:
+                self.assertGreaterEqual(len(keys), m._min_keys)
+            for key in keys:
+                self.assertTrue(lo is None or lo <= key)
+                self.assertTrue(hi is None or key < hi)
+            if isinstance(node, _Inner):
+                self.assertEqual(len(node.children), len(keys) + 1)
+                bounds = [lo] + keys + [hi]
+                for i, child in enumerate(node.children):
+                    walk(child, bounds[i], bounds[i + 1], depth + 1, False)
+            else:
+                self.assertEqual(len(node.keys), len(node.values))
+                leaves.append((node, depth))
+        walk(m._root, None, None, 0, True)
+
+        self.assertEqual(len({depth for _, depth in leaves}), 1)
+        for (leaf, _), (after, _) in zip(leaves, leaves[1:]):
+            self.assertIs(leaf.next, after)
+        self.assertIsNone(leaves[-1][0].next)
+        self.assertEqual(sum(len(leaf.keys) for leaf, _ in leaves), len(m))
+
+    def compare(self, m, expected):
+        self.check_tree(m)
+        self.assertEqual(len(m), len(expected))
+        self.assertEqual(list(m), sorted(expected))
+        for key, val in expected.items():
+            self.assertEqual(m[key], val)
+
+    def test_random_operations(self):
+        # Small orders split, borrow and merge all the time
+        for order in [4, 5, 64]:
+            for key_typecode in [None, 'q']:
+                rnd = random.Random(order)
+                m = MyMapBTree(order, key_typecode)
+                expected = {}
+                for step in range(3000):
+                    key = rnd.randrange(500)
+                    if key in expected and rnd.random() < 0.45:
+                        self.assertEqual(m.remove(key), (key, expected.pop(key)))
+                    else:
+                        m.add(key, step)
+                        expected[key] = step
+                    self.assertEqual(key in m, key in expected)
+                    if step % 250 == 0:
+                        self.compare(m, expected)
+                self.compare(m, expected)
+
+                # Drain it completely
+                for key in list(expected):
+                    m.remove(key)
+                    del expected[key]
+                self.compare(m, expected)
+
+    def test_range(self):
+        m = MyMapBTree(order=5)
+        for key in range(0, 200, 3):
+            m.add(key, key)
+        self.assertEqual(list(m.range(10, 30)), [12, 15, 18, 21, 24, 27, 30])
+        self.assertEqual(list(m.range(None, 5)), [0, 3])
+        self.assertEqual(list(m.range(190)), [192, 195, 198])
+        self.assertEqual(list(m.range(50, 40)), [])
+
+    def test_bulk_load(self):
+        # Sizes around multiples of the order exercise the short last
+        # leaf and the short last group of every inner level
+        for order in [4, 5]:
+            for size in [0, 1, order - 1, order, order + 1, order * order + 1, 97, 1000]:
+                items = [(key * 2, str(key)) for key in range(size)]
+                m = MyMapBTree.bulk_load(items, order)
+                expected = dict(items)
+                self.compare(m, expected)
+
+                # The bulk-loaded tree keeps working under updates
+                rnd = random.Random(size)
+                for _ in range(300):
+                    key = rnd.randrange(size * 2 + 10)
+                    if key in expected:
+                        m.remove(key)
+                        del expected[key]
+                    else:
+                        m.add(key, key)
+                        expected[key] = key
+                self.compare(m, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
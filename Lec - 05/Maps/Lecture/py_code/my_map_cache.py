@@ -0,0 +1,266 @@
+# بسم الله الرحمن الرحيم
+
+# Size-bounded caching map
+#
+# MyMapCache holds at most `capacity` keys. When a new key arrives and the
+# cache is full, the eviction policy picks a victim to drop:
+#   'lru'     -> least recently used key
+#   'lfu'     -> least frequently used key (ties: least recently used)
+#   'tinylfu' -> LRU order, but a new key only gets in if it has been asked
+#                for more often than the victim (frequencies are estimated
+#                in a small count-min sketch, so one-off keys cannot flush
+#                out the keys that are used all the time)
+# A policy is any object with the methods of LRUPolicy below, so others
+# can be plugged in.
+#
+# With ttl (seconds), entries also expire that long after they were added.
+# Every operation is O(1), except that the first eviction from an LFU
+# cache after remove() or an expiry may scan the distinct use counts.
+# stats() returns the hit/miss/eviction counters.
+
+import time
+from array import array
+from collections import OrderedDict
+
+from my_map_adt import MyMapADT
+
+class LRUPolicy:
+    def __init__(self, capacity):
+        # Oldest use first
+        self._order = OrderedDict()
+
+    def on_access(self, key):
+        self._order.move_to_end(key)
+
+    def on_insert(self, key):
+        self._order[key] = None
+
+    def on_remove(self, key):
+        del self._order[key]
+
+    def victim(self):
+        return next(iter(self._order))
+
+    # Should `key` replace `victim`? LRU always says yes
+    def admit(self, key, victim):
+        return True
+
+    # Called for every lookup, hit or miss
+    def record(self, key):
+        pass
+
+
+class LFUPolicy(LRUPolicy):
+    # Keys grouped by use count; each group in LRU order.
+    # _min_count is the smallest count that has any key, so the victim
+    # is found without searching. Accesses and inserts keep it exact;
+    # after a removal it may point at a group that is gone, and victim()
+    # then looks for the new smallest count. An eviction is always
+    # followed by an insert (count 1), so evictions never search
+    def __init__(self, capacity):
+        self._count = {}
+        self._groups = {}
+        self._min_count = 0
+
+    def _move(self, key, old_count, new_count):
+        if old_count:
+            group = self._groups[old_count]
+            del group[key]
+            if not group:
+                del self._groups[old_count]
+                if self._min_count == old_count:
+                    self._min_count = new_count
+        if new_count:
+            self._groups.setdefault(new_count, OrderedDict())[key] = None
+            self._count[key] = new_count
+        else:
+            del self._count[key]
+
+    def on_access(self, key):
+        count = self._count[key]
+        self._move(key, count, count + 1)
+
+    def on_insert(self, key):
+        self._move(key, 0, 1)
+        self._min_count = 1
+
+    def on_remove(self, key):
+        self._move(key, self._count[key], 0)
+
+    def victim(self):
+        if self._min_count not in self._groups:
+            self._min_count = min(self._groups)
+        return next(iter(self._groups[self._min_count]))
+
+
+class TinyLFUPolicy(LRUPolicy):
+    DEPTH = 4
+
+    def __init__(self, capacity):
+        LRUPolicy.__init__(self, capacity)
+        width = 64
+        while width < capacity * 4:
+            width *= 2
+        self._mask = width - 1
+        self._rows = [array('l', [0]) * width for _ in range(TinyLFUPolicy.DEPTH)]
+        # After this many recorded lookups every counter is halved,
+        # so keys that were popular long ago fade out
+        self._sample_size = max(capacity * 10, 100)
+        self._recorded = 0
+
+    def _slots(self, key):
+        return [hash((seed, key)) & self._mask for seed in range(TinyLFUPolicy.DEPTH)]
+
+    def frequency(self, key):
+        return min(row[slot] for row, slot in zip(self._rows, self._slots(key)))
+
+    def record(self, key):
+        for row, slot in zip(self._rows, self._slots(key)):
+            row[slot] += 1
+        self._recorded += 1
+        if self._recorded == self._sample_size:
+            self._recorded = 0
+            for row in self._rows:
+                row[:] = array('l', [count >> 1 for count in row])
+
+    def admit(self, key, victim):
+        return self.frequency(key) > self.frequency(victim)
+
+
+POLICIES = {'lru': LRUPolicy, 'lfu': LFUPolicy, 'tinylfu': TinyLFUPolicy}
+
+
+class MyMapCache(MyMapADT):
+    def __init__(self, capacity, policy='lru', ttl=None, clock=time.monotonic):
+        assert capacity > 0, 'Cache capacity must be > 0'
+        self._capacity = capacity
+        self._policy = POLICIES[policy](capacity) if isinstance(policy, str) else policy
+        self._ttl = ttl
+        self._clock = clock
+        # key -> [value, expiry time or None]
+        self._entries = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._rejections = 0
+
+        # for iterator
+        self._walker = None
+
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _drop(self, key):
+        del self._entries[key]
+        self._policy.on_remove(key)
+
+    # The entry for key if it is there and not expired, else None
+    def _live_entry(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= self._clock():
+            self._drop(key)
+            self._expirations += 1
+            return None
+        return entry
+
+    # A membership test does not count as a use of the key
+    def __contains__(self, key):
+        return self._live_entry(key) is not None
+
+    def add(self, key, val):
+        expiry = self._clock() + self._ttl if self._ttl is not None else None
+        entry = self._live_entry(key)
+        if entry is not None:
+            entry[0] = val
+            entry[1] = expiry
+            self._policy.on_access(key)
+            return
+
+        if len(self._entries) >= self._capacity:
+            victim = self._policy.victim()
+            if not self._policy.admit(key, victim):
+                self._rejections += 1
+                return
+            self._drop(victim)
+            self._evictions += 1
+        self._entries[key] = [val, expiry]
+        self._policy.on_insert(key)
+
+    # remove using key, returns (key, value) like MyMapO
+    def remove(self, key):
+        entry = self._live_entry(key)
+        assert entry is not None
+        self._drop(key)
+        return key, entry[0]
+
+    # Returns the value, or default on a miss (counted in the stats)
+    def get(self, key, default=None):
+        self._policy.record(key)
+        entry = self._live_entry(key)
+        if entry is None:
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._policy.on_access(key)
+        return entry[0]
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        self._policy.record(key)
+        entry = self._live_entry(key)
+        if entry is None:
+            self._misses += 1
+        assert entry is not None
+        self._hits += 1
+        self._policy.on_access(key)
+        return entry[0]
+
+    def stats(self):
+        lookups = self._hits + self._misses
+        return {'size': len(self._entries),
+                'capacity': self._capacity,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'rejections': self._rejections}
+
+    def __iter__(self):
+        self._walker = iter(list(self._entries))
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self._walker = iter(list(self._entries))
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+
+# Hit ratio of each policy on a skewed (Zipf-like) key stream
+if __name__ == '__main__':
+    import random
+
+    keys = list(range(10000))
+    weights = [1 / (rank + 1) for rank in keys]
+    stream = random.choices(keys, weights, k=200000)
+
+    for name in POLICIES:
+        cache = MyMapCache(500, name)
+        for key in stream:
+            if cache.get(key) is None:
+                cache.add(key, key)
+        stats = cache.stats()
+        print('%-8s hit ratio %.3f  evictions %d  rejections %d' %
+              (name, stats['hit_ratio'], stats['evictions'], stats['rejections']))
@@ -0,0 +1,140 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+
+from my_map_cache import MyMapCache
+
+# A clock the test moves by hand
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestMyMapCache(unittest.TestCase):
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = MyMapCache(3, 'lru')
+        for key in 'abc':
+            cache.add(key, key.upper())
+        self.assertEqual(cache.get('a'), 'A')
+        # Overwriting is a use too; `in` is not
+        cache.add('b', 'B2')
+        self.assertIn('c', cache)
+        cache.add('d', 'D')
+        self.assertEqual(sorted(cache), ['a', 'b', 'd'])
+        cache.add('e', 'E')
+        self.assertEqual(sorted(cache), ['b', 'd', 'e'])
+        self.assertEqual(cache['b'], 'B2')
+        self.assertEqual(cache.stats()['evictions'], 2)
+
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = MyMapCache(3, 'lfu')
+        for key in 'abc':
+            cache.add(key, key)
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache.get('c')
+        # b and c were used twice, b first: b goes
+        cache.add('d', 'd')
+        self.assertEqual(sorted(cache), ['a', 'c', 'd'])
+        # d has one use, the fewest
+        cache.add('e', 'e')
+        self.assertEqual(sorted(cache), ['a', 'c', 'e'])
+        # After a removal the smallest count is found again
+        cache.remove('e')
+        cache.get('c')
+        cache.add('f', 'f')
+        cache.add('g', 'g')
+        self.assertEqual(sorted(cache), ['a', 'c', 'g'])
+
+    def test_lfu_random_operations(self):
+        # The victim is always the key with the fewest uses, and among
+        # those the one whose last use is oldest
+        rnd = random.Random(38)
+        cache = MyMapCache(20, 'lfu')
+        uses = {}
+        tick = 0
+        for _ in range(5000):
+            tick += 1
+            key = rnd.randrange(40)
+            choice = rnd.random()
+            if choice < 0.1 and key in uses:
+                cache.remove(key)
+                del uses[key]
+            elif choice < 0.6:
+                if cache.get(key) is not None:
+                    uses[key] = (uses[key][0] + 1, tick)
+            else:
+                if key in uses:
+                    uses[key] = (uses[key][0] + 1, tick)
+                else:
+                    if len(uses) == 20:
+                        victim = min(uses, key=uses.get)
+                        del uses[victim]
+                    uses[key] = (1, tick)
+                cache.add(key, key)
+            self.assertEqual(sorted(cache), sorted(uses))
+
+    def test_tinylfu_admission(self):
+        cache = MyMapCache(2, 'tinylfu')
+        for _ in range(5):
+            for key in 'ab':
+                if cache.get(key) is None:
+                    cache.add(key, key)
+        # A key seen once is not worth evicting a popular one for
+        self.assertIsNone(cache.get('once'))
+        cache.add('once', 'once')
+        self.assertNotIn('once', cache)
+        self.assertEqual(cache.stats()['rejections'], 1)
+        # ... but a key asked for more often than the victim gets in
+        for _ in range(10):
+            cache.get('hot')
+        cache.add('hot', 'hot')
+        self.assertIn('hot', cache)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = MyMapCache(10, 'lru', ttl=5, clock=clock)
+        cache.add('a', 1)
+        clock.now = 3
+        cache.add('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 5
+        # a expired at 5, b lives until 8
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.get('a', 'gone'), 'gone')
+        self.assertEqual(cache['b'], 2)
+        # Adding again starts a new lifetime
+        cache.add('b', 3)
+        clock.now = 9
+        self.assertEqual(cache.get('b'), 3)
+        clock.now = 10
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 0)
+        stats = cache.stats()
+        self.assertEqual(stats['expirations'], 2)
+        self.assertEqual((stats['hits'], stats['misses']), (3, 2))
+
+    def test_expired_key_frees_its_place(self):
+        # An expired entry is dropped, not evicted, and its policy entry
+        # goes with it, for every policy
+        for policy in ['lru', 'lfu', 'tinylfu']:
+            clock = FakeClock()
+            cache = MyMapCache(2, policy, ttl=1, clock=clock)
+            cache.add('a', 1)
+            clock.now = 2
+            self.assertNotIn('a', cache)
+            cache.add('b', 2)
+            cache.add('c', 3)
+            self.assertEqual(sorted(cache), ['b', 'c'])
+            self.assertEqual(cache.stats()['evictions'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
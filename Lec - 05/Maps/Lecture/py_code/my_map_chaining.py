@@ -0,0 +1,211 @@
+# بسم الله الرحمن الرحيم
+
+# Hash map with separate chaining and incremental rehashing
+#
+# Each bucket is a short list of [key, value] pairs whose keys hash there.
+# When the map gets too full it does NOT move everything to a bigger table
+# in one go (that pause grows with the size of the map). Instead it starts
+# a second, twice as big table and every later add/remove moves a few
+# buckets across. While that is in progress:
+#   - new keys go into the new table
+#   - lookups check the new table, then the not-yet-moved old buckets
+# so no single operation ever does more than a few buckets of extra work.
+#
+# Buckets are picked with the same mixed hash as MyMapProbing, so keys
+# whose hash() shares its low bits still spread over all the buckets.
+
+from my_map_adt import MyMapADT
+from my_map_probing import _hash64
+
+class MyMapChaining(MyMapADT):
+    MIN_CAPACITY = 8
+    MAX_LOAD = 1.0
+    # Old buckets moved per add/remove while rehashing
+    REHASH_STEP = 4
+
+    def __init__(self):
+        self._size = 0
+        # Buckets are created on first use, so a new table is one fast
+        # [None] * capacity allocation rather than millions of empty lists
+        self._table = [None] * MyMapChaining.MIN_CAPACITY
+        self._new_table = None
+        # Old buckets below this index have already been moved
+        self._rehash_index = 0
+
+        # for iterator
+        self._walker = None
+
+    def __len__(self):
+        return self._size
+
+    def is_rehashing(self):
+        return self._new_table is not None
+
+    def _bucket_index(self, table, key):
+        return _hash64(key) & (len(table) - 1)
+
+    # Returns (table, bucket index, position in bucket) or None
+    def _find(self, key):
+        h = _hash64(key)
+        if self._new_table is not None:
+            idx = h & (len(self._new_table) - 1)
+            bucket = self._new_table[idx]
+            if bucket:
+                for pos, it in enumerate(bucket):
+                    if it[0] == key:
+                        return self._new_table, idx, pos
+        idx = h & (len(self._table) - 1)
+        bucket = self._table[idx]
+        if bucket:
+            for pos, it in enumerate(bucket):
+                if it[0] == key:
+                    return self._table, idx, pos
+        return None
+
+    def _start_rehash(self):
+        self._new_table = [None] * (len(self._table) * 2)
+        self._rehash_index = 0
+
+    # Move up to `steps` old buckets (empty ones are skipped cheaply)
+    def _rehash_step(self, steps):
+        old = self._table
+        new = self._new_table
+        mask = len(new) - 1
+        empty_visits = steps * 10
+        while steps > 0 and self._rehash_index < len(old):
+            bucket = old[self._rehash_index]
+            if bucket:
+                for it in bucket:
+                    idx = _hash64(it[0]) & mask
+                    if new[idx] is None:
+                        new[idx] = [it]
+                    else:
+                        new[idx].append(it)
+                old[self._rehash_index] = None
+                steps -= 1
+            else:
+                empty_visits -= 1
+                if empty_visits == 0:
+                    steps -= 1
+                    empty_visits = 10
+            self._rehash_index += 1
+        if self._rehash_index == len(old):
+            self._table = new
+            self._new_table = None
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    # Check if key exists or not
+    # if key does not exist -> append [key, val] to its bucket
+    # if key exists -> update the value in place
+    def add(self, key, val):
+        if self._new_table is not None:
+            self._rehash_step(MyMapChaining.REHASH_STEP)
+
+        found = self._find(key)
+        if found is not None:
+            table, idx, pos = found
+            table[idx][pos][1] = val
+            return
+
+        if self._new_table is None and self._size + 1 > len(self._table) * MyMapChaining.MAX_LOAD:
+            self._start_rehash()
+        table = self._new_table if self._new_table is not None else self._table
+        idx = self._bucket_index(table, key)
+        if table[idx] is None:
+            table[idx] = [[key, val]]
+        else:
+            table[idx].append([key, val])
+        self._size += 1
+
+    # remove using key, returns (key, value) like MyMapO
+    def remove(self, key):
+        if self._new_table is not None:
+            self._rehash_step(MyMapChaining.REHASH_STEP)
+        found = self._find(key)
+        assert found is not None
+        table, idx, pos = found
+        key, val = table[idx].pop(pos)
+        if not table[idx]:
+            table[idx] = None
+        self._size -= 1
+        return key, val
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        found = self._find(key)
+        assert found is not None
+        table, idx, pos = found
+        return table[idx][pos][1]
+
+    def _walk(self):
+        for table in (self._table, self._new_table):
+            if table is None:
+                continue
+            for bucket in table:
+                if bucket:
+                    for it in bucket:
+                        yield it[0]
+
+    def __iter__(self):
+        self._walker = self._walk()
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self._walker = self._walk()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+
+# Per-add latency while growing a map from empty: the stop-the-world
+# resizes of MyMapProbing show up as a large max, incremental rehashing
+# keeps the max close to the typical add.
+#
+# Usage: python my_map_chaining.py [n]
+if __name__ == '__main__':
+    import gc
+    import sys
+    import time
+
+    from my_map_imp_one import MyMapO
+    from my_map_probing import MyMapProbing
+
+    class DictMap:
+        def __init__(self):
+            self._d = {}
+
+        def add(self, key, val):
+            self._d[key] = val
+
+    def add_latencies(new_map, n):
+        the_map = new_map()
+        clock = time.perf_counter_ns
+        latencies = []
+        # The garbage collector's own pauses would hide the resize pauses
+        gc.disable()
+        for key in range(n):
+            start = clock()
+            the_map.add(key, key)
+            latencies.append(clock() - start)
+        gc.enable()
+        latencies.sort()
+        return latencies
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print('%-14s %10s %10s %10s %12s' % ('map', 'n', 'p50 (us)', 'p99 (us)', 'max (us)'))
+    # MyMapO scans its key list on every add, so keep it small
+    for name, new_map, size in [('MyMapO', MyMapO, min(n, 20000)),
+                                ('MyMapProbing', MyMapProbing, n),
+                                ('MyMapChaining', MyMapChaining, n),
+                                ('dict', DictMap, n)]:
+        lat = add_latencies(new_map, size)
+        print('%-14s %10d %10.2f %10.2f %12.2f' % (name, size,
+              lat[len(lat) // 2] / 1000, lat[int(len(lat) * 0.99)] / 1000, lat[-1] / 1000))
@@ -0,0 +1,85 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+
+from my_map_chaining import MyMapChaining
+
+class TestMyMapChaining(unittest.TestCase):
+
+    def setUp(self):
+        self.m = MyMapChaining()
+
+    def compare(self, expected):
+        self.assertEqual(len(self.m), len(expected))
+        self.assertEqual(sorted(self.m, key=repr), sorted(expected, key=repr))
+        for key, val in expected.items():
+            self.assertIn(key, self.m)
+            self.assertEqual(self.m[key], val)
+        # No key is in both tables, or twice in one
+        keys = [key for key in self.m]
+        self.assertEqual(len(keys), len(set(keys)))
+
+    def test_basic_operations(self):
+        self.m.add('a', 1)
+        self.m.add('b', 2)
+        self.m.add('a', 3)
+        self.compare({'a': 3, 'b': 2})
+        self.assertEqual(self.m.remove('b'), ('b', 2))
+        self.assertNotIn('b', self.m)
+        self.assertRaises(AssertionError, self.m.remove, 'b')
+        self.assertRaises(AssertionError, self.m.value_of, 'b')
+
+    def test_operations_during_rehash(self):
+        # Grow until a rehash starts, then mix adds, updates, removes and
+        # lookups while old buckets are still being moved
+        expected = {}
+        key = 0
+        while not self.m.is_rehashing():
+            self.m.add(key, key)
+            expected[key] = key
+            key += 1
+        rnd = random.Random(34)
+        steps_while_rehashing = 0
+        for step in range(3000):
+            if self.m.is_rehashing():
+                steps_while_rehashing += 1
+            choice = rnd.random()
+            k = rnd.randrange(key + 200)
+            if choice < 0.3 and k in expected:
+                self.assertEqual(self.m.remove(k), (k, expected.pop(k)))
+            elif choice < 0.7:
+                self.m.add(k, -step)
+                expected[k] = -step
+            else:
+                self.assertEqual(k in self.m, k in expected)
+                if k in expected:
+                    self.assertEqual(self.m[k], expected[k])
+            if step % 100 == 0:
+                self.compare(expected)
+        self.assertGreater(steps_while_rehashing, 10)
+        self.compare(expected)
+
+    def test_rehash_finishes(self):
+        for key in range(5000):
+            self.m.add('k%d' % key, key)
+        # Each add moves a few buckets: the last rehash is done by now or
+        # finishes within a few more operations
+        for key in range(5000):
+            self.m.add('k%d' % key, key + 1)
+        self.assertFalse(self.m.is_rehashing())
+        self.compare({'k%d' % key: key + 1 for key in range(5000)})
+
+    def test_keys_sharing_low_bits(self):
+        # hash() of these ints ends in 20 zero bits; the mixed hash
+        # spreads them, so no bucket grows long
+        for i in range(2000):
+            self.m.add(i << 20, i)
+        for table in (self.m._table, self.m._new_table):
+            if table is not None:
+                self.assertLess(max(len(bucket) for bucket in table if bucket), 10)
+        self.compare({i << 20: i for i in range(2000)})
+
+
+if __name__ == '__main__':
+    unittest.main()
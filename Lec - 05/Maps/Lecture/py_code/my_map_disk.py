@@ -0,0 +1,333 @@
+# بسم الله الرحمن الرحيم
+
+# Persistent map: an append-only log plus a memory-mapped hash index
+#
+# <path>.log  every add/remove appends one record:
+#                 key length (4 bytes), value length (4 bytes, -1 = removed),
+#                 pickled key, pickled value
+#             records are never changed, so a write is one append
+#
+# <path>.idx  an open-addressing hash table (linear probing, like
+#             MyMapProbing) of (key hash, offset of the key's latest record)
+#             header: magic, capacity, number of keys, log size it matches
+#
+# Opening an existing map only maps the index file: nothing is loaded,
+# and a lookup is one probe in the index plus one read of the log.
+# If the index does not match the log (e.g. the process died between the
+# two writes) it is rebuilt from the log; a record cut short at the end
+# of the log (the process died during the append) is dropped.
+#
+# Keys and values must be picklable. Keys are found by hash and then
+# compared with ==, like a dict. The hash is stable_hash() (see
+# stable_hash.py), which is the same in every process, so the index file
+# stays valid when another process opens the map.
+#
+# Overwritten and removed keys leave dead records in the log;
+# compact() rewrites the log with only the live ones.
+
+import mmap
+import os
+import pickle
+import struct
+
+from my_map_adt import MyMapADT
+from stable_hash import stable_hash
+
+MAGIC = b'DSAMAPI2'
+INDEX_HEADER = struct.Struct('<8sqqq')
+RECORD_HEADER = struct.Struct('<Ii')
+SLOT_SIZE = 16
+REMOVED = -1
+
+# The index keeps hashes in signed 64-bit slots
+def _stable_hash(key):
+    h = stable_hash(key)
+    return h - (1 << 64) if h >> 63 else h
+
+
+class MyMapDisk(MyMapADT):
+    MIN_CAPACITY = 1024
+    MAX_LOAD = 2 / 3
+
+    def __init__(self, path):
+        self._path = path
+        self._open_log()
+        self._index_file = None
+        self._index_map = None
+        self._slots = None
+
+        if not self._open_index():
+            self._rebuild_index()
+
+        # for iterator
+        self._walker = None
+
+    # Unbuffered: each record reaches the file in one write, and reads
+    # (seek + read on a second handle) never see stale buffered bytes
+    def _open_log(self):
+        self._log = open(self._path + '.log', 'a+b', buffering=0)
+        self._log.seek(0, os.SEEK_END)
+        self._log_size = self._log.tell()
+        self._reader = open(self._path + '.log', 'rb', buffering=0)
+
+    def _close_log(self):
+        self._reader.close()
+        self._log.close()
+
+    # Index file handling
+
+    def _open_index(self):
+        index_path = self._path + '.idx'
+        if not os.path.exists(index_path):
+            return False
+        self._map_index(open(index_path, 'r+b'))
+        magic, capacity, count, log_size = INDEX_HEADER.unpack_from(self._index_map)
+        if magic != MAGIC or log_size != self._log_size:
+            self._unmap_index()
+            return False
+        return True
+
+    def _map_index(self, index_file):
+        self._index_file = index_file
+        self._index_map = mmap.mmap(index_file.fileno(), 0)
+        magic, capacity, count, log_size = INDEX_HEADER.unpack_from(self._index_map)
+        self._capacity = capacity
+        self._count = count
+        # slots[2 * i] is the hash, slots[2 * i + 1] is 1 + record offset
+        # (0 means an empty slot)
+        self._slots = memoryview(self._index_map)[INDEX_HEADER.size:].cast('q')
+
+    def _unmap_index(self):
+        self._slots.release()
+        self._index_map.close()
+        self._index_file.close()
+        self._slots = None
+
+    # Write an empty index file of the given capacity and map it
+    def _new_index(self, index_path, capacity):
+        index_file = open(index_path, 'w+b')
+        index_file.truncate(INDEX_HEADER.size + capacity * SLOT_SIZE)
+        index_file.write(INDEX_HEADER.pack(MAGIC, capacity, 0, 0))
+        index_file.flush()
+        self._map_index(index_file)
+
+    def _write_header(self):
+        INDEX_HEADER.pack_into(self._index_map, 0, MAGIC, self._capacity, self._count, self._log_size)
+
+    # Scan the whole log and index the latest record of every key
+    def _rebuild_index(self):
+        self._new_index(self._path + '.idx', MyMapDisk.MIN_CAPACITY)
+        offset = 0
+        while offset < self._log_size:
+            end = self._record_end(offset)
+            if end > self._log_size:
+                # A torn append: drop it, the next add() writes over it
+                self._log.truncate(offset)
+                self._log_size = offset
+                break
+            key_bytes, value_len = self._read_record(offset, with_value=False)
+            key = pickle.loads(key_bytes)
+            if value_len == REMOVED:
+                slot, found = self._find_slot(key, key_bytes, _stable_hash(key))
+                if found:
+                    self._remove_slot(slot)
+            else:
+                self._put(key, key_bytes, offset)
+            offset = end
+        self._write_header()
+
+    # Offset just past the record at offset, read from its header
+    # (past the end of the log if even the header is incomplete)
+    def _record_end(self, offset):
+        if offset + RECORD_HEADER.size > self._log_size:
+            return self._log_size + 1
+        key_len, value_len = RECORD_HEADER.unpack(self._read_at(offset, RECORD_HEADER.size))
+        return offset + RECORD_HEADER.size + key_len + max(value_len, 0)
+
+    def _grow_index(self):
+        old = self._slots.tolist()
+        tmp_path = self._path + '.idx.tmp'
+        count = self._count
+        self._unmap_index()
+        self._new_index(tmp_path, self._capacity * 2)
+        mask = self._capacity - 1
+        for i in range(0, len(old), 2):
+            if old[i + 1]:
+                slot = old[i] & mask
+                while self._slots[2 * slot + 1]:
+                    slot = (slot + 1) & mask
+                self._slots[2 * slot] = old[i]
+                self._slots[2 * slot + 1] = old[i + 1]
+        self._count = count
+        self._write_header()
+        # Windows refuses to replace a file that is open or mapped, so the
+        # new index is closed first and mapped again under its real name
+        self._index_map.flush()
+        self._unmap_index()
+        os.replace(tmp_path, self._path + '.idx')
+        self._map_index(open(self._path + '.idx', 'r+b'))
+
+    # Log records
+
+    # Reads go through their own handle, so they never move the
+    # position the appends write at
+    def _read_at(self, offset, size):
+        self._reader.seek(offset)
+        return self._reader.read(size)
+
+    def _read_record(self, offset, with_value=True):
+        key_len, value_len = RECORD_HEADER.unpack(self._read_at(offset, RECORD_HEADER.size))
+        if not with_value:
+            return self._read_at(offset + RECORD_HEADER.size, key_len), value_len
+        if value_len == REMOVED:
+            return self._read_at(offset + RECORD_HEADER.size, key_len), None
+        data = self._read_at(offset + RECORD_HEADER.size, key_len + value_len)
+        return data[:key_len], data[key_len:]
+
+    def _append(self, key_bytes, value_bytes):
+        offset = self._log_size
+        value_len = REMOVED if value_bytes is None else len(value_bytes)
+        self._log.write(RECORD_HEADER.pack(len(key_bytes), value_len) + key_bytes + (value_bytes or b''))
+        self._log_size += RECORD_HEADER.size + len(key_bytes) + max(value_len, 0)
+        return offset
+
+    # Index slots (linear probing, backward-shift deletion)
+
+    # Same hash, then same pickled bytes (the usual case) or a stored key
+    # that is == key
+    def _find_slot(self, key, key_bytes, h):
+        mask = self._capacity - 1
+        slot = h & mask
+        slots = self._slots
+        while slots[2 * slot + 1]:
+            if slots[2 * slot] == h:
+                stored = self._read_record(slots[2 * slot + 1] - 1, with_value=False)[0]
+                if stored == key_bytes or pickle.loads(stored) == key:
+                    return slot, True
+            slot = (slot + 1) & mask
+        return slot, False
+
+    def _put(self, key, key_bytes, offset):
+        h = _stable_hash(key)
+        slot, found = self._find_slot(key, key_bytes, h)
+        if not found:
+            if self._count + 1 > self._capacity * MyMapDisk.MAX_LOAD:
+                self._grow_index()
+                slot = self._find_slot(key, key_bytes, h)[0]
+            self._count += 1
+        self._slots[2 * slot] = h
+        self._slots[2 * slot + 1] = offset + 1
+
+    def _remove_slot(self, slot):
+        slots = self._slots
+        mask = self._capacity - 1
+        gap = slot
+        nxt = slot
+        while True:
+            nxt = (nxt + 1) & mask
+            if not slots[2 * nxt + 1]:
+                break
+            home = slots[2 * nxt] & mask
+            if (gap <= nxt and (home <= gap or home > nxt)) or \
+               (gap > nxt and home <= gap and home > nxt):
+                slots[2 * gap] = slots[2 * nxt]
+                slots[2 * gap + 1] = slots[2 * nxt + 1]
+                gap = nxt
+        slots[2 * gap + 1] = 0
+        self._count -= 1
+
+    # MyMapADT interface
+
+    def __len__(self):
+        return self._count
+
+    def _lookup(self, key):
+        return self._find_slot(key, pickle.dumps(key), _stable_hash(key))
+
+    def __contains__(self, key):
+        return self._lookup(key)[1]
+
+    # The record goes to the log first, then the index points at it
+    def add(self, key, val):
+        key_bytes = pickle.dumps(key)
+        offset = self._append(key_bytes, pickle.dumps(val))
+        self._put(key, key_bytes, offset)
+        self._write_header()
+
+    # remove using key, returns (key, value) like MyMapO
+    def remove(self, key):
+        key_bytes = pickle.dumps(key)
+        slot, found = self._find_slot(key, key_bytes, _stable_hash(key))
+        assert found
+        val = pickle.loads(self._read_record(self._slots[2 * slot + 1] - 1)[1])
+        self._append(key_bytes, None)
+        self._remove_slot(slot)
+        self._write_header()
+        return key, val
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        slot, found = self._lookup(key)
+        assert found
+        return pickle.loads(self._read_record(self._slots[2 * slot + 1] - 1)[1])
+
+    def _walk(self):
+        for slot in range(self._capacity):
+            if self._slots[2 * slot + 1]:
+                yield pickle.loads(self._read_record(self._slots[2 * slot + 1] - 1, with_value=False)[0])
+
+    def __iter__(self):
+        self._walker = self._walk()
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self._walker = self._walk()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+    # Persistence
+
+    def log_size(self):
+        return self._log_size
+
+    # Write the log and the index to disk now
+    def flush(self):
+        os.fsync(self._log.fileno())
+        self._index_map.flush()
+
+    # Rewrite the log with one record per live key, dropping overwritten
+    # and removed ones, then rebuild the index to match. Both log handles
+    # and the index are closed before the new log replaces the old one
+    def compact(self):
+        tmp_path = self._path + '.log.tmp'
+        with open(tmp_path, 'wb') as new_log:
+            for slot in range(self._capacity):
+                if self._slots[2 * slot + 1]:
+                    key_bytes, value_bytes = self._read_record(self._slots[2 * slot + 1] - 1)
+                    new_log.write(RECORD_HEADER.pack(len(key_bytes), len(value_bytes)) + key_bytes + value_bytes)
+        self._close_log()
+        self._unmap_index()
+        os.replace(tmp_path, self._path + '.log')
+
+        self._open_log()
+        self._rebuild_index()
+
+    def close(self):
+        if self._slots is None:
+            return
+        self.flush()
+        self._unmap_index()
+        self._close_log()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,157 @@
+# بسم الله الرحمن الرحيم
+
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import my_map_disk
+from my_map_disk import MyMapDisk, RECORD_HEADER
+
+class TestMyMapDisk(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'grades')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def compare(self, m, expected):
+        self.assertEqual(len(m), len(expected))
+        self.assertEqual(sorted(m), sorted(expected))
+        for key, val in expected.items():
+            self.assertIn(key, m)
+            self.assertEqual(m[key], val)
+
+    def random_operations(self, m, expected, rnd, steps):
+        for step in range(steps):
+            key = rnd.randrange(300)
+            if key in expected and rnd.random() < 0.3:
+                self.assertEqual(m.remove(key), (key, expected.pop(key)))
+            else:
+                m.add(key, [key, step])
+                expected[key] = [key, step]
+
+    def test_random_operations_and_reopen(self):
+        rnd = random.Random(37)
+        expected = {}
+        for _ in range(4):
+            with MyMapDisk(self.path) as m:
+                self.compare(m, expected)
+                self.random_operations(m, expected, rnd, 1000)
+                self.compare(m, expected)
+        with MyMapDisk(self.path) as m:
+            self.compare(m, expected)
+
+    def test_index_growth(self):
+        # More keys than MIN_CAPACITY * MAX_LOAD: the index grows twice
+        with MyMapDisk(self.path) as m:
+            for key in range(3000):
+                m.add('id-%d' % key, key)
+            self.assertGreater(m._capacity, MyMapDisk.MIN_CAPACITY)
+        with MyMapDisk(self.path) as m:
+            self.compare(m, {'id-%d' % key: key for key in range(3000)})
+
+    def test_no_open_files_replaced(self):
+        # Windows cannot replace a file that is open or mapped: when a
+        # file is replaced, neither the index nor the log may be open
+        real_replace = os.replace
+        replaced = []
+        def checked_replace(src, dst):
+            if dst.endswith('.idx'):
+                self.assertIsNone(m._slots)
+                self.assertTrue(m._index_file.closed)
+            else:
+                self.assertTrue(m._log.closed and m._reader.closed)
+                self.assertIsNone(m._slots)
+            replaced.append(os.path.basename(dst))
+            real_replace(src, dst)
+        with MyMapDisk(self.path) as m:
+            with mock.patch.object(my_map_disk.os, 'replace', checked_replace):
+                for key in range(2000):
+                    m.add(key, key)
+                m.compact()
+            self.compare(m, {key: key for key in range(2000)})
+        self.assertIn('grades.idx', replaced)
+        self.assertIn('grades.log', replaced)
+        with MyMapDisk(self.path) as m:
+            self.compare(m, {key: key for key in range(2000)})
+
+    def test_compact(self):
+        rnd = random.Random(38)
+        expected = {}
+        with MyMapDisk(self.path) as m:
+            self.random_operations(m, expected, rnd, 3000)
+            before = m.log_size()
+            m.compact()
+            self.assertLess(m.log_size(), before)
+            self.compare(m, expected)
+            self.random_operations(m, expected, rnd, 500)
+            self.compare(m, expected)
+        with MyMapDisk(self.path) as m:
+            self.compare(m, expected)
+
+    def test_torn_log(self):
+        with MyMapDisk(self.path) as m:
+            for key in range(100):
+                m.add(key, str(key))
+            size = m.log_size()
+        # Cut the last record inside its header or inside its key/value:
+        # the map reopens without it and appends over the torn bytes
+        for cut in [1, 3, RECORD_HEADER.size + 2]:
+            with open(self.path + '.log', 'r+b') as log:
+                log.truncate(size - cut)
+            with MyMapDisk(self.path) as m:
+                self.assertEqual(len(m), 99)
+                self.assertNotIn(99, m)
+                m.add(99, 'again')
+                size = m.log_size()
+            with MyMapDisk(self.path) as m:
+                self.assertEqual(m[99], 'again')
+                self.assertEqual(m[98], '98')
+
+    def test_missing_index(self):
+        with MyMapDisk(self.path) as m:
+            m.add('a', 1)
+            m.add('b', 2)
+            m.remove('a')
+        os.remove(self.path + '.idx')
+        with MyMapDisk(self.path) as m:
+            self.compare(m, {'b': 2})
+
+    def test_equal_keys(self):
+        # Keys are compared with ==, not by their pickled bytes
+        s, t = 'course', ''.join(['cour', 'se'])
+        with MyMapDisk(self.path) as m:
+            m.add(1, 'one')
+            self.assertIn(1.0, m)
+            self.assertIn(True, m)
+            m.add((s, s), 'first')
+            m.add((s, t), 'second')
+            self.assertEqual(len(m), 2)
+            self.assertEqual(m[('course', 'course')], 'second')
+            m.remove(1.0)
+            self.assertNotIn(1, m)
+        with MyMapDisk(self.path) as m:
+            self.compare(m, {('course', 'course'): 'second'})
+
+    def test_other_process(self):
+        # str hashes differ between processes; the file must not care
+        code = ('from my_map_disk import MyMapDisk\n'
+                'with MyMapDisk(%r) as m:\n'
+                '    for key in range(500):\n'
+                '        m.add("id-%%d" %% key, key)\n' % self.path)
+        env = dict(os.environ, PYTHONHASHSEED='1')
+        subprocess.run([sys.executable, '-c', code], check=True, env=env,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        with MyMapDisk(self.path) as m:
+            self.compare(m, {'id-%d' % key: key for key in range(500)})
+
+
+if __name__ == '__main__':
+    unittest.main()
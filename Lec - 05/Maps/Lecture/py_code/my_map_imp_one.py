@@ -44,6 +44,51 @@ class MyMapO(MyMapADT):
     def value_of(self, key):
         return self._values[self._keys.index(key)]
 
+    # Bulk operations
+    # A dict built in one pass does the duplicate handling for all pairs
+    # at once (the last value of each key wins, keys stay in first-seen
+    # order), instead of one scan of _keys per add.
+    # A dict needs hashable keys: if a key is not hashable (add() accepts
+    # those), they fall back to going one key at a time
+
+    @classmethod
+    def from_items(cls, items):
+        the_map = cls()
+        the_map.update(items)
+        return the_map
+
+    def update(self, items):
+        items = list(items)
+        try:
+            merged = dict(zip(self._keys, self._values))
+            merged.update(items)
+        except TypeError:
+            MyMapADT.update(self, items)
+            return
+        self._keys = list(merged)
+        self._values = list(merged.values())
+
+    # Building the dict costs a pass over the whole map, about as much as
+    # a few index() scans, so it is only done for batches of at least
+    # BULK_GET_MIN keys. map() then runs the lookups in C
+    BULK_GET_MIN = 16
+
+    # A missing key raises KeyError, whichever way the batch is looked up
+    def get_many(self, keys):
+        keys = list(keys)
+        if len(keys) >= MyMapO.BULK_GET_MIN:
+            try:
+                return list(map(dict(zip(self._keys, self._values)).__getitem__, keys))
+            except TypeError:
+                pass
+        values = []
+        for key in keys:
+            try:
+                values.append(self._values[self._keys.index(key)])
+            except ValueError:
+                raise KeyError(key) from None
+        return values
+
     def __iter__(self):
         return self
 
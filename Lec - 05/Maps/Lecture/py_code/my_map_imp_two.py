@@ -3,57 +3,130 @@
 from my_map_adt import MyMapADT
 
 class MyMap(MyMapADT):
+    # remove() leaves a None "tombstone" in the removed slot instead of
+    # shifting every later entry; scans skip tombstones.
+    # Once tombstones outnumber the live entries, _inner is compacted,
+    # so a scan never visits more than about twice the live entries
+    MAX_DEAD_RATIO = 1.0
+
     def __init__(self):
         self._inner = []
+        # live entries / tombstones in _inner
+        self._live = 0
+        self._dead = 0
 
         # for iterator
         self._index = -1
 
     def __len__(self):
-        return len(self._inner)
+        return self._live
+
+    # Index of the slot holding key, or -1
+    def _find(self, key):
+        for idx, it in enumerate(self._inner):
+            if it is not None and it[0] == key:
+                return idx
+        return -1
 
     def __contains__(self, key):
-        for it in self._inner:
-            if it[0] == key:
-                return True
-        return False
+        return self._find(key) != -1
 
     # Ckeck if key exists or not
     # if key does not exist -> add new key
-    # if key exists:
-    ## get index of key in self._keys
-    ## update value of self._values using the same index
+    # if key exists -> update its value in place
     def add(self, key, val):
-        for it in self._inner:
-            if it[0] == key:
-                it[1] == val
+        idx = self._find(key)
+        if idx != -1:
+            self._inner[idx][1] = val
         else:
             self._inner.append([key, val])
+            self._live += 1
 
+    # remove using key, returns (key, value) like MyMapO
     def remove(self, key):
-        assert self.__contains__(key)
-        for idx, it in enumerate(self._inner):
-            if it[0] == key:
-                self._inner[idx] = None
+        idx = self._find(key)
+        assert idx != -1
+        key, val = self._inner[idx]
+        self._inner[idx] = None
+        self._live -= 1
+        self._dead += 1
+        if self._dead > self._live * MyMap.MAX_DEAD_RATIO:
+            self._compact()
+        return key, val
+
+    # Drop every tombstone in one pass (the list comprehension runs in C)
+    def _compact(self):
+        self._inner = [it for it in self._inner if it is not None]
+        self._dead = 0
 
     def value_of(self, key):
-        assert self.__contains__(key)
-        for it in self._inner:
-            if it[0] == key:
-                return it[1]
+        idx = self._find(key)
+        assert idx != -1
+        return self._inner[idx][1]
 
     def __getitem__(self, key):
-        for it in self._inner:
-            if it[0] == key:
-                return it[1]
+        return self.value_of(key)
+
+    # Bulk operations
+    # A dict built in one pass does the duplicate handling for all pairs
+    # at once (the last value of each key wins, keys stay in first-seen
+    # order), instead of one scan of _inner per add.
+    # A dict needs hashable keys: if a key is not hashable (add() accepts
+    # those), they fall back to going one key at a time
+
+    @classmethod
+    def from_items(cls, items):
+        the_map = cls()
+        the_map.update(items)
+        return the_map
+
+    def _set_entries(self, entries):
+        self._inner = list(map(list, entries.items()))
+        self._live = len(self._inner)
+        self._dead = 0
+
+    def _as_dict(self):
+        return dict(it for it in self._inner if it is not None)
+
+    def update(self, items):
+        items = list(items)
+        try:
+            merged = self._as_dict()
+            merged.update(items)
+        except TypeError:
+            MyMapADT.update(self, items)
+            return
+        self._set_entries(merged)
+
+    # Building the dict costs a pass over the whole map, about as much as
+    # a few _find() scans, so it is only done for batches of at least
+    # BULK_GET_MIN keys. map() then runs the lookups in C
+    BULK_GET_MIN = 16
+
+    # A missing key raises KeyError, whichever way the batch is looked up
+    def get_many(self, keys):
+        keys = list(keys)
+        if len(keys) >= MyMap.BULK_GET_MIN:
+            try:
+                return list(map(self._as_dict().__getitem__, keys))
+            except TypeError:
+                pass
+        values = []
+        for key in keys:
+            idx = self._find(key)
+            if idx == -1:
+                raise KeyError(key)
+            values.append(self._inner[idx][1])
+        return values
 
     def __iter__(self):
         return self
 
+    # Walk the slots, skipping the tombstones
     def __next__(self):
-        if self._index < len(self) - 1:
+        while self._index < len(self._inner) - 1:
             self._index += 1
-            return self._inner[self._index][0]
-        else:
-            self._index = -1
-            raise StopIteration
\ No newline at end of file
+            if self._inner[self._index] is not None:
+                return self._inner[self._index][0]
+        self._index = -1
+        raise StopIteration
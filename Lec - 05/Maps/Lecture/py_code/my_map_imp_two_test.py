@@ -0,0 +1,86 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+
+from my_map_imp_one import MyMapO
+from my_map_imp_two import MyMap
+
+class TestMyMap(unittest.TestCase):
+
+    def setUp(self):
+        self.m = MyMap()
+
+    def compare(self, expected):
+        self.assertEqual(len(self.m), len(expected))
+        self.assertEqual(list(self.m), list(expected))
+        for key, val in expected.items():
+            self.assertIn(key, self.m)
+            self.assertEqual(self.m[key], val)
+        # Compaction keeps the tombstones at most MAX_DEAD_RATIO * live
+        self.assertLessEqual(self.m._dead, self.m._live * MyMap.MAX_DEAD_RATIO)
+        self.assertEqual(len(self.m._inner), self.m._live + self.m._dead)
+
+    def test_add_updates_in_place(self):
+        self.m.add('a', 1)
+        self.m.add('b', 2)
+        self.m.add('a', 3)
+        self.assertEqual(len(self.m), 2)
+        self.assertEqual(self.m['a'], 3)
+        self.assertEqual(list(self.m), ['a', 'b'])
+
+    def test_remove(self):
+        for key in 'abcd':
+            self.m.add(key, key.upper())
+        self.assertEqual(self.m.remove('b'), ('b', 'B'))
+        self.assertNotIn('b', self.m)
+        self.assertRaises(AssertionError, self.m.remove, 'b')
+        # Iteration skips the tombstone, and can run twice
+        self.assertEqual(list(self.m), ['a', 'c', 'd'])
+        self.assertEqual(list(self.m), ['a', 'c', 'd'])
+        self.m.add('b', 'again')
+        self.compare({'a': 'A', 'c': 'C', 'd': 'D', 'b': 'again'})
+
+    def test_random_operations(self):
+        # A dict keeps keys in insertion order, and puts a removed key
+        # that is added again at the end, just like MyMap
+        rnd = random.Random(40)
+        expected = {}
+        for step in range(4000):
+            key = rnd.randrange(100)
+            if key in expected and rnd.random() < 0.5:
+                self.assertEqual(self.m.remove(key), (key, expected.pop(key)))
+            else:
+                self.m.add(key, step)
+                expected[key] = step
+            if step % 200 == 0:
+                self.compare(expected)
+        self.compare(expected)
+        for key in list(expected):
+            self.m.remove(key)
+            del expected[key]
+        self.compare(expected)
+        self.assertEqual(self.m._inner, [])
+
+    def test_bulk_operations(self):
+        self.m = MyMap.from_items([('a', 1), ('b', 2), ('a', 3)])
+        self.m.remove('b')
+        self.m.update([('c', 4), ('b', 5)])
+        self.compare({'a': 3, 'c': 4, 'b': 5})
+        self.assertEqual(self.m.get_many(['b', 'a']), [5, 3])
+        self.assertEqual(self.m.get_many(['c'] * 20), [4] * 20)
+        # Unhashable keys go through add() one at a time
+        self.m.update([([1], 'list')])
+        self.assertEqual(self.m.get_many([[1]] * 20), ['list'] * 20)
+
+    def test_get_many_missing_key(self):
+        # The same error for a small batch, a bulk batch and a batch that
+        # falls back because of an unhashable key
+        for the_map in [MyMap.from_items([('a', 1)]), MyMapO.from_items([('a', 1)])]:
+            for keys in [['a', 'zz'], ['a'] * 20 + ['zz'], ['a'] * 20 + [['zz']]]:
+                with self.assertRaises(KeyError):
+                    the_map.get_many(keys)
+
+
+if __name__ == '__main__':
+    unittest.main()
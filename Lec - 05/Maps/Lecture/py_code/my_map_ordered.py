@@ -0,0 +1,213 @@
+# بسم الله الرحمن الرحيم
+
+# Ordered map: an AVL tree (a self-balancing binary search tree)
+#
+# Keys are kept in sorted order: everything in a node's left subtree is
+# smaller than its key, everything in its right subtree is larger.
+# After every add/remove the heights of the two subtrees of any node
+# differ by at most one (rotations fix it), so the tree stays O(log n)
+# deep and add, remove, value_of, floor and ceiling are O(log n).
+#
+# Iteration walks the keys in increasing order, and range(lo, hi)
+# visits only the keys between lo and hi, so "all keys between two
+# timestamps" needs no scan of the whole map and no sort.
+
+from my_map_adt import MyMapADT
+
+class _AVLNode:
+    def __init__(self, key, val):
+        self.key = key
+        self.value = val
+        self.left = None
+        self.right = None
+        self.height = 1
+
+
+def _height(node):
+    return node.height if node else 0
+
+def _fix_height(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _fix_height(node)
+    _fix_height(pivot)
+    return pivot
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _fix_height(node)
+    _fix_height(pivot)
+    return pivot
+
+# Restore the AVL property at node, returns the new root of the subtree
+def _balance(node):
+    _fix_height(node)
+    diff = _height(node.left) - _height(node.right)
+    if diff > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if diff < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+
+class MyMapOrdered(MyMapADT):
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+        # for iterator
+        self._walker = None
+
+    def __len__(self):
+        return self._size
+
+    def _find_node(self, key):
+        node = self._root
+        while node is not None:
+            if key == node.key:
+                return node
+            node = node.left if key < node.key else node.right
+        return None
+
+    def __contains__(self, key):
+        return self._find_node(key) is not None
+
+    # if key exists -> update its value
+    # if key does not exist -> insert a leaf and rebalance on the way up
+    def add(self, key, val):
+        self._root = self._add(self._root, key, val)
+
+    def _add(self, node, key, val):
+        if node is None:
+            self._size += 1
+            return _AVLNode(key, val)
+        if key == node.key:
+            node.value = val
+            return node
+        if key < node.key:
+            node.left = self._add(node.left, key, val)
+        else:
+            node.right = self._add(node.right, key, val)
+        return _balance(node)
+
+    # remove using key, returns (key, value) like MyMapO
+    def remove(self, key):
+        node = self._find_node(key)
+        assert node is not None
+        entry = node.key, node.value
+        self._root = self._remove(self._root, key)
+        self._size -= 1
+        return entry
+
+    def _remove(self, node, key):
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        elif node.key < key:
+            node.right = self._remove(node.right, key)
+        else:
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            # Two children: take the smallest key of the right subtree
+            successor = node.right
+            while successor.left is not None:
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            node.right = self._remove(node.right, successor.key)
+        return _balance(node)
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        node = self._find_node(key)
+        assert node is not None
+        return node.value
+
+    # Largest key <= key, or None
+    def floor(self, key):
+        node = self._root
+        best = None
+        while node is not None:
+            if key == node.key:
+                return node.key
+            if key < node.key:
+                node = node.left
+            else:
+                best = node.key
+                node = node.right
+        return best
+
+    # Smallest key >= key, or None
+    def ceiling(self, key):
+        node = self._root
+        best = None
+        while node is not None:
+            if key == node.key:
+                return node.key
+            if node.key < key:
+                node = node.right
+            else:
+                best = node.key
+                node = node.left
+        return best
+
+    def min_key(self):
+        assert self._root is not None
+        node = self._root
+        while node.left is not None:
+            node = node.left
+        return node.key
+
+    def max_key(self):
+        assert self._root is not None
+        node = self._root
+        while node.right is not None:
+            node = node.right
+        return node.key
+
+    # In-order walk of the keys lo <= key <= hi (None means unbounded).
+    # Subtrees entirely outside [lo, hi] are never visited, so this is
+    # O(log n + number of keys reported)
+    def range(self, lo=None, hi=None):
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            if node is not None:
+                if lo is not None and node.key < lo:
+                    # Everything on the left is smaller still
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                if hi is not None and hi < node.key:
+                    return
+                yield node.key
+                node = node.right
+
+    def __iter__(self):
+        self._walker = self.range()
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self._walker = self.range()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
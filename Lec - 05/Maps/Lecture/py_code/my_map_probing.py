@@ -0,0 +1,157 @@
+# بسم الله الرحمن الرحيم
+
+# Hash map with open addressing (linear probing)
+#
+# Entries live directly in three parallel arrays of the same size
+# (the "slots"): the hash of the key, the key and the value.
+# A key starts at slot hash & (capacity - 1) and, if that slot is taken,
+# moves to the next one, and so on, until it finds itself or an empty slot.
+# The hash is hash(key) run through a mixer first: hash() of an int is the
+# int itself, so keys that share their low bits (e.g. multiples of 2^20)
+# would otherwise all start at the same slot and form one long run.
+#
+# remove uses backward-shift deletion: the entries after the removed one
+# are moved back into the gap when that brings them closer to their home
+# slot, so no "deleted" markers (tombstones) are ever left behind.
+
+from array import array
+
+from my_map_adt import MyMapADT
+
+_EMPTY = object()
+
+MASK64 = (1 << 64) - 1
+
+# splitmix64 (the same mixer as my_set_filters): every bit of x affects
+# every bit of the result, low bits included
+def _mix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+def _hash64(key):
+    return _mix64(hash(key) & MASK64)
+
+class MyMapProbing(MyMapADT):
+    MIN_CAPACITY = 8
+    # Grow once more than 2/3 of the slots are used, shrink under 1/8
+    MAX_LOAD = 2 / 3
+    MIN_LOAD = 1 / 8
+
+    def __init__(self, capacity=MIN_CAPACITY):
+        self._size = 0
+        self._allocate(max(capacity, MyMapProbing.MIN_CAPACITY))
+
+        # for iterator
+        self._index = -1
+
+    # capacity is always a power of two, so "% capacity" is "& mask"
+    def _allocate(self, capacity):
+        real_capacity = MyMapProbing.MIN_CAPACITY
+        while real_capacity < capacity:
+            real_capacity *= 2
+        self._mask = real_capacity - 1
+        self._hashes = array('Q', [0]) * real_capacity
+        self._keys = [_EMPTY] * real_capacity
+        self._values = [None] * real_capacity
+
+    def _resize(self, capacity):
+        old_hashes, old_keys, old_values = self._hashes, self._keys, self._values
+        self._allocate(capacity)
+        for h, key, val in zip(old_hashes, old_keys, old_values):
+            if key is not _EMPTY:
+                slot = h & self._mask
+                while self._keys[slot] is not _EMPTY:
+                    slot = (slot + 1) & self._mask
+                self._hashes[slot] = h
+                self._keys[slot] = key
+                self._values[slot] = val
+
+    # Returns (slot, found): the slot holding key, or the empty slot
+    # where it would go
+    def _find_slot(self, key, h):
+        slot = h & self._mask
+        keys = self._keys
+        while keys[slot] is not _EMPTY:
+            if self._hashes[slot] == h and (keys[slot] is key or keys[slot] == key):
+                return slot, True
+            slot = (slot + 1) & self._mask
+        return slot, False
+
+    def capacity(self):
+        return self._mask + 1
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self._find_slot(key, _hash64(key))[1]
+
+    # if key exists -> update its value
+    # if key does not exist -> put it in the first empty slot of its run
+    def add(self, key, val):
+        h = _hash64(key)
+        slot, found = self._find_slot(key, h)
+        if found:
+            self._values[slot] = val
+            return
+        if self._size + 1 > self.capacity() * MyMapProbing.MAX_LOAD:
+            self._resize(self.capacity() * 2)
+            slot = self._find_slot(key, h)[0]
+        self._hashes[slot] = h
+        self._keys[slot] = key
+        self._values[slot] = val
+        self._size += 1
+
+    # remove using key, returns (key, value) like MyMapO
+    def remove(self, key):
+        slot, found = self._find_slot(key, _hash64(key))
+        assert found
+        entry = self._keys[slot], self._values[slot]
+
+        # Backward shift: walk the run after the gap and move back every
+        # entry whose home slot is not between the gap and its position
+        mask = self._mask
+        gap = slot
+        nxt = slot
+        while True:
+            nxt = (nxt + 1) & mask
+            if self._keys[nxt] is _EMPTY:
+                break
+            home = self._hashes[nxt] & mask
+            if (gap <= nxt and (home <= gap or home > nxt)) or \
+               (gap > nxt and home <= gap and home > nxt):
+                self._hashes[gap] = self._hashes[nxt]
+                self._keys[gap] = self._keys[nxt]
+                self._values[gap] = self._values[nxt]
+                gap = nxt
+        self._keys[gap] = _EMPTY
+        self._values[gap] = None
+        self._size -= 1
+
+        if self.capacity() > MyMapProbing.MIN_CAPACITY and \
+           self._size < self.capacity() * MyMapProbing.MIN_LOAD:
+            self._resize(self.capacity() // 2)
+        return entry
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        slot, found = self._find_slot(key, _hash64(key))
+        assert found
+        return self._values[slot]
+
+    def __iter__(self):
+        return self
+
+    # Walk the slots, skipping the empty ones
+    def __next__(self):
+        while self._index < self._mask:
+            self._index += 1
+            if self._keys[self._index] is not _EMPTY:
+                return self._keys[self._index]
+        self._index = -1
+        raise StopIteration
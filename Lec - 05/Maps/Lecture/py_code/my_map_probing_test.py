@@ -0,0 +1,121 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+
+from my_map_probing import MyMapProbing, _EMPTY, _hash64
+
+# Keys whose hash the test chooses, to build long runs on purpose
+class Collider:
+    def __init__(self, name, h):
+        self.name = name
+        self.h = h
+
+    def __hash__(self):
+        return self.h
+
+    def __eq__(self, other):
+        return isinstance(other, Collider) and self.name == other.name
+
+    # A hash whose (mixed) home slot is home in a table of mask + 1 slots
+    @staticmethod
+    def hash_for(home, mask):
+        h = 0
+        while _hash64(h) & mask != home:
+            h += 1
+        return h
+
+class TestMyMapProbing(unittest.TestCase):
+
+    def setUp(self):
+        self.m = MyMapProbing()
+
+    # Every key is reached from its home slot without crossing an empty
+    # slot, which is what backward-shift deletion has to keep true
+    def check_runs(self):
+        mask = self.m._mask
+        for slot, key in enumerate(self.m._keys):
+            if key is not _EMPTY:
+                pos = self.m._hashes[slot] & mask
+                while pos != slot:
+                    self.assertIsNot(self.m._keys[pos], _EMPTY)
+                    pos = (pos + 1) & mask
+
+    def compare(self, expected):
+        self.check_runs()
+        self.assertEqual(len(self.m), len(expected))
+        self.assertEqual(sorted(self.m, key=repr), sorted(expected, key=repr))
+        for key, val in expected.items():
+            self.assertIn(key, self.m)
+            self.assertEqual(self.m[key], val)
+        self.assertLessEqual(len(self.m), self.m.capacity() * MyMapProbing.MAX_LOAD)
+
+    def test_remove_shifts_the_run_back(self):
+        # One run of colliding keys, and one key whose home slot is in
+        # the middle of it
+        mask = self.m._mask
+        keys = [Collider(name, Collider.hash_for(1, mask)) for name in 'abcd'] + \
+            [Collider('e', Collider.hash_for(3, mask))]
+        for i, key in enumerate(keys):
+            self.m.add(key, i)
+        self.assertEqual(self.m.remove(keys[1]), (keys[1], 1))
+        self.compare({key: i for i, key in enumerate(keys) if i != 1})
+        self.assertEqual(self.m.remove(keys[0]), (keys[0], 0))
+        self.compare({key: i for i, key in enumerate(keys) if i > 1})
+        self.assertRaises(AssertionError, self.m.remove, keys[0])
+
+    def test_run_wraps_around(self):
+        mask = self.m._mask
+        keys = [Collider(name, Collider.hash_for(mask, mask)) for name in 'abc']
+        for key in keys:
+            self.m.add(key, key.name)
+        self.assertEqual(self.m.remove(keys[0]), (keys[0], 'a'))
+        self.compare({keys[1]: 'b', keys[2]: 'c'})
+
+    def test_resize(self):
+        for key in range(1000):
+            self.m.add(key, key)
+        grown = self.m.capacity()
+        self.assertGreaterEqual(grown, 1000 / MyMapProbing.MAX_LOAD)
+        self.compare({key: key for key in range(1000)})
+        # Shrinks back once it is mostly empty
+        for key in range(990):
+            self.m.remove(key)
+        self.assertLess(self.m.capacity(), grown)
+        self.compare({key: key for key in range(990, 1000)})
+
+    def test_keys_sharing_low_bits(self):
+        # hash() of these ints ends in 20 zero bits; the mixed hash does
+        # not, so they do not pile up in one run
+        for i in range(2000):
+            self.m.add(i << 20, i)
+        mask = self.m._mask
+        probes = 0
+        for slot, key in enumerate(self.m._keys):
+            if key is not _EMPTY:
+                probes += (slot - (self.m._hashes[slot] & mask)) & mask
+        self.assertLess(probes / len(self.m), 3)
+        self.compare({i << 20: i for i in range(2000)})
+
+    def test_random_operations(self):
+        rnd = random.Random(33)
+        expected = {}
+        for step in range(6000):
+            key = rnd.choice([rnd.randrange(300), 'k%d' % rnd.randrange(300)])
+            if key in expected and rnd.random() < 0.5:
+                self.assertEqual(self.m.remove(key), (key, expected.pop(key)))
+            else:
+                self.m.add(key, step)
+                expected[key] = step
+            if step % 300 == 0:
+                self.compare(expected)
+        self.compare(expected)
+        for key in list(expected):
+            self.m.remove(key)
+            del expected[key]
+        self.compare(expected)
+        self.assertEqual(self.m.capacity(), MyMapProbing.MIN_CAPACITY)
+
+
+if __name__ == '__main__':
+    unittest.main()
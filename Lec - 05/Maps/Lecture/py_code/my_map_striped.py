@@ -0,0 +1,188 @@
+# بسم الله الرحمن الرحيم
+
+# Thread-safe maps
+#
+# MyMapLocked wraps any map behind ONE lock: every operation, read or
+# write, waits for every other one.
+#
+# MyMapStriped splits the keys over several independent "stripes", each a
+# MyMapProbing with its own lock. An operation only locks the stripe of
+# its key, so operations on keys in different stripes never wait for each
+# other and a write blocks just 1/stripes of the map.
+#
+# A key's stripe comes from the TOP 32 bits of its mixed hash, while the
+# stripe's MyMapProbing picks a slot from the low bits. Taking both from
+# the same bits (e.g. hash % 16 with 16 stripes) would give every key of a
+# stripe the same low bits, so only 1/16 of each table's slots could ever
+# be a home slot and the runs would grow long.
+
+import threading
+
+from my_map_adt import MyMapADT
+from my_map_probing import MyMapProbing, _hash64
+
+class MyMapLocked(MyMapADT):
+    def __init__(self, inner):
+        self._inner = inner
+        self._lock = threading.Lock()
+
+        # for iterator
+        self._walker = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._inner)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._inner
+
+    def add(self, key, val):
+        with self._lock:
+            self._inner.add(key, val)
+
+    def remove(self, key):
+        with self._lock:
+            return self._inner.remove(key)
+
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        with self._lock:
+            return self._inner.value_of(key)
+
+    # Iterates over a snapshot of the keys
+    def __iter__(self):
+        with self._lock:
+            self._walker = iter([key for key in self._inner])
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+
+class MyMapStriped(MyMapADT):
+    def __init__(self, stripes=16):
+        assert stripes > 0, 'Need at least one stripe'
+        self._maps = [MyMapProbing() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+        # for iterator
+        self._walker = None
+
+    def _stripe(self, key):
+        return (_hash64(key) >> 32) % len(self._maps)
+
+    # Sum of the stripe sizes; while other threads write, the answer
+    # may already be out of date when it is returned
+    def __len__(self):
+        total = 0
+        for the_map, lock in zip(self._maps, self._locks):
+            with lock:
+                total += len(the_map)
+        return total
+
+    def __contains__(self, key):
+        s = self._stripe(key)
+        with self._locks[s]:
+            return key in self._maps[s]
+
+    def add(self, key, val):
+        s = self._stripe(key)
+        with self._locks[s]:
+            self._maps[s].add(key, val)
+
+    # remove using key, returns (key, value) like MyMapO
+    def remove(self, key):
+        s = self._stripe(key)
+        with self._locks[s]:
+            return self._maps[s].remove(key)
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        s = self._stripe(key)
+        with self._locks[s]:
+            return self._maps[s].value_of(key)
+
+    # Value of key, or default if it is missing, in one locked step
+    # (a separate `in` then `[]` could see the key removed in between)
+    def get(self, key, default=None):
+        s = self._stripe(key)
+        with self._locks[s]:
+            the_map = self._maps[s]
+            return the_map.value_of(key) if key in the_map else default
+
+    # Iterates over a snapshot of the keys, taken one stripe at a time
+    def __iter__(self):
+        keys = []
+        for the_map, lock in zip(self._maps, self._locks):
+            with lock:
+                keys.extend([key for key in the_map])
+        self._walker = iter(keys)
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+
+# Throughput (operations per second, all threads together) of one global
+# lock against MyMapStriped, for 1, 2, 4 and 8 threads running 90% reads /
+# 10% writes. The locked MyMapProbing uses the same table as the stripes,
+# so it shows what the striping alone gains; MyMapO (an O(n) list) is
+# there for scale. With the GIL only one thread runs Python code at a
+# time, so striping mostly pays off on a free-threaded build.
+#
+# Usage: python my_map_striped.py [operations per thread]
+if __name__ == '__main__':
+    import random
+    import sys
+    import time
+
+    from my_map_imp_one import MyMapO
+
+    KEYS = 2000
+
+    def worker(the_map, ops, seed):
+        rnd = random.Random(seed)
+        for _ in range(ops):
+            key = rnd.randrange(KEYS)
+            if rnd.random() < 0.1:
+                the_map.add(key, key)
+            else:
+                key in the_map
+
+    def throughput(the_map, threads, ops):
+        for key in range(KEYS):
+            the_map.add(key, key)
+        workers = [threading.Thread(target=worker, args=(the_map, ops, seed))
+                   for seed in range(threads)]
+        start = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        return threads * ops / (time.perf_counter() - start)
+
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print('%8s %18s %22s %18s' % ('threads', 'locked MyMapO', 'locked MyMapProbing', 'MyMapStriped'))
+    for threads in [1, 2, 4, 8]:
+        print('%8d %16.0f/s %20.0f/s %16.0f/s' % (threads,
+              throughput(MyMapLocked(MyMapO()), threads, ops),
+              throughput(MyMapLocked(MyMapProbing()), threads, ops),
+              throughput(MyMapStriped(), threads, ops)))
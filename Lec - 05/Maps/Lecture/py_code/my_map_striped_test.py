@@ -0,0 +1,94 @@
+# بسم الله الرحمن الرحيم
+
+import threading
+import unittest
+
+from my_map_probing import _EMPTY
+from my_map_striped import MyMapStriped
+
+THREADS = 8
+KEYS_PER_THREAD = 2000
+
+class TestMyMapStriped(unittest.TestCase):
+
+    def setUp(self):
+        self.m = MyMapStriped(stripes=4)
+
+    def run_threads(self, target):
+        errors = []
+        def guarded(tid):
+            try:
+                target(tid)
+            except Exception as e:
+                errors.append(e)
+        workers = [threading.Thread(target=guarded, args=(tid,)) for tid in range(THREADS)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        self.assertEqual(errors, [])
+
+    def test_basic_operations(self):
+        self.m.add('a', 1)
+        self.m.add('b', 2)
+        self.m.add('a', 3)
+        self.assertEqual(len(self.m), 2)
+        self.assertIn('a', self.m)
+        self.assertEqual(self.m['a'], 3)
+        self.assertEqual(self.m.remove('b'), ('b', 2))
+        self.assertNotIn('b', self.m)
+        self.assertEqual(self.m.get('b', 'none'), 'none')
+        self.assertEqual(sorted(self.m), ['a'])
+
+    def test_concurrent_writers(self):
+        # Every thread adds its own keys, then removes the odd ones
+        def write(tid):
+            base = tid * KEYS_PER_THREAD
+            for key in range(base, base + KEYS_PER_THREAD):
+                self.m.add(key, key * 2)
+            for key in range(base + 1, base + KEYS_PER_THREAD, 2):
+                self.assertEqual(self.m.remove(key), (key, key * 2))
+        self.run_threads(write)
+
+        expected = [key for key in range(THREADS * KEYS_PER_THREAD) if key % 2 == 0]
+        self.assertEqual(len(self.m), len(expected))
+        self.assertEqual(sorted(self.m), expected)
+        for key in expected:
+            self.assertEqual(self.m[key], key * 2)
+
+    def test_readers_during_writes(self):
+        # Half the threads keep rewriting the same keys, the other half
+        # read them: a reader must only ever see a value a writer wrote
+        for key in range(KEYS_PER_THREAD):
+            self.m.add(key, key)
+
+        def mixed(tid):
+            for round_no in range(3):
+                for key in range(KEYS_PER_THREAD):
+                    if tid % 2 == 0:
+                        self.m.add(key, key + round_no * KEYS_PER_THREAD)
+                    else:
+                        self.assertEqual(self.m[key] % KEYS_PER_THREAD, key)
+        self.run_threads(mixed)
+        self.assertEqual(len(self.m), KEYS_PER_THREAD)
+
+    def test_keys_spread_in_every_stripe(self):
+        # Sequential ints and strings: every stripe gets its share, and
+        # inside a stripe the keys still start at well spread home slots
+        m = MyMapStriped(stripes=16)
+        keys = list(range(8000)) + ['k%d' % i for i in range(8000)]
+        for key in keys:
+            m.add(key, key)
+        for stripe in m._maps:
+            self.assertGreater(len(stripe), len(keys) / 16 * 0.8)
+            mask = stripe._mask
+            probes = 0
+            for slot, key in enumerate(stripe._keys):
+                if key is not _EMPTY:
+                    probes += (slot - (stripe._hashes[slot] & mask)) & mask
+            self.assertLess(probes / len(stripe), 2)
+        self.assertEqual(sorted(m, key=str), sorted(keys, key=str))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 
 # from my_map_imp_one import MyMap
 from my_map_imp_two import MyMap
+# from my_map_probing import MyMapProbing as MyMap
 
 
 m = MyMap()
@@ -23,10 +24,10 @@ m.add('Seven', 7)
 for i in m:
     print(i, m[i])
 
-# m.remove('Seven')
+m.remove('Seven')
 
-# for i in m:
-#     print(i, m[i])
+for i in m:
+    print(i, m[i])
 
 
 # for a,b in enumerate(m):
@@ -0,0 +1,206 @@
+# بسم الله الرحمن الرحيم
+
+# MultiMap: a key maps to many values
+# IndexedMap: a map of records that can also be searched by other fields
+#
+# MultiMap keeps, for every key, the set of its values (an insertion-ordered
+# dict used as a set, so adding or removing one value is O(1) and values
+# must be hashable). The keys live in a MyMapProbing (O(1) lookups) or,
+# with ordered=True, in a MyMapOrdered (O(log n) lookups plus range()).
+#
+# IndexedMap stores records by primary key. index(name, extractor) declares
+# a secondary index: extractor(record) gives the field value to index by
+# (None means "not indexed"). Every add/remove keeps all indexes up to
+# date, so find(name, value) is an index lookup instead of a scan of every
+# record. Each index remembers the field value it filed every key under,
+# and a key is unfiled using that value, so a record that was changed in
+# place and added again is still moved to its new field value.
+
+from my_map_adt import MyMapADT
+from my_map_ordered import MyMapOrdered
+from my_map_probing import MyMapProbing
+
+# Default of MultiMap.remove's val: None can be a stored value
+_ALL = object()
+
+class MultiMap(MyMapADT):
+    def __init__(self, ordered=False):
+        self._ordered = ordered
+        self._buckets = MyMapOrdered() if ordered else MyMapProbing()
+        self._count = 0
+
+        # for iterator
+        self._walker = None
+
+    # Number of keys
+    def __len__(self):
+        return len(self._buckets)
+
+    # Number of (key, value) pairs
+    def count(self):
+        return self._count
+
+    def __contains__(self, key):
+        return key in self._buckets
+
+    # Add val to the values of key (adding the same pair twice is a no-op)
+    def add(self, key, val):
+        if key in self._buckets:
+            bucket = self._buckets.value_of(key)
+        else:
+            bucket = {}
+            self._buckets.add(key, bucket)
+        if val not in bucket:
+            bucket[val] = None
+            self._count += 1
+
+    # remove(key) drops the key with all its values and returns them;
+    # remove(key, val) drops just that one value (which may be None)
+    def remove(self, key, val=_ALL):
+        assert key in self._buckets
+        bucket = self._buckets.value_of(key)
+        if val is _ALL:
+            self._buckets.remove(key)
+            self._count -= len(bucket)
+            return key, list(bucket)
+        assert val in bucket
+        del bucket[val]
+        self._count -= 1
+        if not bucket:
+            self._buckets.remove(key)
+        return key, val
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    # List of the values of key (empty if there are none)
+    def value_of(self, key):
+        if key not in self._buckets:
+            return []
+        return list(self._buckets.value_of(key))
+
+    # Keys lo <= key <= hi, in order (ordered=True only)
+    def range(self, lo=None, hi=None):
+        assert self._ordered, 'range needs MultiMap(ordered=True)'
+        return self._buckets.range(lo, hi)
+
+    def __iter__(self):
+        self._walker = iter([key for key in self._buckets])
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+
+class IndexedMap(MyMapADT):
+    def __init__(self):
+        self._records = MyMapProbing()
+        # index name -> (extractor, MultiMap of field value -> primary keys,
+        #                primary key -> the field value it is filed under)
+        self._indexes = {}
+
+        # for iterator
+        self._walker = None
+
+    # Declare a secondary index; existing records are indexed right away.
+    # ordered=True also allows find_range on it
+    def index(self, name, extractor, ordered=False):
+        assert name not in self._indexes, 'Index already exists: %s' % name
+        entries = MultiMap(ordered)
+        fields = {}
+        for key in self._records:
+            field = extractor(self._records.value_of(key))
+            if field is not None:
+                entries.add(field, key)
+                fields[key] = field
+        self._indexes[name] = (extractor, entries, fields)
+
+    def _unindex(self, key):
+        for extractor, entries, fields in self._indexes.values():
+            field = fields.pop(key, None)
+            if field is not None:
+                entries.remove(field, key)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, key):
+        return key in self._records
+
+    # Adding an existing key replaces its record in every index too.
+    # The new field values are all extracted first, so an extractor that
+    # fails leaves the map and its indexes unchanged
+    def add(self, key, record):
+        new_fields = [extractor(record) for extractor, _, _ in self._indexes.values()]
+        if key in self._records:
+            self._unindex(key)
+        self._records.add(key, record)
+        for (extractor, entries, fields), field in zip(self._indexes.values(), new_fields):
+            if field is not None:
+                entries.add(field, key)
+                fields[key] = field
+
+    # remove using key, returns (key, record) like MyMapO
+    def remove(self, key):
+        assert key in self._records
+        self._unindex(key)
+        return self._records.remove(key)
+
+    # make my object subscriptable
+    def __getitem__(self, key):
+        return self.value_of(key)
+
+    def value_of(self, key):
+        return self._records.value_of(key)
+
+    # Primary keys of the records whose indexed field equals value
+    def find_keys(self, name, value):
+        return self._indexes[name][1].value_of(value)
+
+    # The records themselves
+    def find(self, name, value):
+        return [self._records.value_of(key) for key in self.find_keys(name, value)]
+
+    # Records whose indexed field is between lo and hi (ordered index only)
+    def find_range(self, name, lo=None, hi=None):
+        entries = self._indexes[name][1]
+        return [self._records.value_of(key)
+                for field in entries.range(lo, hi)
+                for key in entries.value_of(field)]
+
+    def __iter__(self):
+        self._walker = iter([key for key in self._records])
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+
+if __name__ == '__main__':
+    employees = IndexedMap()
+    employees.index('office', lambda emp: emp['office'])
+    employees.index('salary', lambda emp: emp['salary'], ordered=True)
+
+    employees.add(1, {'name': 'Ahmed', 'office': 'Cairo', 'salary': 9000})
+    employees.add(2, {'name': 'Mona', 'office': 'Alex', 'salary': 12000})
+    employees.add(3, {'name': 'Omar', 'office': 'Cairo', 'salary': 7000})
+
+    print([emp['name'] for emp in employees.find('office', 'Cairo')])
+    print([emp['name'] for emp in employees.find_range('salary', 8000, 20000)])
+
+    # Omar moves to Alex: the office index follows
+    employees.add(3, {'name': 'Omar', 'office': 'Alex', 'salary': 7000})
+    print([emp['name'] for emp in employees.find('office', 'Alex')])
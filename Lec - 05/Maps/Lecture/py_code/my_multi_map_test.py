@@ -0,0 +1,116 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+
+from my_multi_map import IndexedMap, MultiMap
+
+OFFICES = ['Cairo', 'Alex', 'Aswan', None]
+
+class TestMultiMap(unittest.TestCase):
+
+    def test_random_operations(self):
+        for ordered in [False, True]:
+            rnd = random.Random(42)
+            m = MultiMap(ordered)
+            expected = {}
+            for _ in range(3000):
+                key = rnd.randrange(40)
+                val = rnd.randrange(10)
+                if key in expected and rnd.random() < 0.3:
+                    if rnd.random() < 0.5:
+                        self.assertEqual(m.remove(key), (key, list(expected.pop(key))))
+                    else:
+                        val = rnd.choice(list(expected[key]))
+                        self.assertEqual(m.remove(key, val), (key, val))
+                        del expected[key][val]
+                        if not expected[key]:
+                            del expected[key]
+                else:
+                    m.add(key, val)
+                    expected.setdefault(key, {})[val] = None
+            self.assertEqual(len(m), len(expected))
+            self.assertEqual(m.count(), sum(len(vals) for vals in expected.values()))
+            self.assertEqual(sorted(m), sorted(expected))
+            for key in range(40):
+                self.assertEqual(m[key], list(expected.get(key, [])))
+            if ordered:
+                self.assertEqual(list(m.range(10, 20)),
+                                 [key for key in sorted(expected) if 10 <= key <= 20])
+
+    def test_remove_none_value(self):
+        m = MultiMap()
+        m.add('course', None)
+        m.add('course', 'CSCI-112')
+        self.assertEqual(m.remove('course', None), ('course', None))
+        self.assertEqual(m['course'], ['CSCI-112'])
+        m.add('room', None)
+        self.assertEqual(m.remove('room', None), ('room', None))
+        self.assertNotIn('room', m)
+        self.assertEqual(m.remove('course'), ('course', ['CSCI-112']))
+        self.assertEqual(m.count(), 0)
+
+
+class TestIndexedMap(unittest.TestCase):
+
+    def setUp(self):
+        self.employees = IndexedMap()
+        self.employees.index('office', lambda emp: emp['office'])
+        self.employees.index('salary', lambda emp: emp['salary'], ordered=True)
+
+    # Every index must hold exactly what a scan of the records finds
+    def check_indexes(self, records):
+        for office in OFFICES[:-1]:
+            self.assertEqual(sorted(self.employees.find_keys('office', office)),
+                             sorted(key for key, emp in records.items() if emp['office'] == office))
+        self.assertEqual(sorted(emp['name'] for emp in self.employees.find_range('salary', 5000, 9000)),
+                         sorted(emp['name'] for emp in records.values() if 5000 <= emp['salary'] <= 9000))
+
+    def test_record_changed_in_place(self):
+        self.employees.add(1, {'name': 'Ahmed', 'office': 'Cairo', 'salary': 9000})
+        record = self.employees[1]
+        record['office'] = 'Alex'
+        record['salary'] = 12000
+        self.employees.add(1, record)
+        self.assertEqual(self.employees.find_keys('office', 'Cairo'), [])
+        self.assertEqual(self.employees.find_keys('office', 'Alex'), [1])
+        self.assertEqual(self.employees.find_range('salary', 0, 10000), [])
+        self.assertEqual(self.employees.remove(1), (1, record))
+        self.assertEqual(self.employees.find_keys('office', 'Alex'), [])
+
+    def test_failing_extractor_changes_nothing(self):
+        self.employees.add(1, {'name': 'Mona', 'office': 'Alex', 'salary': 7000})
+        self.assertRaises(KeyError, self.employees.add, 1, {'name': 'Mona', 'office': 'Cairo'})
+        self.assertEqual(self.employees.find_keys('office', 'Alex'), [1])
+        self.assertEqual(self.employees[1]['office'], 'Alex')
+
+    def test_random_operations(self):
+        rnd = random.Random(42)
+        records = {}
+        for step in range(2000):
+            key = rnd.randrange(60)
+            if key in records and rnd.random() < 0.3:
+                self.employees.remove(key)
+                del records[key]
+            elif key in records and rnd.random() < 0.5:
+                # Edit the stored record in place, then add it again
+                record = self.employees[key]
+                record['office'] = rnd.choice(OFFICES)
+                record['salary'] = rnd.randrange(3000, 12000)
+                self.employees.add(key, record)
+                records[key] = dict(record)
+            else:
+                records[key] = {'name': 'emp-%d' % step, 'office': rnd.choice(OFFICES),
+                                'salary': rnd.randrange(3000, 12000)}
+                self.employees.add(key, dict(records[key]))
+        self.assertEqual(len(self.employees), len(records))
+        self.check_indexes(records)
+
+        # An index declared on existing records
+        self.employees.index('name', lambda emp: emp['name'])
+        for key, emp in records.items():
+            self.assertEqual(self.employees.find_keys('name', emp['name']), [key])
+
+
+if __name__ == '__main__':
+    unittest.main()
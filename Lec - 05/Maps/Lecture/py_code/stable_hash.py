@@ -0,0 +1,47 @@
+# بسم الله الرحمن الرحيم
+
+# A 64-bit hash that is the same in every process
+#
+# hash() of str and bytes changes from one process to the next (it is
+# salted, see PYTHONHASHSEED), so it cannot be written to a file or
+# compared with a hash taken by another process. stable_hash() runs
+# blake2b over an encoding of the key instead:
+#   - str and bytes: their bytes
+#   - numbers: hash(), which is not salted, and equal numbers of any type
+#     (1 == 1.0 == True) have the same hash()
+#   - tuples and frozensets: the stable hashes of their items
+#   - anything else: its pickled bytes, so two equal keys of such a type
+#     only hash the same if they pickle the same
+#
+# MyMapDisk keeps these hashes in its index file, and the sketches in the
+# Sets folder use them so that sketches built by different processes can
+# be merged.
+
+import hashlib
+import pickle
+import struct
+
+MASK64 = (1 << 64) - 1
+
+_SIGNED = struct.Struct('<q')
+_UNSIGNED = struct.Struct('<Q')
+
+# Unsigned 64-bit hash of key
+def stable_hash(key):
+    return int.from_bytes(hashlib.blake2b(_hash_input(key), digest_size=8).digest(), 'little')
+
+# A type tag, then the bytes to hash
+def _hash_input(key):
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, bytes):
+        return b'b' + key
+    if isinstance(key, (int, float, complex)):
+        return b'n' + _SIGNED.pack(hash(key))
+    if isinstance(key, tuple):
+        return b't' + b''.join(_UNSIGNED.pack(stable_hash(item)) for item in key)
+    if isinstance(key, frozenset):
+        # A sum, so the order the items come out in does not matter
+        total = sum(stable_hash(item) for item in key) & MASK64
+        return b'f' + _UNSIGNED.pack(total)
+    return b'p' + pickle.dumps(key)
@@ -0,0 +1,30 @@
+# بسم الله الرحمن الرحيم
+
+import unittest
+
+from stable_hash import stable_hash
+
+class TestStableHash(unittest.TestCase):
+
+    def test_fixed_values(self):
+        # Index files written earlier depend on these never changing
+        self.assertEqual(stable_hash('CSCI-112'), 0x6db19ff5343f487b)
+        self.assertEqual(stable_hash(1), 0x4babd70fa2d3712a)
+        self.assertEqual(stable_hash(('CSCI', 112)), 0x97a793374a38fde5)
+
+    def test_equal_keys_hash_equal(self):
+        self.assertEqual(stable_hash(1), stable_hash(1.0))
+        self.assertEqual(stable_hash(1), stable_hash(True))
+        self.assertEqual(stable_hash((1, 'a')), stable_hash((1.0, 'a')))
+        self.assertEqual(stable_hash(frozenset(['a', 'b', 3])), stable_hash(frozenset([3, 'b', 'a'])))
+        self.assertNotEqual(stable_hash('1'), stable_hash(1))
+        self.assertNotEqual(stable_hash('a'), stable_hash(b'a'))
+        self.assertNotEqual(stable_hash(('a', 'b')), stable_hash(('b', 'a')))
+
+    def test_range(self):
+        for key in [-1, 2 ** 100, '', None, (), 3.5]:
+            self.assertTrue(0 <= stable_hash(key) < 2 ** 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,22 @@
 # بسم الله الرحمن الرحيم
 
+# The items live in a dict used as a hash table (item -> None), so
+# add, remove and `in` are O(1) on average instead of a scan of a list,
+# and union, intersection, difference and subset are O(n + m).
+# A dict also remembers insertion order, so items iterate and print in
+# the order they were added, as with the list version.
+# Items must be hashable.
+
 class MySet:
     def __init__(self, list=None):
         # Later, we will need the following functionality
         if list:
-            self._items = list
+            self._items = dict.fromkeys(list)
         else:
-            self._items = []
-        self.idx = -1
+            self._items = {}
+
+        # for iterator
+        self._walker = None
 
     def __len__(self):
         return len(self._items)
@@ -16,64 +25,212 @@ class MySet:
         return item in self._items
 
     def add(self, item):
-        if not item in self._items:
-            self._items.append(item)
+        self._items[item] = None
 
     def remove(self, item):
         assert item in self._items
-        # Again, the same two options: index, value
-        # self._items.remove(item)
-        idx = self._items.index(item)
-        return self._items.pop(idx)
+        del self._items[item]
+        return item
+
+    # The items of set_b as a dict, without copying when it is a MySet
+    @staticmethod
+    def _table(set_b):
+        if isinstance(set_b, MySet):
+            return set_b._items
+        return dict.fromkeys(set_b)
+
+    def _from_table(self, table):
+        result = MySet()
+        result._items = table
+        return result
 
     def __eq__(self, set_b):
-        return self.is_subset_of(set_b) and set_b.is_subset_of(self)
+        return len(self) == len(set_b) and self.is_subset_of(set_b)
 
     def is_subset_of(self, set_b):
+        other = MySet._table(set_b)
+        if len(self._items) > len(other):
+            return False
         for item in self._items:
-            if item in set_b:
-                pass
-            else:
+            if item not in other:
                 return False
         return True
-    
+
     # def union(self, set_b):
     def __add__(self, set_b):
-        # union_set = self._items[]
-        _union_list = self._items[:]
-        for item in set_b:
-            if item not in self._items:
-                _union_list.append(item)
-        # We need extra funtionality to return Set, not a list
-        return MySet(_union_list)
+        _union = self._items.copy()
+        _union.update(MySet._table(set_b))
+        return self._from_table(_union)
 
     def intersect(self, set_b):
-        _intersect_list = []
-        for item in self._items:
-            if item in set_b:
-                _intersect_list.append(item)
-        return MySet(_intersect_list)
+        other = MySet._table(set_b)
+        return self._from_table({item: None for item in self._items if item in other})
 
     # def difference(self, set_b)
+    # Items of self that are not in set_b
     def __sub__(self, set_b):
-        _diff_list = []
-        for item in self._items:
-            if item not in set_b:
-                _diff_list.append(item)
-        for item in set_b:
-            if item not in self._items and item not in _diff_list:
-                _diff_list.append(item)
-        return MySet(_diff_list)
+        other = MySet._table(set_b)
+        return self._from_table({item: None for item in self._items if item not in other})
+
+    # In-place algebra: change self._items instead of building a new set
+
+    # a |= b
+    def __ior__(self, set_b):
+        self._items.update(MySet._table(set_b))
+        return self
+
+    # a &= b
+    def __iand__(self, set_b):
+        other = MySet._table(set_b)
+        for item in [item for item in self._items if item not in other]:
+            del self._items[item]
+        return self
+
+    # a -= b: walk whichever of the two is smaller
+    def __isub__(self, set_b):
+        other = MySet._table(set_b)
+        if other is self._items:
+            self._items.clear()
+        elif len(other) < len(self._items):
+            for item in other:
+                self._items.pop(item, None)
+        else:
+            for item in [item for item in self._items if item in other]:
+                del self._items[item]
+        return self
+
+    # a ^= b: keep the items that are in exactly one of the two
+    def __ixor__(self, set_b):
+        other = MySet._table(set_b)
+        if other is self._items:
+            self._items.clear()
+            return self
+        for item in other:
+            if item in self._items:
+                del self._items[item]
+            else:
+                self._items[item] = None
+        return self
+
+    # Lazy union / intersection, see UnionView below
+    def union_view(self, *sets):
+        return UnionView((self,) + sets)
+
+    def intersect_view(self, *sets):
+        return IntersectView((self,) + sets)
 
     def __iter__(self):
+        self._walker = iter(self._items)
         return self
 
     def __next__(self):
-        if self.idx < len(self._items) - 1:
-            self.idx += 1
-            return self._items[self.idx]
-        else:
-            raise StopIteration
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
 
     def __repr__(self):
-        return str(self._items)
+        return str(list(self._items))
+
+
+# Lazy set views
+#
+# a.union_view(b, c) and a.intersect_view(b, c) build nothing: they keep
+# references to the sets and produce the items only while being iterated,
+# so a chain like a.union_view(b).intersect_view(c) makes no intermediate
+# MySet. A view always shows the current contents of its sets.
+#
+#   - `in` asks the sets directly: O(number of sets)
+#   - iterating a union yields the items of every set once, in order; an
+#     intersection walks its smallest set and keeps the items that are in
+#     all the others
+#   - len() has to iterate; to_set() makes a real MySet when one is needed
+
+# Items of a set without touching its shared iterator, so several views
+# can walk the same MySet at once
+def _items_of(a_set):
+    if isinstance(a_set, MySet):
+        return a_set._items
+    if isinstance(a_set, _SetView):
+        return a_set._items()
+    return a_set
+
+class _SetView:
+    def __init__(self, sets):
+        self._sets = tuple(sets)
+
+        # for iterator
+        self._walker = None
+
+    def __len__(self):
+        count = 0
+        for _ in self._items():
+            count += 1
+        return count
+
+    def union_view(self, *sets):
+        return UnionView((self,) + sets)
+
+    def intersect_view(self, *sets):
+        return IntersectView((self,) + sets)
+
+    def to_set(self):
+        return MySet(list(self._items()))
+
+    def __iter__(self):
+        self._walker = self._items()
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+    def __repr__(self):
+        return str(list(self._items()))
+
+
+class UnionView(_SetView):
+    def __init__(self, sets):
+        # a union of unions is one flat union
+        flat = []
+        for a_set in sets:
+            flat.extend(a_set._sets if isinstance(a_set, UnionView) else [a_set])
+        super().__init__(flat)
+
+    def __contains__(self, item):
+        return any(item in a_set for a_set in self._sets)
+
+    def _items(self):
+        for pos, a_set in enumerate(self._sets):
+            earlier = self._sets[:pos]
+            for item in _items_of(a_set):
+                if not any(item in seen for seen in earlier):
+                    yield item
+
+
+class IntersectView(_SetView):
+    def __init__(self, sets):
+        flat = []
+        for a_set in sets:
+            flat.extend(a_set._sets if isinstance(a_set, IntersectView) else [a_set])
+        super().__init__(flat)
+
+    def __contains__(self, item):
+        return all(item in a_set for a_set in self._sets)
+
+    def _items(self):
+        # len() of a view would iterate it, so only real sets are sized
+        sized = [a_set for a_set in self._sets if not isinstance(a_set, _SetView)]
+        smallest = min(sized, key=len) if sized else self._sets[0]
+        others = [a_set for a_set in self._sets if a_set is not smallest]
+        for item in _items_of(smallest):
+            if all(item in a_set for a_set in others):
+                yield item
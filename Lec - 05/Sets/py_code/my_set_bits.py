@@ -0,0 +1,134 @@
+# بسم الله الرحمن الرحيم
+
+# A set of small non-negative ints: a bitset
+#
+# For items drawn from range(universe), bit i of a bytearray says whether
+# i is in the set: universe / 8 bytes whatever the number of items
+# (10^6 possible items -> 125 KB), and add / remove / `in` flip or test
+# one bit.
+#
+# For union, intersection, difference and subset the bytes are turned
+# into one Python int (int.from_bytes), so `|`, `&` and `~` run in C over
+# whole machine words at a time instead of item by item; len() counts the
+# 1 bits the same way (int.bit_count).
+
+class MySetBits:
+    def __init__(self, universe, list=None):
+        assert universe >= 0, 'Universe must not be negative'
+        self._universe = universe
+        self._bits = bytearray((universe + 7) // 8)
+        if list:
+            for item in list:
+                self.add(item)
+
+        # for iterator
+        self._walker = None
+
+    def universe(self):
+        return self._universe
+
+    def _in_universe(self, item):
+        return isinstance(item, int) and 0 <= item < self._universe
+
+    def _check(self, item):
+        assert self._in_universe(item), 'Item out of range: %s' % item
+
+    # The bits as one int: bit i is item i
+    def _as_int(self):
+        return int.from_bytes(self._bits, 'little')
+
+    def _from_int(self, universe, bits):
+        result = MySetBits(universe)
+        result._bits[:] = bits.to_bytes(len(result._bits), 'little')
+        return result
+
+    # The bits of set_b (a MySetBits or any iterable), and whether set_b
+    # has items outside our universe. Those have no bit here: they are
+    # left out of the bits, and each operation decides what they mean
+    def _int_of(self, set_b):
+        if isinstance(set_b, MySetBits):
+            return set_b._as_int(), False
+        inside = MySetBits(self._universe)
+        outside = False
+        for item in set_b:
+            if inside._in_universe(item):
+                inside._bits[item >> 3] |= 1 << (item & 7)
+            else:
+                outside = True
+        return inside._as_int(), outside
+
+    def _universe_of(self, set_b):
+        if isinstance(set_b, MySetBits):
+            return set_b._universe
+        return self._universe
+
+    def __len__(self):
+        return self._as_int().bit_count()
+
+    def __contains__(self, item):
+        if not self._in_universe(item):
+            return False
+        return self._bits[item >> 3] >> (item & 7) & 1 == 1
+
+    def add(self, item):
+        self._check(item)
+        self._bits[item >> 3] |= 1 << (item & 7)
+
+    def remove(self, item):
+        assert item in self
+        self._bits[item >> 3] &= ~(1 << (item & 7)) & 0xFF
+        return item
+
+    # An item outside our universe is never in self, so set_b differs
+    def __eq__(self, set_b):
+        bits, outside = self._int_of(set_b)
+        return not outside and self._as_int() == bits
+
+    # Items outside our universe cannot matter for subset, intersection
+    # and difference: self has none of them
+    def is_subset_of(self, set_b):
+        mine = self._as_int()
+        return mine & self._int_of(set_b)[0] == mine
+
+    # def union(self, set_b):
+    # The union of two MySetBits has the larger universe; other items
+    # outside the universe have no bit to go in
+    def __add__(self, set_b):
+        bits, outside = self._int_of(set_b)
+        if outside:
+            raise ValueError('Items outside range(%d): use a MySetBits with a larger universe'
+                             % self._universe)
+        return self._from_int(max(self._universe, self._universe_of(set_b)),
+                              self._as_int() | bits)
+
+    def intersect(self, set_b):
+        return self._from_int(self._universe, self._as_int() & self._int_of(set_b)[0])
+
+    # def difference(self, set_b)
+    # Items of self that are not in set_b
+    def __sub__(self, set_b):
+        return self._from_int(self._universe, self._as_int() & ~self._int_of(set_b)[0])
+
+    # Only the non-zero bytes are looked at bit by bit
+    def _items(self):
+        for pos, byte in enumerate(self._bits):
+            while byte:
+                low = byte & -byte
+                yield (pos << 3) + low.bit_length() - 1
+                byte ^= low
+
+    def __iter__(self):
+        self._walker = self._items()
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+    def __repr__(self):
+        return str(list(self._items()))
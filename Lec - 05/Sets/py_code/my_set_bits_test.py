@@ -0,0 +1,64 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+from my_set_bits import MySetBits
+
+class TestMySetBits(unittest.TestCase):
+
+    def setUp(self):
+        self.seats = MySetBits(100, [3, 14, 15, 92, 65])
+
+    def test_add_remove(self):
+        self.assertEqual(len(self.seats), 5)
+        self.assertIn(92, self.seats)
+        self.assertNotIn(35, self.seats)
+        self.assertNotIn(1000, self.seats)
+        self.seats.add(35)
+        self.seats.add(35)
+        self.assertEqual(len(self.seats), 6)
+        self.assertEqual(self.seats.remove(14), 14)
+        self.assertEqual(list(self.seats), [3, 15, 35, 65, 92])
+        self.assertRaises(AssertionError, self.seats.add, 100)
+
+    def test_against_builtin_set(self):
+        rnd = random.Random(46)
+        universe = 10 ** 6
+        xs = {rnd.randrange(universe) for _ in range(5000)}
+        ys = {rnd.randrange(universe) for _ in range(5000)}
+        a = MySetBits(universe, xs)
+        b = MySetBits(universe, ys)
+        self.assertEqual(len(a._bits), 125000)
+        self.assertEqual(list(a + b), sorted(xs | ys))
+        self.assertEqual(list(a.intersect(b)), sorted(xs & ys))
+        self.assertEqual(list(a - b), sorted(xs - ys))
+        self.assertEqual(len(a - b), len(xs - ys))
+        self.assertTrue(a.intersect(b).is_subset_of(b))
+        self.assertFalse(a.is_subset_of(b))
+        self.assertEqual(a, MySetBits(universe, sorted(xs)))
+        self.assertNotEqual(a, b)
+
+    def test_mixed_universes_and_plain_lists(self):
+        small = MySetBits(10, [1, 2, 3])
+        self.assertEqual(list(small + MySetBits(20, [15])), [1, 2, 3, 15])
+        self.assertEqual(list(small - [2]), [1, 3])
+        self.assertTrue(small.is_subset_of(range(5)))
+
+    def test_plain_items_outside_the_universe(self):
+        # They are never in the set, like items MySet does not have
+        small = MySetBits(10, [1, 2, 3])
+        self.assertTrue(small.is_subset_of(range(20)))
+        self.assertFalse(small.is_subset_of([1, 2, 50]))
+        self.assertEqual(list(small - [50, 2]), [1, 3])
+        self.assertEqual(list(small.intersect([1, 50, "CSCI-112"])), [1])
+        self.assertEqual(small, [3, 2, 1])
+        self.assertNotEqual(small, [1, 2, 3, 50])
+        self.assertNotEqual(small, [1, 2, 3, -1])
+        self.assertNotIn("CSCI-112", small)
+        self.assertEqual(list(small + [4]), [1, 2, 3, 4])
+        with self.assertRaises(ValueError):
+            small + [50]
+
+
+if __name__ == '__main__':
+    unittest.main()
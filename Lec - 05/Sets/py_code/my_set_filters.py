@@ -0,0 +1,259 @@
+# بسم الله الرحمن الرحيم
+
+# Approximate membership: "definitely not in the set" or "probably in it"
+#
+# A filter stores a few bits per item instead of the items themselves.
+# `item in filter` is never wrong when it says False; when it says True
+# it is wrong with probability about fp_rate (a "false positive").
+#
+# BloomFilter: m bits and k hash functions. add() sets the k bits of the
+# item, `in` checks that all k are set. For n items and a false-positive
+# rate p: m = -n ln p / (ln 2)^2 bits (9.6 bits per item for 1%) and
+# k = (m / n) ln 2. Items cannot be removed: clearing a bit could remove
+# other items too.
+#
+# CuckooFilter: buckets of BUCKET_SIZE small fingerprints (f bits of the
+# item's hash). An item may live in one of two buckets, i1 and
+# i2 = hash(fingerprint) - i1 (mod buckets), so either can be found from
+# the other without the item. When both are full, a resident fingerprint
+# is kicked to its other bucket, like cuckoo hashing. Since a fingerprint
+# is stored, remove() works. The false-positive rate is about
+# 2 * BUCKET_SIZE / 2^f; fingerprints are stored in a typed array, so f is
+# 8, 16 or 32 bits (8 bits: about 3%, 16 bits: about 0.01%).
+#
+# FilteredSet puts a filter in front of an exact set (a MySet or any of
+# its variants): `in` only asks the exact set when the filter says
+# "probably", which saves the exact lookup for most absent items.
+
+import math
+from array import array
+
+MASK64 = (1 << 64) - 1
+
+# splitmix64: spreads the bits of hash(item), so that ints with equal low
+# bits (whose hash() is the int itself) still give unrelated positions
+def _mix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+def _hash64(item):
+    return _mix64(hash(item) & MASK64)
+
+
+class BloomFilter:
+    def __init__(self, capacity, fp_rate=0.01):
+        assert capacity > 0, 'Capacity must be > 0'
+        assert 0 < fp_rate < 1, 'fp_rate must be between 0 and 1'
+        self._num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self._num_hashes = max(1, round(self._num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+        self._count = 0
+
+    # k positions by double hashing: h1 + i * h2 (mod m)
+    def _positions(self, item):
+        h1 = _hash64(item)
+        h2 = _mix64(h1) | 1
+        m = self._num_bits
+        return [(h1 + i * h2) % m for i in range(self._num_hashes)]
+
+    # Number of add() calls (repeats included)
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, item):
+        for pos in self._positions(item):
+            if not self._bits[pos >> 3] >> (pos & 7) & 1:
+                return False
+        return True
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def bits_per_item(self):
+        return self._num_bits / max(self._count, 1)
+
+    # (1 - e^(-k n / m))^k for the items added so far
+    def estimated_fp_rate(self):
+        k, m = self._num_hashes, self._num_bits
+        return (1 - math.exp(-k * self._count / m)) ** k
+
+
+class CuckooFilter:
+    BUCKET_SIZE = 4
+    # Give up moving fingerprints around after this many kicks
+    MAX_KICKS = 500
+
+    def __init__(self, capacity, fp_rate=0.01):
+        assert capacity > 0, 'Capacity must be > 0'
+        assert 0 < fp_rate < 1, 'fp_rate must be between 0 and 1'
+        b = CuckooFilter.BUCKET_SIZE
+        needed = math.ceil(math.log2(2 * b / fp_rate))
+        typecode = 'B' if needed <= 8 else 'H' if needed <= 16 else 'I'
+        self._fp_bits = min(32, array(typecode).itemsize * 8)
+        # Buckets are filled to about 95% at most
+        self._num_buckets = max(1, math.ceil(capacity / (b * 0.95)))
+        # Slot i * BUCKET_SIZE + j is slot j of bucket i; 0 means empty
+        self._slots = array(typecode, [0]) * (self._num_buckets * b)
+        self._count = 0
+        # A fingerprint with no room left, if kicking ever failed
+        self._victim = None
+
+        # Which slot of a full bucket to kick next (round robin)
+        self._kick = 0
+
+    # Fingerprint (never 0) and the two candidate buckets of item
+    def _locate(self, item):
+        h = _hash64(item)
+        fingerprint = (h >> 32) & ((1 << self._fp_bits) - 1) or 1
+        i1 = h % self._num_buckets
+        return fingerprint, i1, self._other(i1, fingerprint)
+
+    # Applied twice it gives index back: h - (h - i) = i
+    def _other(self, index, fingerprint):
+        return (_mix64(fingerprint) - index) % self._num_buckets
+
+    def _bucket(self, index):
+        start = index * CuckooFilter.BUCKET_SIZE
+        return range(start, start + CuckooFilter.BUCKET_SIZE)
+
+    def _find(self, fingerprint, index):
+        for slot in self._bucket(index):
+            if self._slots[slot] == fingerprint:
+                return slot
+        return -1
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, item):
+        fingerprint, i1, i2 = self._locate(item)
+        if self._find(fingerprint, i1) != -1 or self._find(fingerprint, i2) != -1:
+            return True
+        return self._victim is not None and self._victim[0] == fingerprint \
+            and self._victim[1] in (i1, i2)
+
+    def add(self, item):
+        assert self._victim is None, 'Cuckoo filter is full'
+        fingerprint, i1, i2 = self._locate(item)
+        for index in (i1, i2):
+            slot = self._find(0, index)
+            if slot != -1:
+                self._slots[slot] = fingerprint
+                self._count += 1
+                return
+        # Both buckets are full: kick a resident to its other bucket
+        index = i1
+        for _ in range(CuckooFilter.MAX_KICKS):
+            self._kick = (self._kick + 1) % CuckooFilter.BUCKET_SIZE
+            slot = index * CuckooFilter.BUCKET_SIZE + self._kick
+            fingerprint, self._slots[slot] = self._slots[slot], fingerprint
+            index = self._other(index, fingerprint)
+            free = self._find(0, index)
+            if free != -1:
+                self._slots[free] = fingerprint
+                self._count += 1
+                return
+        # Keep the homeless fingerprint so no item is lost
+        self._victim = (fingerprint, index)
+        self._count += 1
+
+    # Removing an item that was never added may remove another item
+    # with the same fingerprint, so only remove items that were added
+    def remove(self, item):
+        fingerprint, i1, i2 = self._locate(item)
+        for index in (i1, i2):
+            slot = self._find(fingerprint, index)
+            if slot != -1:
+                self._slots[slot] = 0
+                self._count -= 1
+                if self._victim is not None:
+                    victim, self._victim = self._victim, None
+                    self._count -= 1
+                    self._place(*victim)
+                return item
+        assert self._victim is not None and self._victim[0] == fingerprint \
+            and self._victim[1] in (i1, i2), 'Item not in the filter'
+        self._victim = None
+        self._count -= 1
+        return item
+
+    # Put a fingerprint back, now that a slot was freed
+    def _place(self, fingerprint, index):
+        for candidate in (index, self._other(index, fingerprint)):
+            slot = self._find(0, candidate)
+            if slot != -1:
+                self._slots[slot] = fingerprint
+                self._count += 1
+                return
+        self._victim = (fingerprint, index)
+        self._count += 1
+
+    def bits_per_item(self):
+        return len(self._slots) * self._slots.itemsize * 8 / max(self._count, 1)
+
+    def load_factor(self):
+        return self._count / len(self._slots)
+
+
+class FilteredSet:
+    # the_filter is a BloomFilter or a CuckooFilter sized for the set;
+    # the items already in the_set are added to it
+    def __init__(self, the_set, the_filter):
+        self._set = the_set
+        self._filter = the_filter
+        for item in the_set:
+            the_filter.add(item)
+        self._lookups = 0
+        self._skipped = 0
+
+        # for iterator
+        self._walker = None
+
+    def __len__(self):
+        return len(self._set)
+
+    def __contains__(self, item):
+        self._lookups += 1
+        if item not in self._filter:
+            self._skipped += 1
+            return False
+        return item in self._set
+
+    # The filter first: if it is full it raises before the set changes,
+    # so every item of the set is always in the filter
+    def add(self, item):
+        if item not in self._set:
+            self._filter.add(item)
+            self._set.add(item)
+
+    # A Bloom filter keeps the removed item's bits: it only costs an
+    # extra false positive later
+    def remove(self, item):
+        self._set.remove(item)
+        if isinstance(self._filter, CuckooFilter):
+            self._filter.remove(item)
+        return item
+
+    # How many `in` checks were answered by the filter alone
+    def stats(self):
+        return {'lookups': self._lookups, 'skipped': self._skipped}
+
+    def __iter__(self):
+        self._walker = iter([item for item in self._set])
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+    def __repr__(self):
+        return repr(self._set)
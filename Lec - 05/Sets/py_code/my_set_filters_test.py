@@ -0,0 +1,90 @@
+# بسم الله الرحمن الرحيم
+
+import unittest
+from my_set import MySet
+from my_set_filters import BloomFilter, CuckooFilter, FilteredSet
+
+ITEMS = 20000
+
+class TestFilters(unittest.TestCase):
+
+    def false_positive_rate(self, the_filter):
+        absent = range(ITEMS, 11 * ITEMS)
+        return sum(1 for item in absent if item in the_filter) / len(absent)
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(ITEMS, fp_rate=0.01)
+        for item in range(ITEMS):
+            bloom.add(item)
+        # No false negatives, and about 1% false positives
+        self.assertTrue(all(item in bloom for item in range(ITEMS)))
+        self.assertLess(self.false_positive_rate(bloom), 0.02)
+        self.assertLess(bloom.bits_per_item(), 10)
+        self.assertAlmostEqual(bloom.estimated_fp_rate(), 0.01, delta=0.002)
+
+    def test_cuckoo_filter(self):
+        cuckoo = CuckooFilter(ITEMS, fp_rate=0.01)
+        for item in range(ITEMS):
+            cuckoo.add(item)
+        self.assertEqual(len(cuckoo), ITEMS)
+        self.assertTrue(all(item in cuckoo for item in range(ITEMS)))
+        self.assertLess(self.false_positive_rate(cuckoo), 0.02)
+
+        for item in range(0, ITEMS, 2):
+            self.assertEqual(cuckoo.remove(item), item)
+        self.assertEqual(len(cuckoo), ITEMS // 2)
+        self.assertTrue(all(item in cuckoo for item in range(1, ITEMS, 2)))
+        removed = sum(1 for item in range(0, ITEMS, 2) if item in cuckoo)
+        self.assertLess(removed / (ITEMS // 2), 0.02)
+
+    def test_cuckoo_filter_overfull(self):
+        # Far more items than it was sized for: nothing added is lost
+        # until it reports being full
+        cuckoo = CuckooFilter(100, fp_rate=0.01)
+        added = []
+        for item in range(1000):
+            try:
+                cuckoo.add(item)
+            except AssertionError:
+                break
+            added.append(item)
+        self.assertGreater(len(added), 100)
+        self.assertTrue(all(item in cuckoo for item in added))
+
+    def test_filtered_set(self):
+        courses = MySet(["CSCI-112", "MATH-121", "HIST-340"])
+        for the_filter in [BloomFilter(100), CuckooFilter(100)]:
+            filtered = FilteredSet(MySet(list(courses)), the_filter)
+            filtered.add("ECON-101")
+            self.assertIn("ECON-101", filtered)
+            self.assertIn("CSCI-112", filtered)
+            self.assertEqual(filtered.remove("CSCI-112"), "CSCI-112")
+            self.assertNotIn("CSCI-112", filtered)
+            for course in range(1000):
+                self.assertNotIn("POL-%d" % course, filtered)
+            self.assertEqual(len(filtered), 3)
+            self.assertEqual(sorted(filtered), ["ECON-101", "HIST-340", "MATH-121"])
+            stats = filtered.stats()
+            self.assertGreater(stats['skipped'], 900)
+
+    def test_filtered_set_full_filter(self):
+        # Once the cuckoo filter is full, add() fails and leaves the set
+        # alone: whatever the set holds, the filter still finds
+        filtered = FilteredSet(MySet(), CuckooFilter(100))
+        added = []
+        for item in range(1000):
+            try:
+                filtered.add(item)
+            except AssertionError:
+                self.assertNotIn(item, filtered)
+                break
+            added.append(item)
+        else:
+            self.fail('The filter never became full')
+        self.assertEqual(len(filtered), len(added))
+        self.assertTrue(all(item in filtered for item in added))
+        self.assertEqual(sorted(filtered), added)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,424 @@
+# بسم الله الرحمن الرحيم
+
+# A compressed bitmap set of ints in range(2 ** 32) ("Roaring bitmap")
+#
+# An item is split into its high 16 bits, which pick a chunk, and its low
+# 16 bits, which are stored in that chunk's container. Only chunks that
+# hold items exist, and each container takes the cheapest of three forms:
+#
+#   array   sorted array('H') of the low bits: 2 bytes per item, used for
+#           up to ARRAY_MAX (4096) items
+#   bitmap  65536 bits = 8 KB whatever the number of items, used above
+#           that, where an array would be bigger
+#   run     sorted (start, length - 1) pairs: 4 bytes per run of
+#           consecutive items, so 0..65535 is 4 bytes, not 8 KB
+#
+# add/remove turn an array into a bitmap (and back) as it crosses
+# ARRAY_MAX. Run containers come from optimize() and from set algebra,
+# which picks the cheapest form of every container it builds.
+#
+# Algebra works chunk by chunk, and only on chunks both sets have
+# (intersection) or the first one has (difference). Bitmap and run
+# containers are combined as one 65536-bit int, so `|`, `&` and `~` run
+# in C; a small array is filtered item by item instead.
+#
+# to_bytes() / MySetRoaring.from_bytes() layout (little-endian):
+#   magic       4 bytes  b'RBM1'
+#   containers  4 bytes
+#   then for every container, by increasing key:
+#     key       2 bytes  the high 16 bits
+#     kind      1 byte   0 array, 1 bitmap, 2 run
+#     padding   1 byte
+#     size      4 bytes  payload length in bytes
+#     payload   the array('H') / bytearray of the container
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+MAGIC = b'RBM1'
+HEADER = struct.Struct('<4sI')
+CONTAINER_HEADER = struct.Struct('<HBxI')
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+ARRAY_MAX = 4096
+BITMAP_BYTES = CHUNK_SIZE // 8
+
+ARRAY, BITMAP, RUN = 0, 1, 2
+
+# Positions of the 1 bits of an int, in increasing order
+def _positions(bits):
+    for pos, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, 'little')):
+        while byte:
+            low = byte & -byte
+            yield (pos << 3) + low.bit_length() - 1
+            byte ^= low
+
+# array('H') <-> little-endian bytes, whatever the machine byte order
+def _pack(values):
+    if sys.byteorder == 'big':
+        values = array('H', values)
+        values.byteswap()
+    return values.tobytes()
+
+def _unpack(data):
+    values = array('H')
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class _ArrayContainer:
+    KIND = ARRAY
+
+    def __init__(self, values):
+        self._values = array('H', values)
+
+    def card(self):
+        return len(self._values)
+
+    def __contains__(self, low):
+        pos = bisect_left(self._values, low)
+        return pos < len(self._values) and self._values[pos] == low
+
+    # add / remove return the container to keep (None once it is empty)
+    def add(self, low):
+        pos = bisect_left(self._values, low)
+        if pos < len(self._values) and self._values[pos] == low:
+            return self
+        if len(self._values) == ARRAY_MAX:
+            return _BitmapContainer.from_int(self.as_int()).add(low)
+        self._values.insert(pos, low)
+        return self
+
+    def remove(self, low):
+        del self._values[bisect_left(self._values, low)]
+        return self if self._values else None
+
+    def values(self):
+        return iter(self._values)
+
+    def as_int(self):
+        bits = bytearray(BITMAP_BYTES)
+        for low in self._values:
+            bits[low >> 3] |= 1 << (low & 7)
+        return int.from_bytes(bits, 'little')
+
+    def payload(self):
+        return _pack(self._values)
+
+    @classmethod
+    def from_payload(cls, data):
+        container = cls([])
+        container._values = _unpack(data)
+        return container
+
+
+class _BitmapContainer:
+    KIND = BITMAP
+
+    def __init__(self, bits, card):
+        self._bits = bits
+        self._card = card
+
+    @classmethod
+    def from_int(cls, bits):
+        return cls(bytearray(bits.to_bytes(BITMAP_BYTES, 'little')), bits.bit_count())
+
+    def card(self):
+        return self._card
+
+    def __contains__(self, low):
+        return self._bits[low >> 3] >> (low & 7) & 1 == 1
+
+    def add(self, low):
+        if low not in self:
+            self._bits[low >> 3] |= 1 << (low & 7)
+            self._card += 1
+        return self
+
+    def remove(self, low):
+        self._bits[low >> 3] &= ~(1 << (low & 7)) & 0xFF
+        self._card -= 1
+        if self._card <= ARRAY_MAX:
+            return _ArrayContainer(self.values()) if self._card else None
+        return self
+
+    def values(self):
+        return _positions(self.as_int())
+
+    def as_int(self):
+        return int.from_bytes(self._bits, 'little')
+
+    def payload(self):
+        return bytes(self._bits)
+
+    @classmethod
+    def from_payload(cls, data):
+        bits = bytearray(data)
+        return cls(bits, int.from_bytes(bits, 'little').bit_count())
+
+
+class _RunContainer:
+    KIND = RUN
+
+    # starts[i] .. starts[i] + lengths[i] is a run of consecutive items
+    def __init__(self, starts, lengths):
+        self._starts = array('H', starts)
+        self._lengths = array('H', lengths)
+
+    @classmethod
+    def from_int(cls, bits):
+        # A run starts at a 1 bit with a 0 below it and ends at a 1 bit
+        # with a 0 above it
+        starts = list(_positions(bits & ~(bits << 1)))
+        ends = _positions(bits & ~(bits >> 1))
+        return cls(starts, [end - start for start, end in zip(starts, ends)])
+
+    def card(self):
+        return sum(self._lengths) + len(self._lengths)
+
+    def __contains__(self, low):
+        i = bisect_right(self._starts, low) - 1
+        return i >= 0 and low <= self._starts[i] + self._lengths[i]
+
+    # Changing a run container is rare (it is built whole), so it goes
+    # through the int form and picks its best form again
+    def add(self, low):
+        if low in self:
+            return self
+        return _best_container(self.as_int() | 1 << low)
+
+    def remove(self, low):
+        return _best_container(self.as_int() & ~(1 << low))
+
+    def values(self):
+        for start, length in zip(self._starts, self._lengths):
+            yield from range(start, start + length + 1)
+
+    def as_int(self):
+        bits = 0
+        for start, length in zip(self._starts, self._lengths):
+            bits |= ((1 << (length + 1)) - 1) << start
+        return bits
+
+    def payload(self):
+        pairs = array('H')
+        for start, length in zip(self._starts, self._lengths):
+            pairs.append(start)
+            pairs.append(length)
+        return _pack(pairs)
+
+    @classmethod
+    def from_payload(cls, data):
+        pairs = _unpack(data)
+        return cls(pairs[0::2], pairs[1::2])
+
+
+CONTAINERS = {ARRAY: _ArrayContainer, BITMAP: _BitmapContainer, RUN: _RunContainer}
+
+# The smallest container holding the 1 bits of bits (None if there are none)
+def _best_container(bits):
+    card = bits.bit_count()
+    if card == 0:
+        return None
+    runs = (bits & ~(bits << 1)).bit_count()
+    array_size = 2 * card if card <= ARRAY_MAX else BITMAP_BYTES + 1
+    if 4 * runs < min(array_size, BITMAP_BYTES):
+        return _RunContainer.from_int(bits)
+    if card <= ARRAY_MAX:
+        return _ArrayContainer(_positions(bits))
+    return _BitmapContainer.from_int(bits)
+
+
+class MySetRoaring:
+    def __init__(self, list=None):
+        # high 16 bits -> container of the low 16 bits
+        self._containers = {}
+        if list:
+            for item in list:
+                self.add(item)
+
+        # for iterator
+        self._walker = None
+
+    @staticmethod
+    def _split(item):
+        assert 0 <= item < 1 << 32, 'Item out of range: %s' % item
+        return item >> CHUNK_BITS, item & (CHUNK_SIZE - 1)
+
+    def _from_containers(self, containers):
+        result = MySetRoaring()
+        result._containers = containers
+        return result
+
+    # The containers of set_b, which may be any set of ints
+    @staticmethod
+    def _containers_of(set_b):
+        if isinstance(set_b, MySetRoaring):
+            return set_b._containers
+        return MySetRoaring(set_b)._containers
+
+    def __len__(self):
+        return sum(container.card() for container in self._containers.values())
+
+    def __contains__(self, item):
+        if not 0 <= item < 1 << 32:
+            return False
+        high, low = item >> CHUNK_BITS, item & (CHUNK_SIZE - 1)
+        return high in self._containers and low in self._containers[high]
+
+    def add(self, item):
+        high, low = MySetRoaring._split(item)
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = _ArrayContainer([low])
+        else:
+            self._containers[high] = container.add(low)
+
+    def remove(self, item):
+        assert item in self
+        high, low = MySetRoaring._split(item)
+        container = self._containers[high].remove(low)
+        if container is None:
+            del self._containers[high]
+        else:
+            self._containers[high] = container
+        return item
+
+    # Turn every container into its smallest form (e.g. long runs of
+    # consecutive items into run containers)
+    def optimize(self):
+        for high, container in self._containers.items():
+            self._containers[high] = _best_container(container.as_int())
+
+    # Number of containers of each kind
+    def stats(self):
+        kinds = {'array': 0, 'bitmap': 0, 'run': 0}
+        for container in self._containers.values():
+            kinds[('array', 'bitmap', 'run')[container.KIND]] += 1
+        return kinds
+
+    def __eq__(self, set_b):
+        other = MySetRoaring._containers_of(set_b)
+        if self._containers.keys() != other.keys():
+            return False
+        for high, container in self._containers.items():
+            if container.card() != other[high].card():
+                return False
+            if container.as_int() != other[high].as_int():
+                return False
+        return True
+
+    def is_subset_of(self, set_b):
+        other = MySetRoaring._containers_of(set_b)
+        for high, container in self._containers.items():
+            if high not in other or container.card() > other[high].card():
+                return False
+            if container.KIND == ARRAY:
+                if not all(low in other[high] for low in container.values()):
+                    return False
+            else:
+                bits = container.as_int()
+                if bits & other[high].as_int() != bits:
+                    return False
+        return True
+
+    # def union(self, set_b):
+    def __add__(self, set_b):
+        other = MySetRoaring._containers_of(set_b)
+        result = {}
+        for high in self._containers.keys() | other.keys():
+            if high not in other:
+                result[high] = _best_container(self._containers[high].as_int())
+            elif high not in self._containers:
+                result[high] = _best_container(other[high].as_int())
+            else:
+                result[high] = _best_container(self._containers[high].as_int() |
+                                               other[high].as_int())
+        return self._from_containers(result)
+
+    def intersect(self, set_b):
+        other = MySetRoaring._containers_of(set_b)
+        result = {}
+        for high in self._containers.keys() & other.keys():
+            a, b = self._containers[high], other[high]
+            if b.KIND == ARRAY and a.KIND != ARRAY:
+                a, b = b, a
+            if a.KIND == ARRAY:
+                container = _ArrayContainer([low for low in a.values() if low in b])
+                if container.card() == 0:
+                    container = None
+            else:
+                container = _best_container(a.as_int() & b.as_int())
+            if container is not None:
+                result[high] = container
+        return self._from_containers(result)
+
+    # def difference(self, set_b)
+    # Items of self that are not in set_b
+    def __sub__(self, set_b):
+        other = MySetRoaring._containers_of(set_b)
+        result = {}
+        for high, a in self._containers.items():
+            if high not in other:
+                container = _best_container(a.as_int())
+            elif a.KIND == ARRAY:
+                b = other[high]
+                container = _ArrayContainer([low for low in a.values() if low not in b])
+                if container.card() == 0:
+                    container = None
+            else:
+                container = _best_container(a.as_int() & ~other[high].as_int())
+            if container is not None:
+                result[high] = container
+        return self._from_containers(result)
+
+    def to_bytes(self):
+        parts = [HEADER.pack(MAGIC, len(self._containers))]
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            payload = container.payload()
+            parts.append(CONTAINER_HEADER.pack(high, container.KIND, len(payload)))
+            parts.append(payload)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = memoryview(data)
+        magic, count = HEADER.unpack_from(data)
+        assert magic == MAGIC, 'Not a MySetRoaring'
+        result = cls()
+        offset = HEADER.size
+        for _ in range(count):
+            high, kind, size = CONTAINER_HEADER.unpack_from(data, offset)
+            offset += CONTAINER_HEADER.size
+            result._containers[high] = CONTAINERS[kind].from_payload(data[offset:offset + size])
+            offset += size
+        return result
+
+    # Items in increasing order
+    def _items(self):
+        for high in sorted(self._containers):
+            base = high << CHUNK_BITS
+            for low in self._containers[high].values():
+                yield base + low
+
+    def __iter__(self):
+        self._walker = self._items()
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+    def __repr__(self):
+        return str(list(self._items()))
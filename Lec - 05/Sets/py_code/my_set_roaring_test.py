@@ -0,0 +1,66 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+from my_set_roaring import MySetRoaring
+
+class TestMySetRoaring(unittest.TestCase):
+
+    def setUp(self):
+        rnd = random.Random(47)
+        # Clustered ids: a dense block, a long run and a few scattered ones
+        self.xs = ({rnd.randrange(1 << 20, (1 << 20) + 70000) for _ in range(30000)}
+                   | set(range(5 << 16, (5 << 16) + 60000))
+                   | {rnd.randrange(1 << 32) for _ in range(300)})
+        self.ys = ({rnd.randrange(1 << 20, (1 << 20) + 70000) for _ in range(3000)}
+                   | set(range((5 << 16) + 30000, (6 << 16) + 100))
+                   | {rnd.randrange(1 << 32) for _ in range(300)})
+        self.a = MySetRoaring(self.xs)
+        self.b = MySetRoaring(self.ys)
+
+    def test_add_remove(self):
+        ids = MySetRoaring([7, 1 << 31, 65536, 7])
+        self.assertEqual(len(ids), 3)
+        self.assertIn(1 << 31, ids)
+        self.assertNotIn(8, ids)
+        self.assertNotIn(-1, ids)
+        self.assertEqual(ids.remove(65536), 65536)
+        self.assertEqual(list(ids), [7, 1 << 31])
+        self.assertRaises(AssertionError, ids.add, 1 << 32)
+
+    def test_container_conversions(self):
+        ids = MySetRoaring(range(5000))
+        self.assertEqual(ids.stats(), {'array': 0, 'bitmap': 1, 'run': 0})
+        for item in range(1000):
+            ids.remove(item)
+        self.assertEqual(ids.stats(), {'array': 1, 'bitmap': 0, 'run': 0})
+        ids.optimize()
+        self.assertEqual(ids.stats(), {'array': 0, 'bitmap': 0, 'run': 1})
+        self.assertEqual(len(ids.to_bytes()), 8 + 8 + 4)
+        ids.add(0)
+        ids.remove(2000)
+        self.assertEqual(list(ids), [0] + list(range(1000, 2000)) + list(range(2001, 5000)))
+
+    def test_against_builtin_set(self):
+        self.assertEqual(len(self.a), len(self.xs))
+        self.assertEqual(list(self.a), sorted(self.xs))
+        self.assertEqual(list(self.a + self.b), sorted(self.xs | self.ys))
+        self.assertEqual(list(self.a.intersect(self.b)), sorted(self.xs & self.ys))
+        self.assertEqual(list(self.a - self.b), sorted(self.xs - self.ys))
+        self.assertEqual(list(self.b - self.a), sorted(self.ys - self.xs))
+        self.assertTrue(self.a.intersect(self.b).is_subset_of(self.b))
+        self.assertFalse(self.a.is_subset_of(self.b))
+        self.assertEqual(self.a, MySetRoaring(sorted(self.xs)))
+        self.assertNotEqual(self.a, self.b)
+
+    def test_bytes_round_trip(self):
+        self.a.optimize()
+        data = self.a.to_bytes()
+        self.assertEqual(MySetRoaring.from_bytes(data), self.a)
+        self.assertEqual(list(MySetRoaring.from_bytes(data)), sorted(self.xs))
+        # Far smaller than 4 bytes per item
+        self.assertLess(len(data), len(self.xs))
+
+
+if __name__ == '__main__':
+    unittest.main()
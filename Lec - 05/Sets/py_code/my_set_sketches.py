@@ -0,0 +1,184 @@
+# بسم الله الرحمن الرحيم
+
+# Sketches: a fixed-size summary of a set, to estimate sizes and
+# similarity without building unions or intersections of huge sets
+#
+# HyperLogLog (cardinality): the hash of each item picks one of
+# m = 2^precision registers, and the register keeps the longest run of
+# leading zero bits seen in the rest of the hash. Seeing a run of r zeros
+# takes about 2^r distinct items, so the (harmonic) mean over all
+# registers gives the number of distinct items, with a relative error of
+# about 1.04 / sqrt(m): 0.8% for the default m = 16384, in 16 KB.
+# The union of two sets is the register-wise max of their sketches, so
+# len(a + b) needs no union at all; the intersection follows as
+# len(a) + len(b) - len(a + b) (good when the overlap is not tiny).
+#
+# MinHash (similarity), bottom-k variant: one hash function, and the
+# sketch keeps the k smallest hashes of the items. The k smallest hashes
+# of A + B are a random sample of A + B; the fraction of them that are in
+# both sketches estimates |A & B| / |A + B| (the Jaccard similarity), with
+# an error of about 1 / sqrt(k). The union is the k smallest of both.
+# Each item costs one hash and, once k items are in, usually a single
+# comparison with the largest hash kept.
+#
+# Both can be built from a MySet (or any iterable) with from_set(), fed a
+# stream with add()/update(), and merged with + or merge().
+#
+# Sketches are meant to be built in different processes and merged, so
+# items are hashed with stable_hash() (the hash MyMapDisk keeps in its
+# index file), not with hash(), which is salted per process for str and
+# bytes.
+
+import importlib.util
+import math
+import os
+from array import array
+from bisect import insort
+
+from my_set_filters import MASK64, _mix64
+
+# stable_hash.py lives with the Maps code; it is loaded from its file
+# so that importing this module does not change sys.path
+_spec = importlib.util.spec_from_file_location('stable_hash', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', 'Maps', 'Lecture', 'py_code', 'stable_hash.py'))
+_stable_hash_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_stable_hash_module)
+_stable_hash64 = _stable_hash_module.stable_hash
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        assert 4 <= precision <= 18, 'Precision must be between 4 and 18'
+        self._precision = precision
+        self._registers = bytearray(1 << precision)
+
+    @classmethod
+    def from_set(cls, a_set, precision=14):
+        sketch = cls(precision)
+        sketch.update(a_set)
+        return sketch
+
+    def add(self, item):
+        h = _stable_hash64(item)
+        rest_bits = 64 - self._precision
+        index = h >> rest_bits
+        rest = h & ((1 << rest_bits) - 1)
+        # position of the first 1 bit, counting from the top of rest
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, stream):
+        for item in stream:
+            self.add(item)
+
+    # Estimated number of distinct items added
+    def count(self):
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        # Few items: most registers are still 0, count them instead
+        if estimate <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return estimate
+
+    def __len__(self):
+        return round(self.count())
+
+    # self becomes the sketch of the union
+    def merge(self, other):
+        assert self._precision == other._precision, 'Sketches must have the same precision'
+        # map() takes the max of every register pair in C
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    # Sketch of the union
+    def __add__(self, other):
+        union = HyperLogLog(self._precision)
+        union._registers = bytearray(self._registers)
+        return union.merge(other)
+
+    def union_count(self, other):
+        return (self + other).count()
+
+    def intersection_count(self, other):
+        return max(0.0, self.count() + other.count() - self.union_count(other))
+
+    def jaccard(self, other):
+        union = self.union_count(other)
+        return self.intersection_count(other) / union if union else 0.0
+
+
+class MinHash:
+    def __init__(self, k=128, seed=26):
+        assert k > 0, 'Need to keep at least one hash'
+        self._k = k
+        self._seed = seed
+        # mix64 is a bijection, so each seed orders the items differently
+        self._salt = _mix64(seed)
+        # the k smallest hashes so far, sorted
+        self._mins = array('Q')
+
+    @classmethod
+    def from_set(cls, a_set, k=128, seed=26):
+        sketch = cls(k, seed)
+        sketch.update(a_set)
+        return sketch
+
+    def add(self, item):
+        h = _mix64(_stable_hash64(item) ^ self._salt)
+        mins = self._mins
+        full = len(mins) == self._k
+        # Once full, most items stop at this one comparison
+        if (full and h >= mins[-1]) or h in mins:
+            return
+        if full:
+            mins.pop()
+        insort(mins, h)
+
+    def update(self, stream):
+        for item in stream:
+            self.add(item)
+
+    def _check(self, other):
+        assert (self._k, self._seed) == (other._k, other._seed), \
+            'Sketches must use the same k and seed'
+
+    # The k smallest hashes of both sketches
+    def _union_mins(self, other):
+        self._check(other)
+        return sorted(set(self._mins).union(other._mins))[:self._k]
+
+    # self becomes the sketch of the union
+    def merge(self, other):
+        self._mins = array('Q', self._union_mins(other))
+        return self
+
+    # Sketch of the union
+    def __add__(self, other):
+        union = MinHash(self._k, self._seed)
+        union._mins = array('Q', self._union_mins(other))
+        return union
+
+    # Estimated number of distinct items added: exact below k items,
+    # otherwise from how close the k-th smallest hash is to 0
+    def count(self):
+        if len(self._mins) < self._k:
+            return float(len(self._mins))
+        return (self._k - 1) * (MASK64 + 1) / (self._mins[-1] + 1)
+
+    # Estimated |A & B| / |A + B|
+    def jaccard(self, other):
+        union = self._union_mins(other)
+        if not union:
+            return 0.0
+        mine, theirs = set(self._mins), set(other._mins)
+        same = sum(1 for h in union if h in mine and h in theirs)
+        return same / len(union)
+
+    # MinHash does not count items well: given the size of the union
+    # (e.g. from HyperLogLog), |A & B| = jaccard * |A + B|
+    def intersection_count(self, other, union_count):
+        return self.jaccard(other) * union_count
@@ -0,0 +1,73 @@
+# بسم الله الرحمن الرحيم
+
+import os
+import subprocess
+import sys
+import unittest
+from my_set import MySet
+from my_set_sketches import HyperLogLog, MinHash
+
+class TestSketches(unittest.TestCase):
+
+    def setUp(self):
+        # |a| = |b| = 60000, |a & b| = 30000, |a + b| = 90000
+        self.a = MySet(range(0, 60000))
+        self.b = MySet(range(30000, 90000))
+
+    def test_hyperloglog_counts(self):
+        hll_a = HyperLogLog.from_set(self.a)
+        hll_b = HyperLogLog()
+        hll_b.update(iter(range(30000, 90000)))
+        self.assertAlmostEqual(hll_a.count(), 60000, delta=60000 * 0.03)
+        self.assertAlmostEqual(hll_a.union_count(hll_b), 90000, delta=90000 * 0.03)
+        self.assertAlmostEqual(hll_a.intersection_count(hll_b), 30000, delta=90000 * 0.05)
+        self.assertAlmostEqual(hll_a.jaccard(hll_b), 1 / 3, delta=0.05)
+        # Repeats do not count, and small sets are exact or nearly so
+        small = HyperLogLog.from_set(["CSCI-112", "MATH-121", "CSCI-112"])
+        self.assertEqual(len(small), 2)
+
+    def test_hyperloglog_merge(self):
+        hll_a = HyperLogLog.from_set(self.a, precision=12)
+        union = hll_a + HyperLogLog.from_set(self.b, precision=12)
+        self.assertAlmostEqual(union.count(), 90000, delta=90000 * 0.06)
+        hll_a.merge(HyperLogLog.from_set(self.b, precision=12))
+        self.assertEqual(hll_a.count(), union.count())
+
+    def test_minhash(self):
+        xs = MySet(range(0, 3000))
+        ys = MySet(range(1000, 4000))
+        mh_x = MinHash.from_set(xs)
+        mh_y = MinHash.from_set(ys)
+        # true Jaccard: 2000 / 4000
+        self.assertAlmostEqual(mh_x.jaccard(mh_y), 0.5, delta=0.15)
+        self.assertEqual(mh_x.jaccard(MinHash.from_set(xs)), 1.0)
+        self.assertAlmostEqual(mh_x.intersection_count(mh_y, 4000), 2000, delta=600)
+        # the sketch of the union is the sketch of the union set
+        self.assertEqual((mh_x + mh_y).jaccard(MinHash.from_set(xs + ys)), 1.0)
+        self.assertAlmostEqual(mh_x.count(), 3000, delta=3000 * 0.3)
+        # below k items the sketch holds every hash, so it is exact
+        few = MinHash.from_set(["CSCI-112", "MATH-121", "CSCI-112"])
+        self.assertEqual(few.count(), 2)
+        self.assertEqual(few.jaccard(MinHash.from_set(["MATH-121"])), 0.5)
+
+    def test_same_sketch_in_another_process(self):
+        # str hashes are salted per process; the sketches must not be
+        code = ('from my_set_sketches import HyperLogLog, MinHash\n'
+                'items = ["student-%d" % i for i in range(5000)] + [("CSCI", 112), b"raw", 2.5]\n'
+                'print(HyperLogLog.from_set(items, precision=10)._registers.hex())\n'
+                'print(MinHash.from_set(items)._mins.tobytes().hex())\n')
+        outputs = []
+        for seed in ['1', '2']:
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            outputs.append(subprocess.run([sys.executable, '-c', code], env=env,
+                                          cwd=os.path.dirname(os.path.abspath(__file__)),
+                                          capture_output=True, text=True, check=True).stdout)
+        self.assertEqual(outputs[0], outputs[1])
+        registers, mins = outputs[0].split()
+        items = ["student-%d" % i for i in range(5000)] + [("CSCI", 112), b"raw", 2.5]
+        self.assertEqual(HyperLogLog.from_set(items, precision=10)._registers.hex(), registers)
+        self.assertEqual(MinHash.from_set(items)._mins.tobytes().hex(), mins)
+
+
+if __name__ == '__main__':
+    unittest.main()
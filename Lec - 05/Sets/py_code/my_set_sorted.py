@@ -0,0 +1,209 @@
+# بسم الله الرحمن الرحيم
+
+# A set of ordered items kept in a sorted array without duplicates
+#
+#   - `in` is a binary search: O(log n)
+#   - add / remove shift the tail of the array: O(n), but it is one
+#     memmove, not a Python loop
+#   - union, intersection and difference walk both arrays once with two
+#     pointers (like the merge step of merge sort): O(n + m)
+#   - when one set is much smaller than the other, intersection and
+#     difference "gallop" through the large one instead: for each small
+#     item, jump 1, 2, 4, 8, ... places ahead, then binary search the last
+#     jump. That is O(m log n) for m small items, not O(n + m)
+#
+# Items iterate and print in sorted order. With typecode (e.g. 'q' for
+# ints) the items are stored in a typed array, 8 bytes per item instead
+# of a pointer to a boxed int.
+
+import importlib.util
+import os
+from array import array
+
+_spec = importlib.util.spec_from_file_location('binary_search', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', '..', 'Lec - 03', 'py_code', 'binary_search.py'))
+_binary_search = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_binary_search)
+binary_search_position = _binary_search.binary_search_position
+
+# Gallop when one set is this many times larger than the other
+GALLOP_RATIO = 8
+
+# Position of the first value >= target in values[low:]
+def _gallop(values, target, low):
+    n = len(values)
+    step = 1
+    high = low
+    while high < n and values[high] < target:
+        low = high + 1
+        high += step
+        step *= 2
+    return binary_search_position(values, target, low, min(high, n))
+
+class MySetSorted:
+    def __init__(self, list=None, typecode=None):
+        self._typecode = typecode
+        self._items = self._new_items(sorted(dict.fromkeys(list)) if list else [])
+
+        # for iterator
+        self._walker = None
+
+    def _new_items(self, values):
+        if self._typecode:
+            return array(self._typecode, values)
+        return values
+
+    def _from_items(self, values):
+        result = MySetSorted(typecode=self._typecode)
+        result._items = result._new_items(values)
+        return result
+
+    # Sorted items of set_b, without copying when it is a MySetSorted
+    @staticmethod
+    def _sorted(set_b):
+        if isinstance(set_b, MySetSorted):
+            return set_b._items
+        return sorted(dict.fromkeys(set_b))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        pos = binary_search_position(self._items, item)
+        return pos < len(self._items) and self._items[pos] == item
+
+    def add(self, item):
+        pos = binary_search_position(self._items, item)
+        if pos == len(self._items) or self._items[pos] != item:
+            self._items.insert(pos, item)
+
+    def remove(self, item):
+        pos = binary_search_position(self._items, item)
+        assert pos < len(self._items) and self._items[pos] == item
+        return self._items.pop(pos)
+
+    # Smallest / largest item
+    def min(self):
+        assert len(self._items) > 0, 'Empty set'
+        return self._items[0]
+
+    def max(self):
+        assert len(self._items) > 0, 'Empty set'
+        return self._items[-1]
+
+    def __eq__(self, set_b):
+        other = MySetSorted._sorted(set_b)
+        if len(self._items) != len(other):
+            return False
+        for x, y in zip(self._items, other):
+            if x != y:
+                return False
+        return True
+
+    # Gallop through set_b for each item: fast when self is small, and
+    # still linear when both have the same size
+    def is_subset_of(self, set_b):
+        a = self._items
+        b = MySetSorted._sorted(set_b)
+        if len(a) > len(b):
+            return False
+        j = 0
+        for x in a:
+            j = _gallop(b, x, j)
+            if j == len(b) or b[j] != x:
+                return False
+            j += 1
+        return True
+
+    # def union(self, set_b):
+    def __add__(self, set_b):
+        a = self._items
+        b = MySetSorted._sorted(set_b)
+        out = []
+        i = j = 0
+        while i < len(a) and j < len(b):
+            x, y = a[i], b[j]
+            if x < y:
+                out.append(x)
+                i += 1
+            elif y < x:
+                out.append(y)
+                j += 1
+            else:
+                out.append(x)
+                i += 1
+                j += 1
+        out.extend(a[i:])
+        out.extend(b[j:])
+        return self._from_items(out)
+
+    def intersect(self, set_b):
+        a = self._items
+        b = MySetSorted._sorted(set_b)
+        if len(a) > len(b):
+            a, b = b, a
+        out = []
+        i = j = 0
+        if len(a) * GALLOP_RATIO < len(b):
+            for x in a:
+                j = _gallop(b, x, j)
+                if j == len(b):
+                    break
+                if b[j] == x:
+                    out.append(x)
+                    j += 1
+            return self._from_items(out)
+        while i < len(a) and j < len(b):
+            x, y = a[i], b[j]
+            if x < y:
+                i += 1
+            elif y < x:
+                j += 1
+            else:
+                out.append(x)
+                i += 1
+                j += 1
+        return self._from_items(out)
+
+    # def difference(self, set_b)
+    # Items of self that are not in set_b
+    def __sub__(self, set_b):
+        a = self._items
+        b = MySetSorted._sorted(set_b)
+        out = []
+        i = j = 0
+        if len(a) * GALLOP_RATIO < len(b):
+            for x in a:
+                j = _gallop(b, x, j)
+                if j == len(b) or b[j] != x:
+                    out.append(x)
+            return self._from_items(out)
+        while i < len(a) and j < len(b):
+            x, y = a[i], b[j]
+            if x < y:
+                out.append(x)
+                i += 1
+            elif y < x:
+                j += 1
+            else:
+                i += 1
+                j += 1
+        out.extend(a[i:])
+        return self._from_items(out)
+
+    def __iter__(self):
+        self._walker = iter(self._items)
+        return self
+
+    def __next__(self):
+        if self._walker is None:
+            self.__iter__()
+        try:
+            return next(self._walker)
+        except StopIteration:
+            self._walker = None
+            raise
+
+    def __repr__(self):
+        return str(list(self._items))
@@ -0,0 +1,50 @@
+# بسم الله الرحمن الرحيم
+
+import random
+import unittest
+from my_set_sorted import MySetSorted
+
+class TestMySetSorted(unittest.TestCase):
+
+    def setUp(self):
+        self.a_courses = MySetSorted(["HIST-340", "CSCI-112", "MATH-121", "ECON-101"])
+        self.h_courses = MySetSorted(["POL-101", "ANTH-230", "CSCI-112", "ECON-101"])
+
+    def test_sorted_order(self):
+        self.a_courses.add("ART-100")
+        self.a_courses.add("CSCI-112")
+        self.assertEqual(list(self.a_courses),
+                         ["ART-100", "CSCI-112", "ECON-101", "HIST-340", "MATH-121"])
+        self.assertEqual(self.a_courses.min(), "ART-100")
+        self.assertEqual(self.a_courses.remove("HIST-340"), "HIST-340")
+        self.assertNotIn("HIST-340", self.a_courses)
+        self.assertIn("MATH-121", self.a_courses)
+        self.assertNotIn("MATH-12", self.a_courses)
+
+    def test_set_algebra(self):
+        self.assertEqual(list(self.a_courses.intersect(self.h_courses)), ["CSCI-112", "ECON-101"])
+        self.assertEqual(list(self.a_courses - self.h_courses), ["HIST-340", "MATH-121"])
+        self.assertEqual(len(self.a_courses + self.h_courses), 6)
+        self.assertTrue(self.a_courses.intersect(self.h_courses).is_subset_of(self.a_courses))
+        self.assertFalse(self.a_courses.is_subset_of(self.h_courses))
+        self.assertNotEqual(self.a_courses, self.h_courses)
+
+    def test_against_builtin_set(self):
+        # Both the merge and the galloping paths, with a typed array
+        rnd = random.Random(45)
+        for small, large in [(500, 700), (20, 5000), (5000, 20)]:
+            xs = {rnd.randrange(10000) for _ in range(small)}
+            ys = {rnd.randrange(10000) for _ in range(large)}
+            a = MySetSorted(xs, typecode='q')
+            b = MySetSorted(ys)
+            self.assertEqual(list(a + b), sorted(xs | ys))
+            self.assertEqual(list(a.intersect(b)), sorted(xs & ys))
+            self.assertEqual(list(a - b), sorted(xs - ys))
+            self.assertEqual(list(b - a), sorted(ys - xs))
+            self.assertEqual(a.is_subset_of(b), xs <= ys)
+            self.assertTrue(a.intersect(b).is_subset_of(b))
+            self.assertEqual(a, MySetSorted(list(xs)))
+
+
+if __name__ == '__main__':
+    unittest.main()
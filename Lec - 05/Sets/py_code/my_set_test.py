@@ -49,10 +49,61 @@ class TestMySum(unittest.TestCase):
     def test_a_h_taking_same_courses(self):
         self.assertEqual(len(self.a_courses.intersect(self.h_courses)), 2)
 
+    def test_union(self):
+        union = self.a_courses + self.h_courses
+        self.assertEqual(len(union), 6)
+        self.assertEqual(union, MySet(["CSCI-112", "MATH-121", "HIST-340",
+                                       "ECON-101", "POL-101", "ANTH-230"]))
 
-   
+    def test_difference(self):
+        # Only the courses of a that h does not take
+        self.assertEqual(self.a_courses - self.h_courses, MySet(["MATH-121", "HIST-340"]))
+        self.assertEqual(len(self.a_courses - self.c_courses), 0)
+
+    def test_subset_and_remove(self):
+        self.assertTrue(self.a_courses.intersect(self.h_courses).is_subset_of(self.h_courses))
+        self.assertFalse(self.a_courses.is_subset_of(self.h_courses))
+        self.assertEqual(self.c_courses.remove("ECON-101"), "ECON-101")
+        self.assertNotIn("ECON-101", self.c_courses)
+        self.assertTrue(self.c_courses.is_subset_of(self.a_courses))
+
+    def test_iterate_twice(self):
+        self.assertEqual(list(self.a_courses), list(self.a_courses))
+        self.assertEqual(repr(self.a_courses), str(["CSCI-112", "MATH-121", "HIST-340", "ECON-101"]))
+
+    def test_large_intersect(self):
+        evens = MySet(range(0, 100000, 2))
+        thirds = MySet(range(0, 100000, 3))
+        self.assertEqual(len(evens.intersect(thirds)), len(range(0, 100000, 6)))
+
+    def test_in_place_operators(self):
+        courses = self.a_courses
+        courses |= self.h_courses
+        self.assertIs(courses, self.a_courses)
+        self.assertEqual(len(courses), 6)
+        courses &= self.c_courses
+        self.assertEqual(courses, self.c_courses)
+        courses -= self.h_courses
+        self.assertEqual(courses, MySet(["MATH-121", "HIST-340"]))
+        courses ^= MySet(["HIST-340", "POL-101"])
+        self.assertEqual(courses, MySet(["MATH-121", "POL-101"]))
+        courses -= courses
+        self.assertEqual(len(courses), 0)
+
+    def test_lazy_views(self):
+        both = self.a_courses.intersect_view(self.h_courses)
+        self.assertEqual(list(both), ["CSCI-112", "ECON-101"])
+        # The view sees later changes of its sets
+        self.h_courses.add("MATH-121")
+        self.assertIn("MATH-121", both)
+        self.assertEqual(len(both), 3)
+
+        every = self.a_courses.union_view(self.h_courses).union_view(MySet(["ART-100"]))
+        self.assertEqual(len(every), 7)
+        self.assertEqual(list(every), list(every))
+        chained = every.intersect_view(self.c_courses, MySet(["HIST-340", "ART-100"]))
+        self.assertEqual(chained.to_set(), MySet(["HIST-340"]))
 
-    
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file